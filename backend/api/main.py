@@ -29,6 +29,8 @@ from backend.services.event_store import get_event_store
 from backend.services.processing_coordinator import get_processing_coordinator
 from backend.services.inference_engine import get_inference_engine
 from backend.services.mqtt_publisher import get_mqtt_publisher
+from backend.services.retention import get_retention_service
+from backend.services.snapshot_writer import get_snapshot_writer
 from backend.database.db import get_db, close_db
 from backend.config.config import get_config
 
@@ -51,6 +53,9 @@ async def lifespan(app: FastAPI):
     # Initialize database
     get_db()
     
+    # Drop expired events and snapshots in the background
+    get_retention_service().start()
+    
     # Start processing for existing cameras
     coordinator = get_processing_coordinator()
     coordinator.start_all_cameras()
@@ -60,6 +65,10 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down SentinelSight API...")
     coordinator.stop_all_cameras()
+    get_snapshot_writer().stop()
+    get_retention_service().stop()
+    get_camera_manager().stop_status_writer()
+    get_event_store().stop_writer()
     get_mqtt_publisher().disconnect()
     close_db()
 
@@ -81,8 +90,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files for snapshots
-snapshot_dir = Path("../data/snapshots")
+# Mount static files for snapshots (served by their path under system.snapshot_dir)
+snapshot_dir = Path(get_config().system.snapshot_dir)
 snapshot_dir.mkdir(parents=True, exist_ok=True)
 app.mount("/snapshots", StaticFiles(directory=str(snapshot_dir)), name="snapshots")
 
@@ -116,7 +125,8 @@ async def create_camera(camera: CameraCreate):
         new_camera = camera_manager.create_camera(
             name=camera.name,
             rtsp_url=camera.rtsp_url,
-            location_tag=camera.location_tag
+            location_tag=camera.location_tag,
+            fps_target=camera.fps_target
         )
         
         # Start processing
@@ -158,11 +168,14 @@ async def update_camera(camera_id: int, camera: CameraUpdate):
         if not existing:
             raise HTTPException(status_code=404, detail="Camera not found")
         
-        # Update camera
-        updated_camera = camera_manager.update_camera(
-            camera_id,
-            **camera.dict(exclude_unset=True)
-        )
+        # Update camera (an explicit null fps_target reverts to system.fps_target)
+        fields = camera.dict(exclude_unset=True)
+        updated_camera = camera_manager.update_camera(camera_id, **fields)
+        
+        # Apply analysis rate changes to the running capture loop
+        if 'fps_target' in fields:
+            coordinator = get_processing_coordinator()
+            coordinator.stream_ingestion.set_fps_target(camera_id, camera.fps_target)
         
         return {"camera": updated_camera, "status": "updated"}
     except HTTPException:
@@ -260,6 +273,14 @@ async def delete_zone(zone_id: int):
 
 # ==================== Event Endpoints ====================
 
+def _add_snapshot_urls(events: List[dict]) -> List[dict]:
+    """Add the URLs of each event's snapshot variants (full, thumbnail, crop)"""
+    snapshot_writer = get_snapshot_writer()
+    for event in events:
+        event['snapshot_urls'] = snapshot_writer.get_urls(event.get('snapshot_path'))
+    return events
+
+
 @app.get("/api/v1/events", response_model=dict)
 async def get_events(
     camera_id: Optional[int] = Query(None),
@@ -268,8 +289,11 @@ async def get_events(
     rule: Optional[str] = Query(None),
     priority: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
+    zone_id: Optional[int] = Query(None),
     limit: int = Query(100, le=500),
-    offset: int = Query(0, ge=0)
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Count all matching events (slower on large tables)")
 ):
     """Query events with filters"""
     try:
@@ -279,23 +303,29 @@ async def get_events(
         from_dt = datetime.fromisoformat(from_time) if from_time else None
         to_dt = datetime.fromisoformat(to_time) if to_time else None
         
-        events, total = event_store.query_events(
+        events, total, next_cursor = event_store.query_events(
             camera_id=camera_id,
             from_time=from_dt,
             to_time=to_dt,
             rule_type=rule,
             priority=priority,
             status=status,
+            zone_id=zone_id,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total
         )
         
         return {
-            "events": events,
+            "events": _add_snapshot_urls(events),
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error querying events: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -304,18 +334,72 @@ async def get_events(
 @app.get("/api/v1/events/stats", response_model=dict)
 async def get_event_stats(
     camera_id: Optional[int] = None,
-    hours: int = 24
+    hours: int = 24,
+    zone_id: Optional[int] = None
 ):
     """Get event statistics"""
     try:
         event_store = get_event_store()
-        stats = event_store.get_event_stats(camera_id=camera_id, hours=hours)
+        stats = event_store.get_event_stats(camera_id=camera_id, hours=hours, zone_id=zone_id)
         return stats
     except Exception as e:
         logger.error(f"Error getting event stats: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/v1/events/timeseries", response_model=dict)
+async def get_event_timeseries(
+    camera_id: Optional[int] = None,
+    rule: Optional[str] = None,
+    hours: int = Query(24, ge=1, le=24 * 90),
+    bucket: str = Query("hour", description="minute or hour")
+):
+    """Get event counts per time bucket"""
+    try:
+        event_store = get_event_store()
+        series = event_store.get_event_timeseries(
+            camera_id=camera_id,
+            rule_type=rule,
+            hours=hours,
+            granularity=bucket
+        )
+        return {"series": series, "bucket": bucket, "hours": hours}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error getting event timeseries: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/v1/events/search", response_model=dict)
+async def search_events(
+    q: str = Query(..., min_length=1, description='e.g. "car loading dock last night"'),
+    camera_id: Optional[int] = Query(None),
+    rule: Optional[str] = Query(None),
+    priority: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Full-text search over events, ranked by relevance"""
+    try:
+        event_store = get_event_store()
+        result = event_store.search_events(
+            q,
+            camera_id=camera_id,
+            rule_type=rule,
+            priority=priority,
+            status=status,
+            limit=limit
+        )
+        _add_snapshot_urls(result['events'])
+        return {**result, "query": q, "limit": limit}
+    except (ValueError, OverflowError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error searching events: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/api/v1/events/{event_id}", response_model=dict)
 async def get_event(event_id: int):
     """Get event by ID"""
@@ -324,7 +408,7 @@ async def get_event(event_id: int):
         event = event_store.get_event(event_id)
         if not event:
             raise HTTPException(status_code=404, detail="Event not found")
-        return {"event": event}
+        return {"event": _add_snapshot_urls([event])[0]}
     except HTTPException:
         raise
     except Exception as e:
@@ -397,6 +481,10 @@ async def get_metrics():
                 "status": camera['status'],
                 "fps": round(camera.get('fps', 0), 2),
                 "queue_depth": status.get('queue_depth', 0),
+                "dropped_frames": status.get('dropped_frames', 0),
+                "frame_pool": status.get('frame_pool', {'allocated': 0, 'free': 0}),
+                "frames_analyzed": status.get('frames_analyzed', 0),
+                "frames_skipped": status.get('frames_skipped', 0),
                 "inference_time_ms": round(inference_engine.get_avg_inference_time(), 2)
             })
         
@@ -407,9 +495,25 @@ async def get_metrics():
             "disk_usage_percent": psutil.disk_usage('/').percent
         }
         
+        # Event pipeline metrics
+        event_metrics = {
+            "write_queue_depth": get_event_store().writer.get_queue_depth(),
+            "snapshots": get_snapshot_writer().get_stats()
+        }
+        
+        # Inference metrics
+        inference_metrics = {
+            "batching_enabled": coordinator.batch_scheduler is not None,
+            "avg_batch_size": round(coordinator.batch_scheduler.get_avg_batch_size(), 2)
+            if coordinator.batch_scheduler else 1.0
+        }
+        
         return {
             "cameras": camera_metrics,
-            "system": system_metrics
+            "system": system_metrics,
+            "inference": inference_metrics,
+            "events": event_metrics,
+            "retention": get_retention_service().get_stats()
         }
     except Exception as e:
         logger.error(f"Error getting metrics: {e}")
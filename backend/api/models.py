@@ -10,6 +10,7 @@ class CameraBase(BaseModel):
     name: str = Field(..., description="Camera name")
     location_tag: Optional[str] = Field(None, description="Hierarchical location tag")
     rtsp_url: str = Field(..., description="RTSP stream URL")
+    fps_target: Optional[float] = Field(None, ge=0, description="Analysis FPS override (defaults to system.fps_target)")
 
 
 class CameraCreate(CameraBase):
@@ -20,6 +21,7 @@ class CameraUpdate(BaseModel):
     name: Optional[str] = None
     location_tag: Optional[str] = None
     rtsp_url: Optional[str] = None
+    fps_target: Optional[float] = Field(None, ge=0, description="null reverts to system.fps_target, 0 analyzes every frame")
 
 
 class Camera(CameraBase):
@@ -60,7 +62,10 @@ class EventBase(BaseModel):
     object_type: Optional[str] = None
     confidence: Optional[float] = None
     bbox: Optional[List[int]] = None
+    zone_id: Optional[int] = None
+    track_id: Optional[str] = None
     snapshot_path: Optional[str] = None
+    snapshot_urls: Optional[dict] = None  # full / thumbnail / crop image URLs
     priority: str = "medium"
     status: str = "new"
     metadata: Optional[dict] = None
@@ -0,0 +1,95 @@
+"""
+Storage backend interface shared by the SQLite and PostgreSQL implementations
+"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import List, Sequence
+
+
+class StorageBackend(ABC):
+    """
+    Database access used by the services
+
+    Services write SQL with `?` placeholders and portable syntax (ON CONFLICT,
+    row values, partial indexes); each backend adapts it to its driver and
+    provides the few dialect-specific pieces below.
+    """
+
+    dialect = None
+
+    @abstractmethod
+    def execute(self, query: str, params: tuple = ()):
+        """Execute a statement and commit, returns the cursor (rowcount)"""
+
+    @abstractmethod
+    def insert(self, query: str, params: tuple = ()) -> int:
+        """Execute an INSERT into a table with an `id` key and return the new id"""
+
+    @abstractmethod
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one cursor and commit them together"""
+
+    @abstractmethod
+    def fetchone(self, query: str, params: tuple = ()):
+        """Fetch one result"""
+
+    @abstractmethod
+    def fetchall(self, query: str, params: tuple = ()):
+        """Fetch all results"""
+
+    @abstractmethod
+    def insert_rows(self, cursor, table: str, columns: Sequence[str], rows: List[tuple]):
+        """Bulk insert rows inside a transaction"""
+
+    def table_exists(self, table: str) -> bool:
+        """Check whether a table exists"""
+        return table in self.list_tables()
+
+    @abstractmethod
+    def list_tables(self) -> List[str]:
+        """Names of all tables"""
+
+    @abstractmethod
+    def table_columns(self, table: str) -> List[str]:
+        """Column names of a table"""
+
+    @abstractmethod
+    def is_missing_table(self, error: Exception) -> bool:
+        """Check whether a query failed because its table does not exist (e.g. a dropped partition)"""
+
+    @abstractmethod
+    def explain(self, query: str, params: tuple = ()) -> List[str]:
+        """Query plan lines for a query"""
+
+    @abstractmethod
+    def bucket_expression(self, column: str, fmt: str) -> str:
+        """SQL expression formatting a timestamp column with a strftime-style format"""
+
+    @abstractmethod
+    def create_search_index(self, cursor, table: str, fields: Sequence[str]):
+        """Create the full-text index {table}_search over the given document fields"""
+
+    @abstractmethod
+    def index_search_documents(self, cursor, table: str, fields: Sequence[str], select: str, params: tuple = ()):
+        """Add documents to {table}_search; select yields the event id followed by the fields"""
+
+    @abstractmethod
+    def search_match(self, terms: List[str]) -> str:
+        """Match expression requiring every term (each as a word prefix)"""
+
+    @abstractmethod
+    def search_query(self, table: str, where: str) -> str:
+        """
+        Ranked full-text query on one partition
+
+        Params are (match, *where params, limit); rows are the partition's
+        columns plus `score`, best match first (lower is better).
+        """
+
+    def optimize(self):
+        """Refresh planner statistics if the backend needs it"""
+
+    @abstractmethod
+    def close(self):
+        """Close database connections"""
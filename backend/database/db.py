@@ -3,27 +3,84 @@ Database schema and initialization for SentinelSight
 """
 import sqlite3
 import threading
+import queue
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from typing import List, Sequence
 import logging
+from backend.database.backend import StorageBackend
 
 logger = logging.getLogger(__name__)
 
 
-class Database:
-    def __init__(self, db_path: str = "../data/sentinelsight.db"):
+class Database(StorageBackend):
+    """SQLite storage backend"""
+
+    dialect = "sqlite"
+
+    def __init__(
+        self,
+        db_path: str = "../data/sentinelsight.db",
+        read_pool_size: int = 4,
+        synchronous: str = "NORMAL",
+        cache_size_kb: int = 65536,
+        mmap_size_mb: int = 256
+    ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn = None
         self.lock = threading.Lock()
+        
+        # Tuning applied to every connection
+        self.synchronous = synchronous
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size_mb = mmap_size_mb
+        
+        # Read-only connections; in WAL mode readers don't block the writer or each other
+        self.read_pool_size = read_pool_size
+        self.read_pool: queue.Queue = queue.Queue()
         self.initialize()
 
     def initialize(self):
         """Initialize database with schema"""
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
+        self.conn = self._connect()
+        self.conn.execute("PRAGMA journal_mode=WAL")
         self._create_tables()
-        logger.info(f"Database initialized at {self.db_path}")
+        
+        for _ in range(self.read_pool_size):
+            self.read_pool.put(self._connect(read_only=True))
+        logger.info(f"Database initialized at {self.db_path} (WAL, {self.read_pool_size} readers)")
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a connection with the configured pragmas"""
+        if read_only:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size={-int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size_mb) * 1024 * 1024}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _read_connection(self):
+        """Borrow a connection for a read (falls back to the writer if there is no pool)"""
+        if self.read_pool_size <= 0:
+            with self.lock:
+                yield self.conn
+            return
+        
+        conn = self.read_pool.get()
+        try:
+            yield conn
+        finally:
+            self.read_pool.put(conn)
 
     def _create_tables(self):
         """Create all database tables"""
@@ -39,6 +96,7 @@ class Database:
                 status TEXT DEFAULT 'offline',
                 fps REAL DEFAULT 0,
                 last_frame_time TIMESTAMP,
+                fps_target REAL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -57,48 +115,67 @@ class Database:
             )
         """)
 
-        # Events table
+        # Events live in per-period partition tables (see partitions.py); this
+        # catalog lists them with their day range, id range and row count
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
+            CREATE TABLE IF NOT EXISTS event_partitions (
+                name TEXT PRIMARY KEY,
+                start_day DATE NOT NULL,
+                end_day DATE NOT NULL,
+                min_id INTEGER,
+                max_id INTEGER,
+                row_count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # Event ids are allocated here so they stay unique across partitions
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS event_id_sequence (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                next_id INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("INSERT INTO event_id_sequence (id, next_id) VALUES (1, 1) ON CONFLICT (id) DO NOTHING")
+
+        # Event counts per time bucket, maintained on insert (stats and trend charts).
+        # zone_id is 0 for events outside any zone. Rollups without the zone
+        # dimension are dropped here and rebuilt from the events.
+        rollup_columns = [row['name'] for row in cursor.execute("PRAGMA table_info(event_rollups)").fetchall()]
+        if rollup_columns and 'zone_id' not in rollup_columns:
+            cursor.execute("DROP TABLE event_rollups")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS event_rollups (
+                granularity TEXT NOT NULL,
+                bucket TIMESTAMP NOT NULL,
                 camera_id INTEGER NOT NULL,
-                timestamp TIMESTAMP NOT NULL,
+                zone_id INTEGER NOT NULL DEFAULT 0,
                 rule_type TEXT NOT NULL,
-                object_type TEXT,
-                confidence REAL,
-                bbox TEXT,
-                snapshot_path TEXT,
-                priority TEXT DEFAULT 'medium',
-                status TEXT DEFAULT 'new',
-                metadata TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (camera_id) REFERENCES cameras(id) ON DELETE CASCADE
-            )
+                priority TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (granularity, bucket, camera_id, zone_id, rule_type, priority)
+            ) WITHOUT ROWID
         """)
 
-        # Create indexes for fast queries
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_camera ON events(camera_id)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp DESC)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_rule ON events(rule_type)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_priority ON events(priority)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_status ON events(status)"
-        )
-        cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_events_composite ON events(camera_id, timestamp DESC)"
-        )
+        # Columns added after the initial schema (existing databases)
+        self._ensure_column(cursor, "cameras", "fps_target", "REAL")
 
         self.conn.commit()
+        self.optimize()
         logger.info("Database tables created successfully")
 
+    def _ensure_column(self, cursor, table: str, column: str, definition: str):
+        """Add a column to an existing table if it is missing"""
+        columns = [row['name'] for row in cursor.execute(f"PRAGMA table_info({table})").fetchall()]
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logger.info(f"Added column {table}.{column}")
+
+    def optimize(self):
+        """Refresh planner statistics (cheap, only re-analyzes tables that need it)"""
+        with self.lock:
+            self.conn.execute("PRAGMA analysis_limit=1000")
+            self.conn.execute("PRAGMA optimize")
+
     def execute(self, query: str, params: tuple = ()):
         """Execute a query and return cursor"""
         with self.lock:
@@ -107,23 +184,102 @@ class Database:
             self.conn.commit()
             return cursor
 
-    def fetchone(self, query: str, params: tuple = ()):
-        """Fetch one result"""
+    def insert(self, query: str, params: tuple = ()) -> int:
+        """Execute an INSERT and return the new row id"""
+        return self.execute(query, params).lastrowid
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one cursor and commit them together"""
         with self.lock:
             cursor = self.conn.cursor()
+            try:
+                yield cursor
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def fetchone(self, query: str, params: tuple = ()):
+        """Fetch one result"""
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(query, params)
             return cursor.fetchone()
 
     def fetchall(self, query: str, params: tuple = ()):
         """Fetch all results"""
-        with self.lock:
-            cursor = self.conn.cursor()
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(query, params)
             return cursor.fetchall()
 
+    def insert_rows(self, cursor, table: str, columns: Sequence[str], rows: List[tuple]):
+        """Bulk insert rows inside a transaction"""
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            rows
+        )
+
+    def list_tables(self) -> List[str]:
+        """Names of all tables"""
+        rows = self.fetchall("SELECT name FROM sqlite_master WHERE type = 'table'")
+        return [row['name'] for row in rows]
+
+    def table_exists(self, table: str) -> bool:
+        """Check whether a table exists"""
+        return self.fetchone(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ) is not None
+
+    def table_columns(self, table: str) -> List[str]:
+        """Column names of a table"""
+        return [row['name'] for row in self.fetchall(f"PRAGMA table_info({table})")]
+
+    def is_missing_table(self, error: Exception) -> bool:
+        """Check whether a query failed because its table does not exist"""
+        return isinstance(error, sqlite3.OperationalError) and "no such table" in str(error)
+
+    def explain(self, query: str, params: tuple = ()) -> List[str]:
+        """Query plan lines for a query"""
+        return [row['detail'] for row in self.fetchall(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    def bucket_expression(self, column: str, fmt: str) -> str:
+        """SQL expression formatting a timestamp column with a strftime-style format"""
+        return f"strftime('{fmt}', {column})"
+
+    def create_search_index(self, cursor, table: str, fields: Sequence[str]):
+        """Create the full-text index {table}_search (contentless FTS5, rowid = event id)"""
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {table}_search
+            USING fts5({', '.join(fields)}, content='', tokenize='porter unicode61')
+        """)
+
+    def index_search_documents(self, cursor, table: str, fields: Sequence[str], select: str, params: tuple = ()):
+        """Add documents to {table}_search; select yields the event id followed by the fields"""
+        cursor.execute(f"INSERT INTO {table}_search (rowid, {', '.join(fields)}) {select}", params)
+
+    def search_match(self, terms: List[str]) -> str:
+        """Match expression requiring every term (each as a word prefix)"""
+        return " ".join(f'"{term}"*' for term in terms)
+
+    def search_query(self, table: str, where: str) -> str:
+        """Ranked full-text query on one partition (bm25 rank)"""
+        return f"""
+            SELECT e.*, s.rank AS score
+            FROM (SELECT rowid, rank FROM {table}_search WHERE {table}_search MATCH ?) AS s
+            JOIN {table} e ON e.id = s.rowid
+            WHERE {where}
+            ORDER BY s.rank, e.timestamp DESC
+            LIMIT ?
+        """
+
     def close(self):
-        """Close database connection"""
+        """Close database connections"""
+        while not self.read_pool.empty():
+            self.read_pool.get_nowait().close()
         if self.conn:
+            self.optimize()
             self.conn.close()
             logger.info("Database connection closed")
 
@@ -132,15 +288,28 @@ class Database:
 db = None
 
 
-def get_db():
-    """Get database instance"""
+def get_db() -> StorageBackend:
+    """Get database instance (backend chosen by the database.url scheme)"""
     global db
     if db is None:
         from backend.config.config import get_config
         config = get_config()
+        url = config.database.url
+        
+        if url.startswith(("postgresql://", "postgres://")):
+            from backend.database.postgres import PostgresDatabase
+            db = PostgresDatabase(url, pool_size=config.database.pool_size)
+            return db
+        
         # Parse path from URL (remove sqlite:/// prefix)
-        db_path = config.database.url.replace("sqlite:///", "")
-        db = Database(db_path)
+        db_path = url.replace("sqlite:///", "")
+        db = Database(
+            db_path,
+            read_pool_size=config.database.read_pool_size,
+            synchronous=config.database.synchronous,
+            cache_size_kb=config.database.cache_size_kb,
+            mmap_size_mb=config.database.mmap_size_mb
+        )
     return db
 
 
@@ -0,0 +1,361 @@
+"""
+Time-partitioned event storage - one events table per day (or per N days)
+"""
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Legacy single events table, migrated into partitions on startup
+LEGACY_TABLE = "events"
+
+# Partitions may be created by other nodes sharing the database; re-read the catalog this often
+CATALOG_REFRESH_SECONDS = 30
+
+# bbox and the common metadata fields are typed columns; other metadata goes in `extra` (compact JSON)
+BBOX_COLUMNS = ('bbox_x1', 'bbox_y1', 'bbox_x2', 'bbox_y2')
+METADATA_COLUMNS = ('zone_name', 'duration_seconds', 'inference_time_ms')
+
+EVENT_COLUMNS = (
+    'id', 'camera_id', 'timestamp', 'rule_type', 'object_type', 'confidence',
+    *BBOX_COLUMNS, 'zone_id', 'track_id', 'snapshot_path', 'priority', 'status',
+    *METADATA_COLUMNS, 'extra', 'created_at'
+)
+
+# Columns that replaced the JSON bbox/metadata text columns
+TYPED_COLUMNS = {
+    'bbox_x1': 'INTEGER', 'bbox_y1': 'INTEGER', 'bbox_x2': 'INTEGER', 'bbox_y2': 'INTEGER',
+    'zone_id': 'INTEGER', 'zone_name': 'TEXT', 'duration_seconds': 'INTEGER',
+    'inference_time_ms': 'REAL', 'extra': 'TEXT'
+}
+
+# Columns added to existing partitions on startup
+ADDED_COLUMNS = {
+    'track_id': 'TEXT'
+}
+
+# Text indexed for search (per partition, so retention drops it with the events);
+# camera name and location are copied at write time
+SEARCH_FIELDS = {
+    'camera_name': 'c.name',
+    'location_tag': 'c.location_tag',
+    'zone_name': 'e.zone_name',
+    'object_type': 'e.object_type',
+    'rule_type': 'e.rule_type',
+    'priority': 'e.priority',
+    'extra': 'e.extra'
+}
+
+
+def _json_conversions() -> Dict[str, str]:
+    """SQL expressions deriving the typed columns from JSON bbox/metadata columns (SQLite JSON1)"""
+    conversions = {column: f"json_extract(bbox, '$[{i}]')" for i, column in enumerate(BBOX_COLUMNS)}
+    promoted_columns = ('zone_id',) + METADATA_COLUMNS
+    conversions.update({column: f"json_extract(metadata, '$.{column}')" for column in promoted_columns})
+    promoted = ", ".join(f"'$.{column}'" for column in promoted_columns)
+    conversions['extra'] = f"NULLIF(json_remove(metadata, {promoted}), '{{}}')"
+    return conversions
+
+
+def _as_date(value) -> date:
+    """Date of a datetime, date or ISO timestamp string"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value)).date()
+
+
+class EventPartitions:
+    """Catalog of per-period event tables named events_YYYYMMDD (period start)"""
+
+    def __init__(self, db, partition_days: int = 1):
+        self.db = db
+        self.partition_days = max(1, partition_days)
+
+        # name -> (start_day, end_day), end exclusive; mirrors the event_partitions table
+        self.partitions: Dict[str, Tuple[date, date]] = {}
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+        self._upgrade_partitions()
+        self._migrate_legacy_table()
+        self.reload()
+
+    def reload(self):
+        """Reload the partition catalog from the database"""
+        rows = self.db.fetchall("SELECT name, start_day, end_day FROM event_partitions")
+        with self.lock:
+            self.partitions = {
+                row['name']: (_as_date(row['start_day']), _as_date(row['end_day']))
+                for row in rows
+            }
+            self.loaded_at = time.monotonic()
+
+    def period_start(self, value) -> date:
+        """First day of the partition period containing value (periods are aligned to Mondays)"""
+        ordinal = _as_date(value).toordinal()
+        return date.fromordinal(ordinal - (ordinal - 1) % self.partition_days)
+
+    def ensure(self, cursor, timestamp) -> str:
+        """Get the partition for a timestamp, creating it if needed (inside a write transaction)"""
+        start = self.period_start(timestamp)
+        name = f"events_{start.strftime('%Y%m%d')}"
+
+        with self.lock:
+            if name in self.partitions:
+                return name
+
+        end = start + timedelta(days=self.partition_days)
+        self._create_table(cursor, name)
+        cursor.execute(
+            "INSERT INTO event_partitions (name, start_day, end_day) VALUES (?, ?, ?) ON CONFLICT (name) DO NOTHING",
+            (name, start.isoformat(), end.isoformat())
+        )
+        with self.lock:
+            self.partitions[name] = (start, end)
+        logger.info(f"Created event partition {name}")
+        return name
+
+    def allocate_ids(self, cursor, count: int) -> int:
+        """Reserve count global event ids, returns the first one (inside a write transaction)"""
+        row = cursor.execute(
+            "UPDATE event_id_sequence SET next_id = next_id + ? WHERE id = 1 RETURNING next_id", (count,)
+        ).fetchone()
+        return row['next_id'] - count
+
+    def record_rows(self, cursor, name: str, min_id: int, max_id: int, count: int):
+        """Update a partition's id range and row count after inserting rows"""
+        cursor.execute(
+            """
+            UPDATE event_partitions
+            SET min_id = CASE WHEN min_id IS NULL OR min_id > ? THEN ? ELSE min_id END,
+                max_id = CASE WHEN max_id IS NULL OR max_id < ? THEN ? ELSE max_id END,
+                row_count = row_count + ?
+            WHERE name = ?
+            """,
+            (min_id, min_id, max_id, max_id, count, name)
+        )
+
+    def in_range(self, from_time=None, to_time=None) -> List[str]:
+        """Partitions that may hold events between from_time and to_time, newest first"""
+        from_day = _as_date(from_time) if from_time else None
+        to_day = _as_date(to_time) if to_time else None
+
+        if time.monotonic() - self.loaded_at > CATALOG_REFRESH_SECONDS:
+            self.reload()
+
+        with self.lock:
+            partitions = list(self.partitions.items())
+
+        return [
+            name for name, (start, end) in sorted(partitions, key=lambda p: p[1][0], reverse=True)
+            if (to_day is None or start <= to_day) and (from_day is None or end > from_day)
+        ]
+
+    def for_id(self, event_id: int) -> List[str]:
+        """Partitions whose id range contains event_id (usually exactly one)"""
+        rows = self.db.fetchall(
+            "SELECT name FROM event_partitions WHERE ? BETWEEN min_id AND max_id ORDER BY start_day DESC",
+            (event_id,)
+        )
+        return [row['name'] for row in rows]
+
+    def has_events(self) -> bool:
+        """Check whether any partition holds rows"""
+        return self.db.fetchone("SELECT 1 FROM event_partitions WHERE row_count > 0 LIMIT 1") is not None
+
+    def drop_before(self, cutoff_day: date) -> int:
+        """Drop every partition that ends on or before cutoff_day, returns the number of events dropped"""
+        with self.lock:
+            expired = [name for name, (_, end) in self.partitions.items() if end <= cutoff_day]
+
+        if not expired:
+            return 0
+
+        dropped_rows = 0
+        with self.db.transaction() as cursor:
+            for name in expired:
+                row = cursor.execute(
+                    "SELECT row_count FROM event_partitions WHERE name = ?", (name,)
+                ).fetchone()
+                dropped_rows += row['row_count'] if row else 0
+                cursor.execute(f"DROP TABLE IF EXISTS {name}_search")
+                cursor.execute(f"DROP TABLE IF EXISTS {name}")
+                cursor.execute("DELETE FROM event_partitions WHERE name = ?", (name,))
+
+        with self.lock:
+            for name in expired:
+                self.partitions.pop(name, None)
+
+        logger.info(f"Dropped {len(expired)} event partition(s) ({dropped_rows} events) before {cutoff_day}")
+        return dropped_rows
+
+    def _create_table(self, cursor, name: str):
+        """Create one partition table with the event indexes"""
+        # The camera foreign key is only enforced on PostgreSQL (SQLite runs without
+        # PRAGMA foreign_keys): there, deleting a camera also deletes its events and
+        # events for unknown cameras are rejected; on SQLite both are left as they are.
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {name} (
+                id INTEGER PRIMARY KEY,
+                camera_id INTEGER NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                rule_type TEXT NOT NULL,
+                object_type TEXT,
+                confidence REAL,
+                bbox_x1 INTEGER,
+                bbox_y1 INTEGER,
+                bbox_x2 INTEGER,
+                bbox_y2 INTEGER,
+                zone_id INTEGER,
+                track_id TEXT,
+                snapshot_path TEXT,
+                priority TEXT DEFAULT 'medium',
+                status TEXT DEFAULT 'new',
+                zone_name TEXT,
+                duration_seconds INTEGER,
+                inference_time_ms REAL,
+                extra TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (camera_id) REFERENCES cameras(id) ON DELETE CASCADE
+            )
+        """)
+        self._create_indexes(cursor, name)
+        self.db.create_search_index(cursor, name, list(SEARCH_FIELDS))
+
+    def index_search(self, cursor, name: str, where: str = "1=1", params: tuple = ()):
+        """Add the partition rows matching `where` (columns as e.*) to its search index"""
+        fields = ", ".join(f"{expression} AS {field}" for field, expression in SEARCH_FIELDS.items())
+        self.db.index_search_documents(
+            cursor, name, list(SEARCH_FIELDS),
+            f"SELECT e.id, {fields} FROM {name} e LEFT JOIN cameras c ON c.id = e.camera_id WHERE {where}",
+            params
+        )
+
+    def _create_indexes(self, cursor, name: str):
+        """Create the event indexes on one partition"""
+        # Every index ends in timestamp (ascending): scanned backwards it yields
+        # ORDER BY timestamp DESC, id DESC without a sort (keyset pagination)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name}_time ON {name}(timestamp)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name}_camera_time ON {name}(camera_id, timestamp)")
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name}_camera_rule_time ON {name}(camera_id, rule_type, timestamp)"
+        )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name}_rule_time ON {name}(rule_type, timestamp)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name}_priority_time ON {name}(priority, timestamp)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name}_zone_time ON {name}(zone_id, timestamp)")
+        # Only unhandled events are queried by status; the rest are a time-range scan
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name}_new_time ON {name}(timestamp) WHERE status = 'new'"
+        )
+
+    def _upgrade_partitions(self):
+        """Bring partitions created by older versions up to the current columns and indexes"""
+        conversions = _json_conversions()
+        for row in self.db.fetchall("SELECT name FROM event_partitions"):
+            name = row['name']
+            columns = self.db.table_columns(name)
+            has_search = self.db.table_exists(f"{name}_search")
+
+            with self.db.transaction() as cursor:
+                # bbox/metadata stored as JSON text -> typed columns (only SQLite databases
+                # predate the typed columns; PostgreSQL partitions are created with them)
+                if 'bbox' in columns:
+                    for column, definition in TYPED_COLUMNS.items():
+                        cursor.execute(f"ALTER TABLE {name} ADD COLUMN {column} {definition}")
+                    cursor.execute(
+                        f"UPDATE {name} SET ({', '.join(TYPED_COLUMNS)}) = "
+                        f"({', '.join(conversions[column] for column in TYPED_COLUMNS)})"
+                    )
+                    cursor.execute(f"ALTER TABLE {name} DROP COLUMN bbox")
+                    cursor.execute(f"ALTER TABLE {name} DROP COLUMN metadata")
+                    logger.info(f"Converted JSON bbox/metadata columns of {name}")
+
+                for column, definition in ADDED_COLUMNS.items():
+                    if column not in columns:
+                        cursor.execute(f"ALTER TABLE {name} ADD COLUMN {column} {definition}")
+
+                self._create_indexes(cursor, name)
+
+                if not has_search:
+                    self.db.create_search_index(cursor, name, list(SEARCH_FIELDS))
+                    self.index_search(cursor, name)
+                    logger.info(f"Built search index of {name}")
+
+    def _migrate_legacy_table(self):
+        """
+        Move rows from the old single events table into partitions, then drop it
+
+        SQLite only: the single table predates the PostgreSQL backend, so this
+        uses SQLite's date() and JSON functions. Rows that could not be placed
+        in a partition (NULL or unparseable timestamps) are never dropped: the
+        table is renamed instead and kept for manual recovery.
+        """
+        if not self.db.table_exists(LEGACY_TABLE):
+            return
+        if self.db.dialect != 'sqlite':
+            logger.warning(f"Legacy {LEGACY_TABLE} table found on {self.db.dialect}, not migrating it")
+            return
+
+        days = [
+            row['day'] for row in self.db.fetchall(
+                f"SELECT DISTINCT date(timestamp) AS day FROM {LEGACY_TABLE} WHERE date(timestamp) IS NOT NULL"
+            )
+        ]
+        periods = sorted({self.period_start(day) for day in days})
+        conversions = _json_conversions()
+        conversions.update({column: 'NULL' for column in ADDED_COLUMNS})
+        columns = ", ".join(EVENT_COLUMNS)
+        select = ", ".join(conversions.get(column, column) for column in EVENT_COLUMNS)
+
+        with self.db.transaction() as cursor:
+            moved = 0
+            for start in periods:
+                name = self.ensure(cursor, start)
+                end = start + timedelta(days=self.partition_days)
+                inserted = cursor.execute(
+                    f"""
+                    INSERT INTO {name} ({columns})
+                    SELECT {select} FROM {LEGACY_TABLE}
+                    WHERE timestamp >= ? AND timestamp < ?
+                    """,
+                    (start.isoformat(), end.isoformat())
+                ).rowcount
+                cursor.execute(
+                    f"""
+                    UPDATE event_partitions
+                    SET (min_id, max_id, row_count) = (SELECT MIN(id), MAX(id), COUNT(*) FROM {name})
+                    WHERE name = ?
+                    """,
+                    (name,)
+                )
+                self.index_search(cursor, name, f"e.id IN (SELECT id FROM {LEGACY_TABLE})")
+                moved += inserted
+
+            # Keep ids unique across the migration
+            next_id = f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {LEGACY_TABLE})"
+            cursor.execute(
+                f"""
+                UPDATE event_id_sequence
+                SET next_id = CASE WHEN next_id < {next_id} THEN {next_id} ELSE next_id END
+                WHERE id = 1
+                """
+            )
+
+            total = cursor.execute(f"SELECT COUNT(*) FROM {LEGACY_TABLE}").fetchone()[0]
+            if moved == total:
+                cursor.execute(f"DROP TABLE {LEGACY_TABLE}")
+            else:
+                kept = f"{LEGACY_TABLE}_unmigrated_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+                cursor.execute(f"ALTER TABLE {LEGACY_TABLE} RENAME TO {kept}")
+                logger.error(
+                    f"Only {moved} of {total} legacy events could be migrated; "
+                    f"kept the original table as {kept}"
+                )
+
+        logger.info(f"Migrated {moved} events into {len(periods)} partition(s)")
+
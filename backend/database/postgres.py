@@ -0,0 +1,300 @@
+"""
+PostgreSQL storage backend (also works against TimescaleDB) with a pooled connection set
+"""
+import io
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Sequence
+import psycopg2
+import psycopg2.errors
+import psycopg2.extras
+import psycopg2.pool
+from backend.database.backend import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# strftime directives used by the services -> to_char patterns
+_TO_CHAR_PATTERNS = {'%Y': 'YYYY', '%m': 'MM', '%d': 'DD', '%H': 'HH24', '%M': 'MI', '%S': 'SS'}
+
+
+@lru_cache(maxsize=512)
+def _translate(query: str) -> str:
+    """Convert ? placeholders to %s (outside string literals) and escape literal %"""
+    parts = []
+    in_literal = False
+    for char in query:
+        if char == "'":
+            in_literal = not in_literal
+            parts.append(char)
+        elif char == "?" and not in_literal:
+            parts.append("%s")
+        elif char == "%":
+            parts.append("%%")
+        else:
+            parts.append(char)
+    return "".join(parts)
+
+
+def _copy_value(value) -> str:
+    """Encode one value for COPY ... FROM STDIN (text format)"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class _Cursor:
+    """psycopg2 cursor that accepts the services' ?-style queries"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query: str, params: tuple = ()):
+        self.cursor.execute(_translate(query), tuple(params))
+        return self
+
+    def executemany(self, query: str, params_seq):
+        psycopg2.extras.execute_batch(self.cursor, _translate(query), list(params_seq))
+        return self
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    @property
+    def rowcount(self) -> int:
+        return self.cursor.rowcount
+
+
+class PostgresDatabase(StorageBackend):
+    """PostgreSQL storage backend; several edge nodes can write to one database"""
+
+    dialect = "postgresql"
+
+    def __init__(self, url: str, pool_size: int = 8):
+        self.url = url
+        self.pool_size = max(1, pool_size)
+        self.pool = psycopg2.pool.ThreadedConnectionPool(1, self.pool_size, dsn=url)
+
+        # ThreadedConnectionPool raises when exhausted; make callers wait instead
+        self.slots = threading.BoundedSemaphore(self.pool_size)
+        self.initialize()
+
+    def initialize(self):
+        """Initialize database with schema"""
+        self._create_tables()
+        logger.info(f"PostgreSQL database initialized ({self.pool_size} pooled connections)")
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection; any transaction left open is rolled back on return"""
+        with self.slots:
+            conn = self.pool.getconn()
+            try:
+                yield conn
+            finally:
+                if not conn.closed:
+                    conn.rollback()
+                self.pool.putconn(conn, close=bool(conn.closed))
+
+    def _cursor(self, conn) -> _Cursor:
+        """Cursor returning rows as dicts, like sqlite3.Row"""
+        return _Cursor(conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor))
+
+    def _create_tables(self):
+        """Create all database tables"""
+        with self.transaction() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS cameras (
+                    id SERIAL PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    location_tag TEXT,
+                    rtsp_url TEXT NOT NULL UNIQUE,
+                    status TEXT DEFAULT 'offline',
+                    fps REAL DEFAULT 0,
+                    last_frame_time TIMESTAMP,
+                    fps_target REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS zones (
+                    id SERIAL PRIMARY KEY,
+                    camera_id INTEGER NOT NULL REFERENCES cameras(id) ON DELETE CASCADE,
+                    name TEXT NOT NULL,
+                    type TEXT DEFAULT 'polygon',
+                    coordinates TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
+            # Same event layout as SQLite: partition catalog, id sequence, rollups
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS event_partitions (
+                    name TEXT PRIMARY KEY,
+                    start_day DATE NOT NULL,
+                    end_day DATE NOT NULL,
+                    min_id INTEGER,
+                    max_id INTEGER,
+                    row_count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS event_id_sequence (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    next_id BIGINT NOT NULL
+                )
+            """)
+            cursor.execute("INSERT INTO event_id_sequence (id, next_id) VALUES (1, 1) ON CONFLICT (id) DO NOTHING")
+
+            # Buckets are text so they compare and key exactly like the SQLite strftime() buckets
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS event_rollups (
+                    granularity TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    camera_id INTEGER NOT NULL,
+                    zone_id INTEGER NOT NULL DEFAULT 0,
+                    rule_type TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (granularity, bucket, camera_id, zone_id, rule_type, priority)
+                )
+            """)
+        logger.info("Database tables created successfully")
+
+    def execute(self, query: str, params: tuple = ()):
+        """Execute a query and return cursor"""
+        with self._connection() as conn:
+            cursor = self._cursor(conn).execute(query, params)
+            conn.commit()
+            return cursor
+
+    def insert(self, query: str, params: tuple = ()) -> int:
+        """Execute an INSERT and return the new row id"""
+        with self._connection() as conn:
+            row = self._cursor(conn).execute(f"{query.rstrip()} RETURNING id", params).fetchone()
+            conn.commit()
+            return row['id']
+
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one cursor and commit them together"""
+        with self._connection() as conn:
+            yield self._cursor(conn)
+            conn.commit()
+
+    def fetchone(self, query: str, params: tuple = ()):
+        """Fetch one result"""
+        with self._connection() as conn:
+            return self._cursor(conn).execute(query, params).fetchone()
+
+    def fetchall(self, query: str, params: tuple = ()):
+        """Fetch all results"""
+        with self._connection() as conn:
+            return self._cursor(conn).execute(query, params).fetchall()
+
+    def insert_rows(self, cursor: _Cursor, table: str, columns: Sequence[str], rows: List[tuple]):
+        """Bulk insert rows inside a transaction with COPY"""
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(value) for value in row))
+            buffer.write("\n")
+        buffer.seek(0)
+        cursor.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+
+    def list_tables(self) -> List[str]:
+        """Names of all tables"""
+        rows = self.fetchall(
+            "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()"
+        )
+        return [row['table_name'] for row in rows]
+
+    def table_exists(self, table: str) -> bool:
+        """Check whether a table exists"""
+        return self.fetchone(
+            """
+            SELECT 1 FROM information_schema.tables
+            WHERE table_schema = current_schema() AND table_name = ?
+            """,
+            (table,)
+        ) is not None
+
+    def table_columns(self, table: str) -> List[str]:
+        """Column names of a table"""
+        rows = self.fetchall(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = ?
+            ORDER BY ordinal_position
+            """,
+            (table,)
+        )
+        return [row['column_name'] for row in rows]
+
+    def is_missing_table(self, error: Exception) -> bool:
+        """Check whether a query failed because its table does not exist"""
+        return isinstance(error, psycopg2.errors.UndefinedTable)
+
+    def explain(self, query: str, params: tuple = ()) -> List[str]:
+        """Query plan lines for a query"""
+        return [row['QUERY PLAN'] for row in self.fetchall(f"EXPLAIN {query}", params)]
+
+    def bucket_expression(self, column: str, fmt: str) -> str:
+        """SQL expression formatting a timestamp column with a strftime-style format"""
+        for directive, pattern in _TO_CHAR_PATTERNS.items():
+            fmt = fmt.replace(directive, pattern)
+        return f"to_char({column}, '{fmt}')"
+
+    def create_search_index(self, cursor, table: str, fields: Sequence[str]):
+        """Create the full-text index {table}_search (tsvector per event with a GIN index)"""
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table}_search (
+                event_id INTEGER PRIMARY KEY,
+                document TSVECTOR NOT NULL
+            )
+        """)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {table}_search_document ON {table}_search USING GIN (document)")
+
+    def index_search_documents(self, cursor, table: str, fields: Sequence[str], select: str, params: tuple = ()):
+        """Add documents to {table}_search; select yields the event id followed by the fields"""
+        cursor.execute(
+            f"""
+            INSERT INTO {table}_search (event_id, document)
+            SELECT d.id, to_tsvector('english', concat_ws(' ', {', '.join(f'd.{field}' for field in fields)}))
+            FROM ({select}) AS d
+            """,
+            params
+        )
+
+    def search_match(self, terms: List[str]) -> str:
+        """Match expression requiring every term (each as a word prefix)"""
+        return " & ".join(f"{term}:*" for term in terms)
+
+    def search_query(self, table: str, where: str) -> str:
+        """Ranked full-text query on one partition (ts_rank, negated so lower is better)"""
+        return f"""
+            SELECT e.*, -ts_rank(s.document, q.query) AS score
+            FROM to_tsquery('english', ?) AS q(query)
+            JOIN {table}_search s ON s.document @@ q.query
+            JOIN {table} e ON e.id = s.event_id
+            WHERE {where}
+            ORDER BY score, e.timestamp DESC
+            LIMIT ?
+        """
+
+    def close(self):
+        """Close database connections"""
+        self.pool.closeall()
+        logger.info("Database connection closed")
@@ -0,0 +1,170 @@
+"""
+Cross-camera batch scheduler - groups frames from all cameras into shared inference passes
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Set
+import numpy as np
+from backend.services.inference_engine import get_inference_engine
+from backend.config.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class BatchScheduler:
+    def __init__(self):
+        self.config = get_config()
+        self.inference_engine = get_inference_engine()
+        self.max_batch_size = max(1, self.config.inference.max_batch_size)
+        self.max_wait = max(0, self.config.inference.max_batch_wait_ms) / 1000.0
+
+        # Pending requests: (camera_id, frame, roi, future)
+        self.requests: queue.Queue = queue.Queue()
+
+        # Cameras currently feeding the scheduler (bounds how long we wait for a batch to fill)
+        self.sources: Set[int] = set()
+        self.batch_sizes: List[int] = []
+        self.lock = threading.Lock()
+
+        self.stop_flag = threading.Event()
+        self.worker = None
+
+    def start(self):
+        """Start the batching worker thread"""
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive():
+                return
+            self.stop_flag.clear()
+            self.worker = threading.Thread(target=self._worker_loop, daemon=True)
+            self.worker.start()
+        logger.info(
+            f"Batch scheduler started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={int(self.max_wait * 1000)})"
+        )
+
+    def stop(self):
+        """Stop the worker thread and fail any pending requests"""
+        self.stop_flag.set()
+        if self.worker is not None:
+            self.worker.join(timeout=5)
+
+        while True:
+            try:
+                _, _, _, future = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("Batch scheduler stopped"))
+        logger.info("Batch scheduler stopped")
+
+    def register_source(self, camera_id: int):
+        """Register a camera that will submit frames"""
+        with self.lock:
+            self.sources.add(camera_id)
+
+    def unregister_source(self, camera_id: int):
+        """Unregister a camera that no longer submits frames"""
+        with self.lock:
+            self.sources.discard(camera_id)
+
+    def submit(self, camera_id: int, frame: np.ndarray, roi: Optional[tuple] = None) -> Future:
+        """Queue a frame for batched inference, returns a future resolving to its detections"""
+        future = Future()
+        self.requests.put((camera_id, frame, roi, future))
+        return future
+
+    def detect(
+        self,
+        camera_id: int,
+        frame: np.ndarray,
+        roi: Optional[tuple] = None,
+        timeout: float = 30.0
+    ) -> List[Dict]:
+        """Submit a frame and block until its detections are available"""
+        future = self.submit(camera_id, frame, roi)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # The request still references the caller's (pooled) frame: withdraw it before the
+            # caller reuses the buffer, or wait for the batch already running on it
+            if future.cancel():
+                raise
+            return future.result()
+
+    def get_avg_batch_size(self) -> float:
+        """Get average number of frames per forward pass"""
+        with self.lock:
+            if not self.batch_sizes:
+                return 0.0
+            return sum(self.batch_sizes) / len(self.batch_sizes)
+
+    def _target_batch_size(self) -> int:
+        """Largest batch worth waiting for: one frame per active camera, capped by config"""
+        with self.lock:
+            active = max(1, len(self.sources))
+        return min(self.max_batch_size, active)
+
+    def _worker_loop(self):
+        """Collect requests into batches and run them through the model"""
+        while not self.stop_flag.is_set():
+            try:
+                first = self.requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            target = self._target_batch_size()
+            deadline = time.monotonic() + self.max_wait
+
+            # Wait up to max_wait for other cameras to contribute frames
+            while len(batch) < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[tuple]):
+        """Run one batch and fan detections back to the waiting cameras"""
+        # Skip requests whose caller timed out (their frame buffer may already be reused)
+        batch = [request for request in batch if request[3].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        frames = [frame for _, frame, _, _ in batch]
+        rois = [roi for _, _, roi, _ in batch]
+
+        try:
+            results = self.inference_engine.detect_objects_batch(frames, rois)
+        except Exception as e:
+            logger.error(f"Error running inference batch: {e}")
+            for _, _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self.lock:
+            self.batch_sizes.append(len(batch))
+            if len(self.batch_sizes) > 100:
+                self.batch_sizes = self.batch_sizes[-100:]
+
+        for (_, _, _, future), detections in zip(batch, results):
+            future.set_result(detections)
+
+
+# Global batch scheduler instance
+_batch_scheduler = None
+
+
+def get_batch_scheduler() -> BatchScheduler:
+    """Get global batch scheduler instance"""
+    global _batch_scheduler
+    if _batch_scheduler is None:
+        _batch_scheduler = BatchScheduler()
+    return _batch_scheduler
@@ -2,10 +2,12 @@
 Camera management service
 """
 import logging
+import threading
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set
 import json
 from backend.database.db import get_db
+from backend.config.config import get_config
 
 logger = logging.getLogger(__name__)
 
@@ -13,18 +15,34 @@ logger = logging.getLogger(__name__)
 class CameraManager:
     def __init__(self):
         self.db = get_db()
+        self.config = get_config()
+        
+        # Live status/fps per camera, written by capture threads without touching the DB
+        self.live_state: Dict[int, Dict] = {}  # {camera_id: {status, fps, last_frame_time}}
+        self.dirty: Set[int] = set()
+        
+        # Background writer that persists live state to the cameras table
+        self.flush_interval = self.config.system.status_flush_interval_seconds
+        self.stop_flag = threading.Event()
+        self.writer_thread = threading.Thread(target=self._status_writer_loop, daemon=True)
+        self.writer_thread.start()
 
-    def create_camera(self, name: str, rtsp_url: str, location_tag: Optional[str] = None) -> Dict:
+    def create_camera(
+        self,
+        name: str,
+        rtsp_url: str,
+        location_tag: Optional[str] = None,
+        fps_target: Optional[float] = None
+    ) -> Dict:
         """Create a new camera"""
         try:
-            cursor = self.db.execute(
+            camera_id = self.db.insert(
                 """
-                INSERT INTO cameras (name, location_tag, rtsp_url, status, created_at, updated_at)
-                VALUES (?, ?, ?, 'offline', ?, ?)
+                INSERT INTO cameras (name, location_tag, rtsp_url, status, fps_target, created_at, updated_at)
+                VALUES (?, ?, ?, 'offline', ?, ?, ?)
                 """,
-                (name, location_tag, rtsp_url, datetime.now(), datetime.now())
+                (name, location_tag, rtsp_url, fps_target, datetime.now(), datetime.now())
             )
-            camera_id = cursor.lastrowid
             logger.info(f"Created camera: {name} (ID: {camera_id})")
             return self.get_camera(camera_id)
         except Exception as e:
@@ -35,18 +53,22 @@ class CameraManager:
         """Get camera by ID"""
         row = self.db.fetchone("SELECT * FROM cameras WHERE id = ?", (camera_id,))
         if row:
-            return dict(row)
+            return self._apply_live_state(dict(row))
         return None
 
     def get_all_cameras(self) -> List[Dict]:
         """Get all cameras"""
         rows = self.db.fetchall("SELECT * FROM cameras ORDER BY created_at DESC")
-        return [dict(row) for row in rows]
+        return [self._apply_live_state(dict(row)) for row in rows]
 
     def update_camera(self, camera_id: int, **kwargs) -> Optional[Dict]:
-        """Update camera fields"""
-        allowed_fields = ['name', 'location_tag', 'rtsp_url', 'status', 'fps', 'last_frame_time']
-        updates = {k: v for k, v in kwargs.items() if k in allowed_fields and v is not None}
+        """Update camera fields (None is ignored, except for fps_target where it clears the override)"""
+        allowed_fields = ['name', 'location_tag', 'rtsp_url', 'status', 'fps', 'last_frame_time', 'fps_target']
+        nullable_fields = ['fps_target']
+        updates = {
+            k: v for k, v in kwargs.items()
+            if k in allowed_fields and (v is not None or k in nullable_fields)
+        }
         
         if not updates:
             return self.get_camera(camera_id)
@@ -67,17 +89,75 @@ class CameraManager:
     def delete_camera(self, camera_id: int) -> bool:
         """Delete camera"""
         self.db.execute("DELETE FROM cameras WHERE id = ?", (camera_id,))
+        self.live_state.pop(camera_id, None)
+        self.dirty.discard(camera_id)
         logger.info(f"Deleted camera {camera_id}")
         return True
 
     def update_status(self, camera_id: int, status: str, fps: float = 0.0):
-        """Update camera status and FPS"""
-        self.update_camera(
-            camera_id,
-            status=status,
-            fps=fps,
-            last_frame_time=datetime.now() if status == 'online' else None
-        )
+        """Update camera status and FPS (in memory; persisted by the background writer)"""
+        previous = self.live_state.get(camera_id)
+        last_frame_time = datetime.now() if status == 'online' else None
+        if last_frame_time is None and previous:
+            last_frame_time = previous['last_frame_time']
+        
+        # Replace the whole entry so readers never see a half-updated state
+        self.live_state[camera_id] = {
+            'status': status,
+            'fps': fps,
+            'last_frame_time': last_frame_time
+        }
+        
+        if previous is None or previous['status'] != status:
+            # Status transitions are written through immediately
+            self._flush_camera(camera_id)
+        else:
+            self.dirty.add(camera_id)
+
+    def flush_status(self):
+        """Persist all pending live state updates"""
+        for camera_id in list(self.dirty):
+            self._flush_camera(camera_id)
+
+    def stop_status_writer(self):
+        """Stop the background writer after a final flush"""
+        self.stop_flag.set()
+        self.writer_thread.join(timeout=5)
+        self.flush_status()
+
+    def _flush_camera(self, camera_id: int):
+        """Write one camera's live state to the database"""
+        self.dirty.discard(camera_id)
+        state = self.live_state.get(camera_id)
+        if state is None:
+            return
+        
+        try:
+            self.db.execute(
+                """
+                UPDATE cameras
+                SET status = ?, fps = ?, last_frame_time = COALESCE(?, last_frame_time), updated_at = ?
+                WHERE id = ?
+                """,
+                (state['status'], state['fps'], state['last_frame_time'], datetime.now(), camera_id)
+            )
+        except Exception as e:
+            logger.error(f"Error persisting status for camera {camera_id}: {e}")
+
+    def _status_writer_loop(self):
+        """Periodically flush live state to the cameras table"""
+        while not self.stop_flag.wait(self.flush_interval):
+            self.flush_status()
+
+    def _apply_live_state(self, camera: Dict) -> Dict:
+        """Overlay in-memory live state on a camera row"""
+        state = self.live_state.get(camera['id'])
+        if state:
+            camera['status'] = state['status']
+            camera['fps'] = state['fps']
+            if state['last_frame_time'] is not None:
+                camera['last_frame_time'] = state['last_frame_time']
+        return camera
 
     def get_camera_by_url(self, rtsp_url: str) -> Optional[Dict]:
         """Get camera by RTSP URL"""
@@ -0,0 +1,86 @@
+"""
+Free-text event search queries - time phrases become a time range, the rest search terms
+"""
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+# Words that never narrow a search
+STOPWORDS = {
+    'a', 'an', 'the', 'in', 'at', 'on', 'of', 'near', 'by', 'with', 'and', 'or',
+    'from', 'for', 'during', 'around', 'show', 'find', 'me', 'any', 'all', 'event', 'events', 'priority'
+}
+
+# Search terms beyond this are ignored
+MAX_TERMS = 8
+
+UNITS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1)
+}
+
+# "last N <unit>s" never looks back further than this
+MAX_LOOKBACK = timedelta(days=3650)
+
+_RELATIVE = re.compile(r"\b(?:last|past)\s+(\d+\s+)?(minute|hour|day|week)s?\b")
+
+
+def _day_range(now: datetime, days_ago: int, start_hour: int, end_hour: int) -> Tuple[datetime, datetime]:
+    """Hours of a day relative to today (end_hour may run into the next day)"""
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days_ago)
+    return day + timedelta(hours=start_hour), day + timedelta(hours=end_hour)
+
+
+# Named periods, checked in order (longer phrases first)
+PERIODS = [
+    ('last night', lambda now: _day_range(now, 1, 18, 30)),
+    ('yesterday morning', lambda now: _day_range(now, 1, 6, 12)),
+    ('yesterday afternoon', lambda now: _day_range(now, 1, 12, 18)),
+    ('yesterday evening', lambda now: _day_range(now, 1, 18, 24)),
+    ('yesterday', lambda now: _day_range(now, 1, 0, 24)),
+    ('this morning', lambda now: _day_range(now, 0, 6, 12)),
+    ('this afternoon', lambda now: _day_range(now, 0, 12, 18)),
+    ('this evening', lambda now: _day_range(now, 0, 18, 24)),
+    ('tonight', lambda now: _day_range(now, 0, 18, 30)),
+    ('today', lambda now: _day_range(now, 0, 0, 24))
+]
+
+
+def parse_search_query(
+    text: str,
+    now: datetime = None
+) -> Tuple[List[str], Optional[datetime], Optional[datetime]]:
+    """
+    Split a query like "car loading dock last night" into search terms and a time range
+
+    Returns:
+        (terms, from_time, to_time) - the times are None when no period is named
+    """
+    now = now or datetime.now()
+    text = text.lower()
+    ranges = []
+
+    for phrase, period in PERIODS:
+        pattern = rf"\b{phrase}\b"
+        if re.search(pattern, text):
+            ranges.append(period(now))
+            text = re.sub(pattern, " ", text)
+
+    for match in _RELATIVE.finditer(text):
+        unit = UNITS[match.group(2)]
+        count = min(int(match.group(1) or 1), MAX_LOOKBACK // unit)
+        ranges.append((now - count * unit, now))
+    text = _RELATIVE.sub(" ", text)
+
+    # Several periods narrow each other
+    from_time = max((start for start, _ in ranges), default=None)
+    to_time = min((end for _, end in ranges), default=None)
+
+    terms = []
+    for word in re.findall(r"[^\W_]+", text):
+        if word not in STOPWORDS and word not in terms:
+            terms.append(word)
+
+    return terms[:MAX_TERMS], from_time, to_time
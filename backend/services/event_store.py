@@ -3,16 +3,58 @@ Event storage and retrieval service
 """
 import logging
 import json
+import base64
+from collections import Counter, defaultdict
+from concurrent.futures import Future
 from typing import List, Optional, Dict
 from datetime import datetime, timedelta
 from backend.database.db import get_db
+from backend.database.partitions import (
+    EventPartitions, BBOX_COLUMNS, METADATA_COLUMNS, EVENT_COLUMNS
+)
+from backend.services.event_writer import EventWriter
+from backend.services.event_search import parse_search_query
+from backend.config.config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Rollup bucket formats (bucket start as stored in event_rollups.bucket)
+ROLLUP_FORMATS = {
+    'minute': '%Y-%m-%d %H:%M:00',
+    'hour': '%Y-%m-%d %H:00:00'
+}
+ROLLUP_STEPS = {
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1)
+}
+# Longest timeseries window per granularity (every bucket in it is returned)
+ROLLUP_MAX_HOURS = {
+    'minute': 48,
+    'hour': 24 * 90
+}
+
 
 class EventStore:
     def __init__(self):
         self.db = get_db()
+        self.config = get_config()
+        
+        # Per-day event tables (migrates the old single events table on first start)
+        self.partitions = EventPartitions(self.db, self.config.events.partition_days)
+        
+        # Background writer used by the processing threads (submit_event)
+        self.writer = EventWriter(
+            self._write_events,
+            batch_size=self.config.events.write_batch_size,
+            flush_interval_ms=self.config.events.write_flush_interval_ms,
+            max_queue_size=self.config.events.write_queue_size
+        )
+        self.writer.start()
+        
+        # Backfill rollups for databases created before they existed
+        has_rollups = self.db.fetchone("SELECT 1 FROM event_rollups LIMIT 1")
+        if self.partitions.has_events() and not has_rollups:
+            self.rebuild_rollups()
 
     def create_event(
         self,
@@ -24,46 +66,125 @@ class EventStore:
         bbox: List[int] = None,
         snapshot_path: str = None,
         priority: str = "medium",
-        metadata: dict = None
+        metadata: dict = None,
+        zone_id: int = None,
+        track_id: str = None
     ) -> Dict:
-        """Create a new event"""
+        """Create a new event (synchronously)"""
         try:
-            if timestamp is None:
-                timestamp = datetime.now()
-            
-            bbox_json = json.dumps(bbox) if bbox else None
-            metadata_json = json.dumps(metadata) if metadata else None
-            
-            cursor = self.db.execute(
-                """
-                INSERT INTO events (
-                    camera_id, timestamp, rule_type, object_type, confidence,
-                    bbox, snapshot_path, priority, status, metadata, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'new', ?, ?)
-                """,
-                (
-                    camera_id, timestamp, rule_type, object_type, confidence,
-                    bbox_json, snapshot_path, priority, metadata_json, datetime.now()
-                )
+            record = self._build_record(
+                camera_id, rule_type, timestamp, object_type, confidence,
+                bbox, snapshot_path, priority, metadata, zone_id, track_id
             )
-            event_id = cursor.lastrowid
-            logger.info(f"Created event: {rule_type} for camera {camera_id} (ID: {event_id})")
-            return self.get_event(event_id)
+            return self._write_events([record])[0]
         except Exception as e:
             logger.error(f"Error creating event: {e}")
             raise
 
+    def submit_event(
+        self,
+        camera_id: int,
+        rule_type: str,
+        timestamp: datetime = None,
+        object_type: str = None,
+        confidence: float = None,
+        bbox: List[int] = None,
+        snapshot_path: str = None,
+        priority: str = "medium",
+        metadata: dict = None,
+        zone_id: int = None,
+        track_id: str = None
+    ) -> Future:
+        """Queue a new event for the background writer, returns a future resolving to the event"""
+        record = self._build_record(
+            camera_id, rule_type, timestamp, object_type, confidence,
+            bbox, snapshot_path, priority, metadata, zone_id, track_id
+        )
+        return self.writer.submit(record)
+
+    def stop_writer(self):
+        """Flush queued events and stop the background writer"""
+        self.writer.stop()
+
+    def _build_record(
+        self,
+        camera_id: int,
+        rule_type: str,
+        timestamp: datetime,
+        object_type: str,
+        confidence: float,
+        bbox: List[int],
+        snapshot_path: str,
+        priority: str,
+        metadata: dict,
+        zone_id: int = None,
+        track_id: str = None
+    ) -> Dict:
+        """Build an event row (without id) ready to be inserted"""
+        if zone_id is None and metadata:
+            zone_id = metadata.get('zone_id')
+        return {
+            'camera_id': camera_id,
+            'timestamp': timestamp if timestamp is not None else datetime.now(),
+            'rule_type': rule_type,
+            'object_type': object_type,
+            'confidence': confidence,
+            'bbox': bbox,
+            'zone_id': zone_id,
+            'track_id': track_id,
+            'snapshot_path': snapshot_path,
+            'priority': priority,
+            'status': 'new',
+            'metadata': metadata,
+            'created_at': datetime.now()
+        }
+
+    def _write_events(self, records: List[Dict]) -> List[Dict]:
+        """Insert records in a single transaction, returns the stored events"""
+        events = []
+        try:
+            with self.db.transaction() as cursor:
+                first_id = self.partitions.allocate_ids(cursor, len(records))
+                rows = defaultdict(list)
+                
+                for event_id, record in enumerate(records, start=first_id):
+                    partition = self.partitions.ensure(cursor, record['timestamp'])
+                    rows[partition].append(self._row_values(event_id, record))
+                    events.append({'id': event_id, **record})
+                
+                # One bulk insert per partition (COPY on PostgreSQL)
+                for partition, partition_rows in rows.items():
+                    self.db.insert_rows(cursor, partition, EVENT_COLUMNS, partition_rows)
+                    ids = [row[0] for row in partition_rows]
+                    self.partitions.record_rows(cursor, partition, min(ids), max(ids), len(ids))
+                    # This batch owns its id range, so the range selects exactly its rows
+                    self.partitions.index_search(cursor, partition, "e.id BETWEEN ? AND ?", (min(ids), max(ids)))
+                
+                # Maintain rollups in the same transaction
+                cursor.executemany(
+                    """
+                    INSERT INTO event_rollups (granularity, bucket, camera_id, zone_id, rule_type, priority, count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (granularity, bucket, camera_id, zone_id, rule_type, priority)
+                    DO UPDATE SET count = event_rollups.count + excluded.count
+                    """,
+                    [key + (count,) for key, count in self._rollup_increments(records).items()]
+                )
+        except Exception:
+            # Partitions created by a rolled back transaction no longer exist
+            self.partitions.reload()
+            raise
+        
+        for event in events:
+            logger.info(f"Created event: {event['rule_type']} for camera {event['camera_id']} (ID: {event['id']})")
+        return events
+
     def get_event(self, event_id: int) -> Optional[Dict]:
         """Get event by ID"""
-        row = self.db.fetchone("SELECT * FROM events WHERE id = ?", (event_id,))
-        if row:
-            event = dict(row)
-            if event['bbox']:
-                event['bbox'] = json.loads(event['bbox'])
-            if event['metadata']:
-                event['metadata'] = json.loads(event['metadata'])
-            return event
+        for partition in self.partitions.for_id(event_id):
+            rows = self._fetch_partition(partition, f"SELECT * FROM {partition} WHERE id = ?", (event_id,))
+            if rows:
+                return self._parse_row(rows[0])
         return None
 
     def query_events(
@@ -74,102 +195,370 @@ class EventStore:
         rule_type: str = None,
         priority: str = None,
         status: str = None,
+        zone_id: int = None,
         limit: int = 100,
-        offset: int = 0
-    ) -> tuple[List[Dict], int]:
-        """Query events with filters"""
-        query = "SELECT * FROM events WHERE 1=1"
-        count_query = "SELECT COUNT(*) as count FROM events WHERE 1=1"
+        offset: int = 0,
+        cursor: str = None,
+        include_total: bool = True
+    ) -> tuple[List[Dict], Optional[int], Optional[str]]:
+        """
+        Query events with filters, newest first
+        
+        Pass the returned next_cursor back as `cursor` to fetch the following
+        page; cursor pages cost the same no matter how deep they are.
+        
+        Returns:
+            (events, total, next_cursor) - total is None unless include_total
+        """
+        where, params = self._build_filters(
+            camera_id, from_time, to_time, rule_type, priority, status, zone_id
+        )
+        
+        # Get total count (optional, it scans every matching row)
+        total = None
+        if include_total:
+            total = 0
+            for partition in self.partitions.in_range(from_time, to_time):
+                rows = self._fetch_partition(
+                    partition, f"SELECT COUNT(*) as count FROM {partition} WHERE {where}", tuple(params)
+                )
+                total += rows[0]['count'] if rows else 0
+        
+        # Resume after the last row of the previous page
+        upper_time = to_time
+        if cursor:
+            cursor_timestamp, cursor_id = self._decode_cursor(cursor)
+            where += " AND (timestamp, id) < (?, ?)"
+            params.extend([cursor_timestamp, cursor_id])
+            cursor_time = datetime.fromisoformat(cursor_timestamp)
+            if to_time is None or cursor_time.date() < to_time.date():
+                upper_time = cursor_time
+        
+        # Partitions don't overlap in time, so newest-first pages concatenate in order
+        needed = offset + limit
+        rows = []
+        for partition in self.partitions.in_range(from_time, upper_time):
+            if len(rows) >= needed:
+                break
+            rows.extend(self._fetch_partition(
+                partition,
+                f"SELECT * FROM {partition} WHERE {where} ORDER BY timestamp DESC, id DESC LIMIT ?",
+                tuple(params) + (needed - len(rows),)
+            ))
+        
+        events = [self._parse_row(row) for row in rows[offset:]]
+        
+        next_cursor = None
+        if len(events) == limit:
+            next_cursor = self._encode_cursor(events[-1]['timestamp'], events[-1]['id'])
+        
+        return events, total, next_cursor
+
+    def search_events(
+        self,
+        query: str,
+        camera_id: int = None,
+        rule_type: str = None,
+        priority: str = None,
+        status: str = None,
+        limit: int = 50
+    ) -> Dict:
+        """
+        Full-text search over camera name, location, zone, object type and metadata
+        
+        Time phrases in the query ("last night", "past 3 hours") limit the
+        searched partitions; events are ranked by relevance, then newest first.
+        
+        Returns:
+            {'events', 'terms', 'from_time', 'to_time'}
+        """
+        terms, from_time, to_time = parse_search_query(query)
+        
+        if not terms:
+            # Only a time range (or nothing at all): newest events in it
+            events, _, _ = self.query_events(
+                camera_id=camera_id, from_time=from_time, to_time=to_time, rule_type=rule_type,
+                priority=priority, status=status, limit=limit, include_total=False
+            )
+        else:
+            where, params = self._build_filters(camera_id, from_time, to_time, rule_type, priority, status)
+            match = self.db.search_match(terms)
+            
+            # Each partition returns its best `limit` matches; merge them by score
+            rows = []
+            for partition in self.partitions.in_range(from_time, to_time):
+                rows.extend(self._fetch_partition(
+                    partition,
+                    self.db.search_query(partition, where),
+                    (match, *params, limit)
+                ))
+            rows.sort(key=lambda row: (row['score'], -row['id']))
+            events = [self._parse_row(row) for row in rows[:limit]]
+        
+        return {
+            'events': events,
+            'terms': terms,
+            'from_time': from_time,
+            'to_time': to_time
+        }
+
+    def _build_filters(
+        self,
+        camera_id: int = None,
+        from_time: datetime = None,
+        to_time: datetime = None,
+        rule_type: str = None,
+        priority: str = None,
+        status: str = None,
+        zone_id: int = None
+    ) -> tuple[str, List]:
+        """Build the WHERE clause and params shared by event page and count queries"""
+        conditions = []
         params = []
         
         if camera_id is not None:
-            query += " AND camera_id = ?"
-            count_query += " AND camera_id = ?"
+            conditions.append("camera_id = ?")
             params.append(camera_id)
         
+        if zone_id is not None:
+            conditions.append("zone_id = ?")
+            params.append(zone_id)
+        
         if from_time:
-            query += " AND timestamp >= ?"
-            count_query += " AND timestamp >= ?"
+            conditions.append("timestamp >= ?")
             params.append(from_time)
         
         if to_time:
-            query += " AND timestamp <= ?"
-            count_query += " AND timestamp <= ?"
+            conditions.append("timestamp <= ?")
             params.append(to_time)
         
         if rule_type:
-            query += " AND rule_type = ?"
-            count_query += " AND rule_type = ?"
+            conditions.append("rule_type = ?")
             params.append(rule_type)
         
         if priority:
-            query += " AND priority = ?"
-            count_query += " AND priority = ?"
+            conditions.append("priority = ?")
             params.append(priority)
         
-        if status:
-            query += " AND status = ?"
-            count_query += " AND status = ?"
+        if status == 'new':
+            # Literal so the planner can match the partial idx_events_new_time index
+            conditions.append("status = 'new'")
+        elif status:
+            conditions.append("status = ?")
             params.append(status)
         
-        # Get total count
-        count_row = self.db.fetchone(count_query, tuple(params))
-        total = count_row['count'] if count_row else 0
+        return " AND ".join(["1=1"] + conditions), params
+
+    def explain_query_events(self, cursor: bool = False, **filters) -> Dict[str, List[str]]:
+        """Get the query plans used by query_events for these filters (on the newest matching partition)"""
+        partitions = self.partitions.in_range(filters.get('from_time'), filters.get('to_time'))
+        if not partitions:
+            return {'page': [], 'count': []}
+        partition = partitions[0]
         
-        # Get paginated results
-        query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        where, params = self._build_filters(**filters)
+        count_query = f"SELECT COUNT(*) as count FROM {partition} WHERE {where}"
+        count_params = list(params)
         
-        rows = self.db.fetchall(query, tuple(params))
-        events = []
-        for row in rows:
-            event = dict(row)
-            if event['bbox']:
-                event['bbox'] = json.loads(event['bbox'])
-            if event['metadata']:
-                event['metadata'] = json.loads(event['metadata'])
-            events.append(event)
+        if cursor:
+            where += " AND (timestamp, id) < (?, ?)"
+            params.extend([datetime.now(), 2 ** 62])
+        page_query = f"SELECT * FROM {partition} WHERE {where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(100)
+        
+        return {
+            'page': self.db.explain(page_query, tuple(params)),
+            'count': self.db.explain(count_query, tuple(count_params))
+        }
+
+    def _fetch_partition(self, partition: str, query: str, params: tuple = ()) -> list:
+        """Run a query on one partition; a partition dropped by retention meanwhile reads as empty"""
+        try:
+            return self.db.fetchall(query, params)
+        except Exception as e:
+            if self.db.is_missing_table(e):
+                return []
+            raise
+
+    def _row_values(self, event_id: int, record: Dict) -> tuple:
+        """Flatten a record into EVENT_COLUMNS order (bbox and common metadata as typed columns)"""
+        bbox = record['bbox'] or [None] * len(BBOX_COLUMNS)
+        metadata = dict(record['metadata'] or {})
+        metadata.pop('zone_id', None)  # stored in the zone_id column
+        promoted = [metadata.pop(column, None) for column in METADATA_COLUMNS]
+        extra = json.dumps(metadata, separators=(',', ':')) if metadata else None
+        
+        return (
+            event_id, record['camera_id'], record['timestamp'], record['rule_type'],
+            record['object_type'], record['confidence'],
+            *(int(value) if value is not None else None for value in bbox),
+            record['zone_id'], record['track_id'], record['snapshot_path'], record['priority'], record['status'],
+            *promoted, extra, record['created_at']
+        )
+
+    def _parse_row(self, row) -> Dict:
+        """Convert an events row to the API shape, rebuilding bbox and metadata"""
+        event = dict(row)
+        
+        bbox = [event.pop(column) for column in BBOX_COLUMNS]
+        event['bbox'] = bbox if bbox[0] is not None else None
         
-        return events, total
+        metadata = {}
+        if event['zone_id'] is not None:
+            metadata['zone_id'] = event['zone_id']
+        for column in METADATA_COLUMNS:
+            value = event.pop(column)
+            if value is not None:
+                metadata[column] = value
+        extra = event.pop('extra')
+        if extra:
+            metadata.update(json.loads(extra))
+        event['metadata'] = metadata or None
+        return event
+
+    def _encode_cursor(self, timestamp, event_id: int) -> str:
+        """Encode a (timestamp, id) position as an opaque cursor"""
+        payload = json.dumps([str(timestamp), event_id])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> tuple:
+        """Decode a cursor into (timestamp, id), raising ValueError if malformed"""
+        try:
+            timestamp, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return str(timestamp), int(event_id)
+        except Exception:
+            raise ValueError("Invalid cursor")
+
+    def _rollup_increments(self, records: List[Dict]) -> Counter:
+        """Count records per (granularity, bucket, camera, zone, rule, priority)"""
+        increments = Counter()
+        for record in records:
+            for granularity, fmt in ROLLUP_FORMATS.items():
+                bucket = record['timestamp'].strftime(fmt)
+                increments[(
+                    granularity, bucket, record['camera_id'], record['zone_id'] or 0,
+                    record['rule_type'], record['priority']
+                )] += 1
+        return increments
+
+    def rebuild_rollups(self):
+        """Recompute all rollups from the event partitions"""
+        with self.db.transaction() as cursor:
+            cursor.execute("DELETE FROM event_rollups")
+            for partition in self.partitions.in_range():
+                for granularity, fmt in ROLLUP_FORMATS.items():
+                    cursor.execute(
+                        f"""
+                        INSERT INTO event_rollups (granularity, bucket, camera_id, zone_id, rule_type, priority, count)
+                        SELECT ?, {self.db.bucket_expression('timestamp', fmt)}, camera_id, COALESCE(zone_id, 0), rule_type, priority, COUNT(*)
+                        FROM {partition}
+                        WHERE 1=1
+                        GROUP BY 2, 3, 4, 5, 6
+                        ON CONFLICT (granularity, bucket, camera_id, zone_id, rule_type, priority)
+                        DO UPDATE SET count = event_rollups.count + excluded.count
+                        """,
+                        (granularity,)
+                    )
+        logger.info("Rebuilt event rollups")
 
     def update_event_status(self, event_id: int, status: str) -> Optional[Dict]:
         """Update event status"""
-        self.db.execute(
-            "UPDATE events SET status = ? WHERE id = ?",
-            (status, event_id)
-        )
+        for partition in self.partitions.for_id(event_id):
+            cursor = self.db.execute(
+                f"UPDATE {partition} SET status = ? WHERE id = ?",
+                (status, event_id)
+            )
+            if cursor.rowcount:
+                break
         logger.info(f"Updated event {event_id} status to {status}")
         return self.get_event(event_id)
 
+    def update_snapshot_path(self, event_id: int, snapshot_path: Optional[str]):
+        """Set (or clear) the snapshot path of an event once its snapshot write finished"""
+        for partition in self.partitions.for_id(event_id):
+            cursor = self.db.execute(
+                f"UPDATE {partition} SET snapshot_path = ? WHERE id = ?",
+                (snapshot_path, event_id)
+            )
+            if cursor.rowcount:
+                break
+
+    def clear_snapshot_paths(self, day, path_prefix: str) -> int:
+        """Clear snapshot_path of events on the given day whose snapshot was under path_prefix (deleted files)"""
+        cleared = 0
+        for partition in self.partitions.in_range(day, day):
+            cursor = self.db.execute(
+                f"UPDATE {partition} SET snapshot_path = NULL WHERE substr(snapshot_path, 1, ?) = ?",
+                (len(path_prefix), path_prefix)
+            )
+            cleared += cursor.rowcount
+        return cleared
+
+    def existing_event_ids(self, event_ids: List[int], day) -> set:
+        """Which of these ids (of events on the given day) still have an event row"""
+        existing = set()
+        for partition in self.partitions.in_range(day, day):
+            for start in range(0, len(event_ids), 500):
+                chunk = event_ids[start:start + 500]
+                rows = self._fetch_partition(
+                    partition,
+                    f"SELECT id FROM {partition} WHERE id IN ({', '.join('?' * len(chunk))})",
+                    tuple(chunk)
+                )
+                existing.update(row['id'] for row in rows)
+        return existing
+
     def delete_old_events(self, retention_days: int = 30) -> int:
-        """Delete events older than retention period"""
-        cutoff_date = datetime.now() - timedelta(days=retention_days)
-        cursor = self.db.execute(
-            "DELETE FROM events WHERE created_at < ?",
-            (cutoff_date,)
+        """
+        Drop events older than the retention period
+        
+        Whole partitions are dropped, so events are kept until every event in
+        their partition has expired (at most events.partition_days extra).
+        """
+        cutoff_day = (datetime.now() - timedelta(days=retention_days)).date()
+        deleted_count = self.partitions.drop_before(cutoff_day)
+        self.db.execute(
+            "DELETE FROM event_rollups WHERE bucket < ?",
+            (cutoff_day.strftime(ROLLUP_FORMATS['hour']),)
         )
-        deleted_count = cursor.rowcount
         logger.info(f"Deleted {deleted_count} events older than {retention_days} days")
         return deleted_count
 
-    def get_event_stats(self, camera_id: int = None, hours: int = 24) -> Dict:
-        """Get event statistics"""
+    def get_event_stats(self, camera_id: int = None, hours: int = 24, zone_id: int = None) -> Dict:
+        """Get event statistics (from rollups, to minute precision)"""
         from_time = datetime.now() - timedelta(hours=hours)
         
+        # Minute buckets up to the first whole hour, hour buckets after that
+        minute_start = from_time.replace(second=0, microsecond=0)
+        hour_start = from_time.replace(minute=0, second=0, microsecond=0)
+        if hour_start < minute_start:
+            hour_start += timedelta(hours=1)
+        
         query = """
             SELECT 
                 rule_type,
                 priority,
-                COUNT(*) as count
-            FROM events
-            WHERE timestamp >= ?
+                SUM(count) as count
+            FROM event_rollups
+            WHERE (
+                (granularity = 'minute' AND bucket >= ? AND bucket < ?)
+                OR (granularity = 'hour' AND bucket >= ?)
+            )
         """
-        params = [from_time]
+        params = [
+            minute_start.strftime(ROLLUP_FORMATS['minute']),
+            hour_start.strftime(ROLLUP_FORMATS['hour']),
+            hour_start.strftime(ROLLUP_FORMATS['hour'])
+        ]
         
         if camera_id:
             query += " AND camera_id = ?"
             params.append(camera_id)
         
+        if zone_id is not None:
+            query += " AND zone_id = ?"
+            params.append(zone_id)
+        
         query += " GROUP BY rule_type, priority"
         
         rows = self.db.fetchall(query, tuple(params))
@@ -196,6 +585,60 @@ class EventStore:
         
         return stats
 
+    def get_event_timeseries(
+        self,
+        camera_id: int = None,
+        rule_type: str = None,
+        hours: int = 24,
+        granularity: str = 'hour'
+    ) -> List[Dict]:
+        """Get event counts per time bucket (oldest first, empty buckets included)"""
+        if granularity not in ROLLUP_FORMATS:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        if hours > ROLLUP_MAX_HOURS[granularity]:
+            raise ValueError(
+                f"hours must be at most {ROLLUP_MAX_HOURS[granularity]} for {granularity} buckets"
+            )
+        
+        fmt = ROLLUP_FORMATS[granularity]
+        step = ROLLUP_STEPS[granularity]
+        first_bucket = datetime.strptime((datetime.now() - timedelta(hours=hours)).strftime(fmt), '%Y-%m-%d %H:%M:%S')
+        
+        query = """
+            SELECT bucket, rule_type, SUM(count) as count
+            FROM event_rollups
+            WHERE granularity = ? AND bucket >= ?
+        """
+        params = [granularity, first_bucket.strftime(fmt)]
+        
+        if camera_id:
+            query += " AND camera_id = ?"
+            params.append(camera_id)
+        
+        if rule_type:
+            query += " AND rule_type = ?"
+            params.append(rule_type)
+        
+        query += " GROUP BY bucket, rule_type"
+        
+        rows = self.db.fetchall(query, tuple(params))
+        
+        # One entry per bucket up to now
+        series = {}
+        bucket = first_bucket
+        now = datetime.now()
+        while bucket <= now:
+            key = bucket.strftime(fmt)
+            series[key] = {'bucket': key, 'count': 0, 'by_rule': {}}
+            bucket += step
+        
+        for row in rows:
+            entry = series.setdefault(row['bucket'], {'bucket': row['bucket'], 'count': 0, 'by_rule': {}})
+            entry['count'] += row['count']
+            entry['by_rule'][row['rule_type']] = row['count']
+        
+        return [series[key] for key in sorted(series)]
+
 
 # Global event store instance
 _event_store = None
@@ -0,0 +1,121 @@
+"""
+Asynchronous event writer - groups queued events into multi-row transactions
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class EventWriter:
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict]], List[Dict]],
+        batch_size: int = 100,
+        flush_interval_ms: int = 50,
+        max_queue_size: int = 10000
+    ):
+        # write_batch stores records in one transaction and returns the stored events in order
+        self.write_batch = write_batch
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0, flush_interval_ms) / 1000.0
+
+        # Pending writes: (record, future)
+        self.requests: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.stop_flag = threading.Event()
+        self.lock = threading.Lock()
+        self.worker = None
+        self.written_count = 0
+
+    def start(self):
+        """Start the writer thread"""
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive():
+                return
+            self.stop_flag.clear()
+            self.worker = threading.Thread(target=self._writer_loop, daemon=True)
+            self.worker.start()
+        logger.info(
+            f"Event writer started (batch_size={self.batch_size}, "
+            f"flush_interval_ms={int(self.flush_interval * 1000)})"
+        )
+
+    def stop(self):
+        """Stop the writer thread after writing everything already queued"""
+        self.stop_flag.set()
+        if self.worker is not None:
+            self.worker.join(timeout=10)
+        self._drain()
+        logger.info("Event writer stopped")
+
+    def submit(self, record: Dict) -> Future:
+        """Queue a record for writing, returns a future resolving to the stored event"""
+        future = Future()
+        self.requests.put((record, future))
+        return future
+
+    def get_queue_depth(self) -> int:
+        """Get number of events waiting to be written"""
+        return self.requests.qsize()
+
+    def _writer_loop(self):
+        """Collect queued records into batches and write each batch in one transaction"""
+        while not self.stop_flag.is_set():
+            try:
+                first = self.requests.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._write(batch)
+
+    def _drain(self):
+        """Write whatever is left in the queue (used on shutdown)"""
+        batch = []
+        while True:
+            try:
+                batch.append(self.requests.get_nowait())
+            except queue.Empty:
+                break
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch: List[tuple]):
+        """Write a batch, falling back to one transaction per record if the batch fails"""
+        records = [record for record, _ in batch]
+
+        try:
+            events = self.write_batch(records)
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(batch)} events, retrying individually: {e}")
+            for record, future in batch:
+                try:
+                    future.set_result(self.write_batch([record])[0])
+                except Exception as record_error:
+                    logger.error(f"Error writing event: {record_error}")
+                    future.set_exception(record_error)
+            return
+
+        with self.lock:
+            self.written_count += len(events)
+
+        for (_, future), event in zip(batch, events):
+            future.set_result(event)
@@ -0,0 +1,88 @@
+"""
+Preallocated, reference-counted frame buffers shared by capture, inference and snapshot stages
+"""
+import logging
+import threading
+from typing import List, Optional
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class FrameBuffer:
+    """Pooled frame array that returns to its pool once every holder has released it"""
+
+    def __init__(self, pool: "FramePool", array: Optional[np.ndarray] = None):
+        self.pool = pool
+        self.array = array
+        self.refcount = 0
+
+    def retain(self) -> "FrameBuffer":
+        """Take an additional reference (e.g. before handing the frame to another stage)"""
+        with self.pool.lock:
+            self.refcount += 1
+        return self
+
+    def release(self):
+        """Drop a reference, recycling the buffer when no holders remain"""
+        with self.pool.lock:
+            self.refcount -= 1
+            if self.refcount == 0:
+                self.pool._recycle(self)
+
+
+class FramePool:
+    def __init__(self, size: int = 4):
+        self.size = size  # Max number of idle buffers kept for reuse
+        self.shape: Optional[tuple] = None
+        self.free: List[FrameBuffer] = []
+        self.allocated = 0
+        self.lock = threading.Lock()
+
+    def acquire(self, shape: Optional[tuple] = None) -> FrameBuffer:
+        """
+        Get a buffer holding one reference.
+
+        The array is None until the pool knows the frame shape, either from
+        `shape` or from the first frame passed to adopt().
+        """
+        with self.lock:
+            if shape is not None and shape != self.shape:
+                self._reset(shape)
+
+            if self.free:
+                buffer = self.free.pop()
+            else:
+                array = np.empty(self.shape, dtype=np.uint8) if self.shape else None
+                buffer = FrameBuffer(self, array)
+                self.allocated += 1
+
+            buffer.refcount = 1
+            return buffer
+
+    def adopt(self, buffer: FrameBuffer, array: np.ndarray):
+        """Record the array a decoder actually wrote (it reallocates on shape changes)"""
+        if array is buffer.array:
+            return
+        with self.lock:
+            buffer.array = array
+            if array.shape != self.shape:
+                self._reset(array.shape)
+
+    def get_stats(self) -> dict:
+        """Get pool usage statistics"""
+        with self.lock:
+            return {'allocated': self.allocated, 'free': len(self.free)}
+
+    def _reset(self, shape: tuple):
+        """Switch to a new frame shape, discarding idle buffers of the old one (lock held)"""
+        logger.debug(f"Frame pool shape changed: {self.shape} -> {shape}")
+        self.shape = shape
+        self.free.clear()
+
+    def _recycle(self, buffer: FrameBuffer):
+        """Return a buffer to the free list if it still matches the pool (lock held)"""
+        if buffer.array is None or buffer.array.shape != self.shape:
+            return
+        if len(self.free) < self.size:
+            self.free.append(buffer)
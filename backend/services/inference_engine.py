@@ -39,9 +39,9 @@ class InferenceEngine:
             logger.error(f"Error loading YOLO model: {e}")
             self.model_loaded = False
 
-    def detect_objects(self, frame: np.ndarray) -> List[Dict]:
+    def detect_objects(self, frame: np.ndarray, roi: Optional[tuple] = None) -> List[Dict]:
         """
-        Detect objects in frame
+        Detect objects in frame, optionally only inside roi (x1, y1, x2, y2)
         
         Returns:
             List of detections with format:
@@ -52,15 +52,47 @@ class InferenceEngine:
                 'bbox': [x1, y1, x2, y2]
             }
         """
-        if not self.model_loaded or self.model is None:
+        return self.detect_objects_batch([frame], [roi])[0]
+
+    def detect_objects_batch(
+        self,
+        frames: List[np.ndarray],
+        rois: Optional[List[Optional[tuple]]] = None
+    ) -> List[List[Dict]]:
+        """
+        Detect objects in several frames with a single forward pass
+        
+        Each frame may have a region of interest; the frame is cropped to it
+        before inference and boxes are mapped back to full-frame coordinates.
+        
+        Returns:
+            One list of detections per input frame, in the same order
+            (see detect_objects for the detection format)
+        """
+        if not frames:
             return []
 
+        if rois is None:
+            rois = [None] * len(frames)
+
+        if not self.model_loaded or self.model is None:
+            return [[] for _ in frames]
+
         try:
             start_time = time.time()
             
             # Convert BGR to RGB (OpenCV uses BGR, YOLO expects RGB)
             import cv2
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            offsets = []
+            rgb_frames = []
+            for frame, roi in zip(frames, rois):
+                if roi is not None:
+                    x1, y1, x2, y2 = roi
+                    frame = frame[y1:y2, x1:x2]
+                    offsets.append((x1, y1))
+                else:
+                    offsets.append((0, 0))
+                rgb_frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
             
             # Prepare classes filter (None or empty list should be None for YOLO to detect all)
             classes = self.config.inference.classes
@@ -69,44 +101,54 @@ class InferenceEngine:
 
             # Run inference
             results = self.model(
-                rgb_frame,
+                rgb_frames,
                 conf=self.config.inference.confidence_threshold,
                 classes=classes,
                 verbose=False
             )
             
-            # Track inference time
-            inference_time = (time.time() - start_time) * 1000  # ms
+            # Track inference time (per frame, so batched and single calls are comparable)
+            inference_time = (time.time() - start_time) * 1000 / len(frames)  # ms
             with self.lock:
-                self.inference_times.append(inference_time)
+                self.inference_times.extend([inference_time] * len(frames))
                 if len(self.inference_times) > 100:
                     self.inference_times = self.inference_times[-100:]
             
-            # Parse results
-            detections = []
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    # Get box coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    
-                    # Get class and confidence
-                    class_id = int(box.cls[0].cpu().numpy())
-                    confidence = float(box.conf[0].cpu().numpy())
-                    class_name = result.names[class_id]
-                    
-                    detections.append({
-                        'class_id': class_id,
-                        'class_name': class_name,
-                        'confidence': confidence,
-                        'bbox': [int(x1), int(y1), int(x2), int(y2)]
-                    })
-            
-            return detections
+            # Parse results (YOLO returns one result per input image)
+            return [
+                self._parse_result(result, offset)
+                for result, offset in zip(results, offsets)
+            ]
         
         except Exception as e:
             logger.error(f"Error during inference: {e}")
-            return []
+            return [[] for _ in frames]
+
+    def _parse_result(self, result, offset: tuple = (0, 0)) -> List[Dict]:
+        """Convert a single YOLO result into detection dicts (shifted by the crop offset)"""
+        offset_x, offset_y = offset
+        detections = []
+        boxes = result.boxes
+        for box in boxes:
+            # Get box coordinates
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+            
+            # Get class and confidence
+            class_id = int(box.cls[0].cpu().numpy())
+            confidence = float(box.conf[0].cpu().numpy())
+            class_name = result.names[class_id]
+            
+            detections.append({
+                'class_id': class_id,
+                'class_name': class_name,
+                'confidence': confidence,
+                'bbox': [
+                    int(x1) + offset_x, int(y1) + offset_y,
+                    int(x2) + offset_x, int(y2) + offset_y
+                ]
+            })
+        
+        return detections
 
     def get_bbox_center(self, bbox: List[int]) -> tuple:
         """Get center point of bounding box (bottom-center for zone checking)"""
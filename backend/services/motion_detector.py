@@ -0,0 +1,90 @@
+"""
+Cheap motion pre-filter used to skip inference on static scenes
+"""
+import logging
+import math
+import threading
+from typing import Dict, List
+import cv2
+import numpy as np
+from backend.config.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class MotionDetector:
+    def __init__(self):
+        self.config = get_config()
+
+        # Downscaled grayscale frames per camera
+        self.references: Dict[int, np.ndarray] = {}  # last frame that was sent to inference
+        self.latest: Dict[int, np.ndarray] = {}  # last frame checked for motion
+        self.lock = threading.Lock()
+
+    def has_motion(self, camera_id: int, frame: np.ndarray, regions: List[tuple]) -> bool:
+        """
+        Check whether frame differs from the last analyzed frame inside any region
+
+        Regions are (x1, y1, x2, y2) boxes in full-frame coordinates.
+        """
+        motion_config = self.config.motion
+        gray, scale = self._prepare(frame)
+
+        with self.lock:
+            self.latest[camera_id] = gray
+            reference = self.references.get(camera_id)
+
+        if reference is None or reference.shape != gray.shape:
+            return True
+
+        changed = cv2.absdiff(gray, reference) > motion_config.pixel_threshold
+
+        for x1, y1, x2, y2 in regions:
+            region = changed[
+                max(0, int(y1 * scale)):math.ceil(y2 * scale),
+                max(0, int(x1 * scale)):math.ceil(x2 * scale)
+            ]
+            if region.size == 0:
+                continue
+            min_changed = max(1, int(region.size * motion_config.min_changed_ratio))
+            if np.count_nonzero(region) >= min_changed:
+                return True
+
+        return False
+
+    def mark_analyzed(self, camera_id: int):
+        """Use the last checked frame as the reference for future comparisons"""
+        with self.lock:
+            if camera_id in self.latest:
+                self.references[camera_id] = self.latest[camera_id]
+
+    def reset(self, camera_id: int):
+        """Forget reference frames for a camera"""
+        with self.lock:
+            self.references.pop(camera_id, None)
+            self.latest.pop(camera_id, None)
+
+    def _prepare(self, frame: np.ndarray) -> tuple:
+        """Downscale, grayscale and blur a frame; returns (gray, scale)"""
+        height, width = frame.shape[:2]
+        target_width = min(self.config.motion.downscale_width, width)
+        scale = target_width / width
+
+        small = cv2.resize(
+            frame, (target_width, max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA
+        )
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0), scale
+
+
+# Global motion detector instance
+_motion_detector = None
+
+
+def get_motion_detector() -> MotionDetector:
+    """Get global motion detector instance"""
+    global _motion_detector
+    if _motion_detector is None:
+        _motion_detector = MotionDetector()
+    return _motion_detector
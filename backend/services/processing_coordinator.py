@@ -10,6 +10,10 @@ from backend.services.inference_engine import get_inference_engine
 from backend.services.rules_engine import get_rules_engine
 from backend.services.camera_manager import get_camera_manager
 from backend.services.mqtt_publisher import get_mqtt_publisher
+from backend.services.batch_scheduler import get_batch_scheduler
+from backend.services.motion_detector import get_motion_detector
+from backend.services.zone_manager import get_zone_manager
+from backend.config.config import get_config
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,22 @@ class ProcessingCoordinator:
         self.rules_engine = get_rules_engine()
         self.camera_manager = get_camera_manager()
         self.mqtt_publisher = get_mqtt_publisher()
+        self.config = get_config()
+        
+        # Shared batching scheduler (None = each camera calls the model directly)
+        self.batch_scheduler = None
+        if self.config.inference.batching_enabled:
+            self.batch_scheduler = get_batch_scheduler()
+        
+        # Motion pre-filter (None = run inference on every frame)
+        self.zone_manager = get_zone_manager()
+        self.motion_detector = None
+        if self.config.motion.enabled:
+            self.motion_detector = get_motion_detector()
+        
+        # Per-camera frame counters and last inference time (for motion keep-alive)
+        self.frame_stats: Dict[int, Dict[str, int]] = {}
+        self.last_inference: Dict[int, float] = {}
         
         self.processing_threads: Dict[int, threading.Thread] = {}
         self.stop_flags: Dict[int, threading.Event] = {}
@@ -39,9 +59,17 @@ class ProcessingCoordinator:
             return
 
         # Start stream ingestion
-        self.stream_ingestion.start_camera(camera_id, camera['rtsp_url'])
+        self.stream_ingestion.start_camera(camera_id, camera['rtsp_url'], camera.get('fps_target'))
+
+        if self.batch_scheduler:
+            self.batch_scheduler.register_source(camera_id)
+            self.batch_scheduler.start()
 
         # Start processing thread
+        self.frame_stats[camera_id] = {'analyzed': 0, 'skipped': 0}
+        self.last_inference[camera_id] = 0.0
+        if self.motion_detector:
+            self.motion_detector.reset(camera_id)
         self.stop_flags[camera_id] = threading.Event()
         thread = threading.Thread(
             target=self._processing_loop,
@@ -73,21 +101,61 @@ class ProcessingCoordinator:
                 if frame_data is None:
                     continue
                 
-                frame, timestamp = frame_data
+                buffer, timestamp = frame_data
                 
-                # Run inference
-                detections = self.inference_engine.detect_objects(frame)
-                
-                # Process detections through rules engine
-                if detections:
-                    self.rules_engine.process_detections(camera_id, frame, detections)
+                try:
+                    frame = buffer.array
+                    
+                    # Skip inference on static scenes
+                    if self.motion_detector and not self._should_analyze(camera_id, frame):
+                        self.frame_stats[camera_id]['skipped'] += 1
+                        continue
+                    
+                    self.frame_stats[camera_id]['analyzed'] += 1
+                    self.last_inference[camera_id] = time.time()
+                    if self.motion_detector:
+                        self.motion_detector.mark_analyzed(camera_id)
+                    
+                    # Restrict inference to the area covered by zones
+                    roi = None
+                    if self.config.inference.roi_crop:
+                        roi = self.zone_manager.get_camera_roi(
+                            camera_id, frame.shape,
+                            padding=self.config.inference.roi_padding,
+                            top_padding=self.config.inference.roi_top_padding
+                        )
+                    
+                    # Run inference (batched with other cameras when enabled)
+                    if self.batch_scheduler:
+                        detections = self.batch_scheduler.detect(camera_id, frame, roi)
+                    else:
+                        detections = self.inference_engine.detect_objects(frame, roi)
+                    
+                    # Process detections through rules engine (snapshots retain the buffer)
+                    if detections:
+                        self.rules_engine.process_detections(camera_id, buffer, detections)
+                finally:
+                    # Hand the buffer back to the capture pool once every holder is done
+                    buffer.release()
             
             except Exception as e:
                 logger.error(f"Error in processing loop for camera {camera_id}: {e}")
                 time.sleep(1)  # Prevent tight error loop
 
+        if self.batch_scheduler:
+            self.batch_scheduler.unregister_source(camera_id)
         logger.info(f"Processing loop stopped for camera {camera_id}")
 
+    def _should_analyze(self, camera_id: int, frame) -> bool:
+        """Motion gate: analyze on motion inside any zone, or when the keep-alive is due"""
+        zones = self.zone_manager.get_zones_by_camera(camera_id)
+        regions = [self.zone_manager.get_zone_bounds(zone) for zone in zones]
+        
+        # Always run the motion check so its latest frame tracks this one
+        motion = self.motion_detector.has_motion(camera_id, frame, regions)
+        keepalive_due = time.time() - self.last_inference[camera_id] >= self.config.motion.keepalive_seconds
+        return motion or keepalive_due
+
     def start_all_cameras(self):
         """Start processing for all cameras in database"""
         cameras = self.camera_manager.get_all_cameras()
@@ -99,13 +167,20 @@ class ProcessingCoordinator:
         for camera_id in list(self.stop_flags.keys()):
             self.stop_camera_processing(camera_id)
 
+        if self.batch_scheduler:
+            self.batch_scheduler.stop()
+
     def get_processing_status(self) -> Dict:
         """Get status of all processing pipelines"""
         status = {}
         for camera_id in self.processing_threads.keys():
             status[camera_id] = {
                 'thread_alive': self.processing_threads[camera_id].is_alive(),
-                'queue_depth': self.stream_ingestion.get_queue_depth(camera_id)
+                'queue_depth': self.stream_ingestion.get_queue_depth(camera_id),
+                'dropped_frames': self.stream_ingestion.get_dropped_frames(camera_id),
+                'frame_pool': self.stream_ingestion.get_frame_pool_stats(camera_id),
+                'frames_analyzed': self.frame_stats[camera_id]['analyzed'],
+                'frames_skipped': self.frame_stats[camera_id]['skipped']
             }
         return status
 
@@ -0,0 +1,233 @@
+"""
+Retention scheduler - periodically drops events and snapshots older than the retention period
+"""
+import logging
+import os
+import shutil
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, Tuple
+from backend.services.event_store import get_event_store
+from backend.config.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Snapshot files younger than this are never treated as orphans (their event may be in flight)
+ORPHAN_MIN_AGE_SECONDS = 600
+
+
+def _directory_size(path: Path) -> Tuple[int, int]:
+    """Number of files and total bytes under a directory"""
+    files = 0
+    size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.stat(os.path.join(root, name)).st_size
+                files += 1
+            except OSError:
+                pass
+    return files, size
+
+
+class RetentionService:
+    def __init__(self):
+        self.config = get_config()
+        self.event_store = get_event_store()
+        self.snapshot_dir = Path(self.config.system.snapshot_dir)
+
+        self.stop_flag = threading.Event()
+        self.lock = threading.Lock()
+        self.worker = None
+        self.last_run = None
+        self.events_deleted = 0
+        self.snapshots_deleted = 0
+        self.orphans_deleted = 0
+        self.bytes_reclaimed = 0
+
+    def start(self):
+        """Start the retention thread (runs once immediately, then every interval)"""
+        with self.lock:
+            if self.worker is not None and self.worker.is_alive():
+                return
+            self.stop_flag.clear()
+            self.worker = threading.Thread(target=self._retention_loop, daemon=True)
+            self.worker.start()
+        logger.info(
+            f"Retention scheduler started (retention_days={self.config.system.snapshot_retention_days}, "
+            f"interval_minutes={self.config.system.retention_interval_minutes})"
+        )
+
+    def stop(self):
+        """Stop the retention thread"""
+        self.stop_flag.set()
+        if self.worker is not None:
+            self.worker.join(timeout=10)
+        logger.info("Retention scheduler stopped")
+
+    def run_once(self) -> int:
+        """Drop expired events and snapshots now, returns the number of events deleted"""
+        retention_days = self.config.system.snapshot_retention_days
+        deleted = self.event_store.delete_old_events(retention_days)
+
+        cutoff_day = (datetime.now() - timedelta(days=retention_days)).date()
+        expired_files, expired_bytes = self._delete_expired_snapshots(cutoff_day)
+        orphan_files, orphan_bytes = self._delete_orphan_snapshots()
+        pressure_files, pressure_bytes = self._enforce_high_water_mark()
+
+        with self.lock:
+            self.events_deleted += deleted
+            self.snapshots_deleted += expired_files + orphan_files + pressure_files
+            self.orphans_deleted += orphan_files
+            self.bytes_reclaimed += expired_bytes + orphan_bytes + pressure_bytes
+            self.last_run = datetime.now()
+
+        reclaimed = expired_bytes + orphan_bytes + pressure_bytes
+        if reclaimed:
+            logger.info(
+                f"Deleted {expired_files + orphan_files + pressure_files} snapshot file(s) "
+                f"({orphan_files} orphaned), reclaimed {reclaimed / 1024 / 1024:.1f} MB"
+            )
+        return deleted
+
+    def get_stats(self) -> dict:
+        """Get retention statistics"""
+        with self.lock:
+            return {
+                'last_run': self.last_run.isoformat() if self.last_run else None,
+                'events_deleted': self.events_deleted,
+                'snapshots_deleted': self.snapshots_deleted,
+                'orphans_deleted': self.orphans_deleted,
+                'bytes_reclaimed': self.bytes_reclaimed
+            }
+
+    def _day_directories(self) -> List[Tuple[date, Path]]:
+        """Snapshot day directories (snapshot_dir/YYYY/MM/DD), oldest first"""
+        days = []
+        for year in self.snapshot_dir.glob('[0-9][0-9][0-9][0-9]'):
+            for month in year.glob('[0-9][0-9]'):
+                for day in month.glob('[0-9][0-9]'):
+                    try:
+                        days.append((date(int(year.name), int(month.name), int(day.name)), day))
+                    except ValueError:
+                        continue
+        return sorted(days)
+
+    def _delete_day(self, day: date, path: Path) -> Tuple[int, int]:
+        """
+        Delete one day directory (and its month/year if now empty), returns (files, bytes)
+
+        Events of that day that are still stored no longer point at the deleted files.
+        """
+        files, size = _directory_size(path)
+        shutil.rmtree(path, ignore_errors=True)
+        for parent in (path.parent, path.parent.parent):
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+        self.event_store.clear_snapshot_paths(day, os.path.join(str(path), ''))
+        return files, size
+
+    def _delete_expired_snapshots(self, cutoff_day: date) -> Tuple[int, int]:
+        """Delete whole day directories before cutoff_day, plus old files of the flat pre-sharding layout (cam<id>_*.jpg)"""
+        files = 0
+        size = 0
+        for day, path in self._day_directories():
+            if day >= cutoff_day:
+                break
+            day_files, day_size = self._delete_day(day, path)
+            files += day_files
+            size += day_size
+
+        cutoff_time = time.mktime(cutoff_day.timetuple())
+        for path in self.snapshot_dir.glob('cam*_*.jpg'):
+            try:
+                stat = path.stat()
+                if path.is_file() and stat.st_mtime < cutoff_time:
+                    path.unlink()
+                    files += 1
+                    size += stat.st_size
+            except OSError:
+                continue
+        return files, size
+
+    def _delete_orphan_snapshots(self) -> Tuple[int, int]:
+        """Delete snapshot files (and variants) whose event no longer exists"""
+        files = 0
+        size = 0
+        min_mtime = time.time() - ORPHAN_MIN_AGE_SECONDS
+
+        for day, path in self._day_directories():
+            # <event id>.jpg, <event id>_thumb.jpg, ... -> event id
+            snapshots = {}
+            for snapshot in path.glob('cam*/*'):
+                try:
+                    event_id = int(snapshot.stem.split('_')[0])
+                    stat = snapshot.stat()
+                except (ValueError, OSError):
+                    continue
+                if stat.st_mtime < min_mtime:
+                    snapshots.setdefault(event_id, []).append((snapshot, stat.st_size))
+
+            if not snapshots:
+                continue
+
+            existing = self.event_store.existing_event_ids(list(snapshots), day)
+            for event_id, event_files in snapshots.items():
+                if event_id in existing:
+                    continue
+                for snapshot, snapshot_size in event_files:
+                    try:
+                        snapshot.unlink()
+                        files += 1
+                        size += snapshot_size
+                    except OSError:
+                        continue
+        return files, size
+
+    def _enforce_high_water_mark(self) -> Tuple[int, int]:
+        """Delete the oldest snapshot days while disk usage is above the high-water mark (never today)"""
+        limit = self.config.system.snapshot_disk_high_water_percent
+        if not limit:
+            return 0, 0
+
+        files = 0
+        size = 0
+        today = date.today()
+        for day, path in self._day_directories():
+            usage = shutil.disk_usage(self.snapshot_dir)
+            if usage.used * 100 / usage.total < limit or day >= today:
+                break
+            logger.warning(
+                f"Snapshot disk usage {usage.used * 100 / usage.total:.1f}% above {limit}%, "
+                f"deleting snapshots of {day}"
+            )
+            day_files, day_size = self._delete_day(day, path)
+            files += day_files
+            size += day_size
+        return files, size
+
+    def _retention_loop(self):
+        """Run retention on startup and then every retention_interval_minutes"""
+        interval = max(1, self.config.system.retention_interval_minutes) * 60
+        while not self.stop_flag.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Error running retention: {e}")
+            self.stop_flag.wait(interval)
+
+
+# Global retention service instance
+_retention_service = None
+
+
+def get_retention_service() -> RetentionService:
+    """Get global retention service instance"""
+    global _retention_service
+    if _retention_service is None:
+        _retention_service = RetentionService()
+    return _retention_service
@@ -2,17 +2,18 @@
 Rules engine for event generation based on detections and zones
 """
 import logging
-import cv2
 import json
+import numpy as np
 import threading
 import time
 from datetime import datetime, timedelta
-from pathlib import Path
 from typing import Dict, List, Optional
 from collections import defaultdict
 from backend.services.zone_manager import get_zone_manager
 from backend.services.event_store import get_event_store
+from backend.services.frame_pool import FrameBuffer
 from backend.services.inference_engine import get_inference_engine
+from backend.services.snapshot_writer import get_snapshot_writer
 from backend.config.config import get_config
 
 logger = logging.getLogger(__name__)
@@ -32,14 +33,13 @@ class RulesEngine:
         self.recent_events: Dict[str, datetime] = {}  # {event_hash: timestamp}
         self.dedup_window = timedelta(seconds=5)
         
-        # Snapshot directory
-        self.snapshot_dir = Path(self.config.system.snapshot_dir)
-        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        # Snapshots are encoded and written by worker threads
+        self.snapshot_writer = get_snapshot_writer()
         
         self.lock = threading.Lock()
 
-    def process_detections(self, camera_id: int, frame, detections: List[Dict]):
-        """Process detections and generate events based on rules"""
+    def process_detections(self, camera_id: int, buffer: FrameBuffer, detections: List[Dict]):
+        """Process detections on a pooled frame and generate events based on rules"""
         if not detections:
             return
 
@@ -48,28 +48,31 @@ class RulesEngine:
         if not zones:
             return
 
-        # Check each detection against zones
-        for detection in detections:
-            bbox = detection['bbox']
-            center = self.inference_engine.get_bbox_center(bbox)
-            object_type = detection['class_name']
-            confidence = detection['confidence']
-
-            for zone in zones:
-                if self.zone_manager.is_point_in_zone(center, zone):
-                    # Object is in zone
-                    self._check_intrusion_rule(
-                        camera_id, zone, detection, frame
-                    )
-                    self._check_loitering_rule(
-                        camera_id, zone, detection, frame
-                    )
+        # Check all detections against all zones in one pass
+        centers = [
+            self.inference_engine.get_bbox_center(detection['bbox'])
+            for detection in detections
+        ]
+        membership = self.zone_manager.zone_membership(camera_id, centers, zones, buffer.array.shape)
+
+        # Row-major order: each detection against its zones, as before
+        for detection_index, zone_index in np.argwhere(membership):
+            detection = detections[detection_index]
+            zone = zones[zone_index]
+
+            # Object is in zone
+            self._check_intrusion_rule(
+                camera_id, zone, detection, buffer
+            )
+            self._check_loitering_rule(
+                camera_id, zone, detection, buffer
+            )
 
         # Clean up old zone occupancy data
         self._cleanup_zone_occupancy()
         self._cleanup_recent_events()
 
-    def _check_intrusion_rule(self, camera_id: int, zone: Dict, detection: Dict, frame):
+    def _check_intrusion_rule(self, camera_id: int, zone: Dict, detection: Dict, buffer: FrameBuffer):
         """Check intrusion rule: object enters restricted zone"""
         rule_config = self.config.rules.get('intrusion', {})
         if not rule_config.get('enabled', True):
@@ -81,11 +84,6 @@ class RulesEngine:
         if self._is_duplicate_event(event_hash):
             return
 
-        # Generate event
-        snapshot_path = self._save_snapshot(
-            frame, detection['bbox'], camera_id, 'intrusion'
-        )
-
         priority = rule_config.get('priority', 'high')
         
         metadata = {
@@ -94,15 +92,9 @@ class RulesEngine:
             'inference_time_ms': self.inference_engine.get_avg_inference_time()
         }
 
-        self.event_store.create_event(
-            camera_id=camera_id,
-            rule_type='intrusion',
-            object_type=detection['class_name'],
-            confidence=detection['confidence'],
-            bbox=detection['bbox'],
-            snapshot_path=snapshot_path,
-            priority=priority,
-            metadata=metadata
+        self._emit_event(
+            camera_id, buffer, detection, 'intrusion', priority, metadata,
+            zone_id=zone['id']
         )
 
         # Mark as recent event
@@ -111,7 +103,7 @@ class RulesEngine:
 
         logger.info(f"Intrusion event: {detection['class_name']} in zone '{zone['name']}' (camera {camera_id})")
 
-    def _check_loitering_rule(self, camera_id: int, zone: Dict, detection: Dict, frame):
+    def _check_loitering_rule(self, camera_id: int, zone: Dict, detection: Dict, buffer: FrameBuffer):
         """Check loitering rule: object remains in zone > threshold seconds"""
         rule_config = self.config.rules.get('loitering', {})
         if not rule_config.get('enabled', True):
@@ -140,74 +132,67 @@ class RulesEngine:
             first_seen = self.zone_occupancy[zone_id][object_key]
             duration = (current_time - first_seen).total_seconds()
 
-            if duration >= threshold_seconds:
-                # Loitering detected
-                event_hash = f"{camera_id}_{zone_id}_loitering_{object_key}"
-                
-                if self._is_duplicate_event(event_hash):
-                    return
-
-                # Generate event
-                snapshot_path = self._save_snapshot(
-                    frame, detection['bbox'], camera_id, 'loitering'
-                )
-
-                priority = rule_config.get('priority', 'medium')
-                
-                metadata = {
-                    'zone_id': zone['id'],
-                    'zone_name': zone['name'],
-                    'duration_seconds': int(duration),
-                    'inference_time_ms': self.inference_engine.get_avg_inference_time()
-                }
-
-                self.event_store.create_event(
-                    camera_id=camera_id,
-                    rule_type='loitering',
-                    object_type=detection['class_name'],
-                    confidence=detection['confidence'],
-                    bbox=detection['bbox'],
-                    snapshot_path=snapshot_path,
-                    priority=priority,
-                    metadata=metadata
-                )
-
-                # Mark as recent event
-                self.recent_events[event_hash] = current_time
-                
-                # Reset tracking for this object
-                del self.zone_occupancy[zone_id][object_key]
-
-                logger.info(f"Loitering event: person in zone '{zone['name']}' for {int(duration)}s (camera {camera_id})")
-
-    def _save_snapshot(self, frame, bbox: List[int], camera_id: int, rule_type: str) -> str:
-        """Save snapshot with bounding box overlay"""
-        try:
-            # Draw bounding box on frame
-            frame_copy = frame.copy()
-            x1, y1, x2, y2 = bbox
-            cv2.rectangle(frame_copy, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            
-            # Add timestamp
-            timestamp_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cv2.putText(
-                frame_copy, timestamp_str,
-                (10, 30), cv2.FONT_HERSHEY_SIMPLEX,
-                0.7, (0, 255, 0), 2
-            )
+            if duration < threshold_seconds:
+                return
 
-            # Generate filename
-            filename = f"cam{camera_id}_{rule_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jpg"
-            filepath = self.snapshot_dir / filename
-            
-            # Save image
-            cv2.imwrite(str(filepath), frame_copy)
+            # Loitering detected
+            event_hash = f"{camera_id}_{zone_id}_loitering_{object_key}"
+            if event_hash in self.recent_events and current_time - self.recent_events[event_hash] < self.dedup_window:
+                return
+
+            # Mark as recent event
+            self.recent_events[event_hash] = current_time
             
-            return str(filepath)
+            # Reset tracking for this object
+            del self.zone_occupancy[zone_id][object_key]
+
+        # Snapshot and event are produced outside the lock
+        priority = rule_config.get('priority', 'medium')
         
-        except Exception as e:
-            logger.error(f"Error saving snapshot: {e}")
-            return ""
+        metadata = {
+            'zone_id': zone['id'],
+            'zone_name': zone['name'],
+            'duration_seconds': int(duration),
+            'inference_time_ms': self.inference_engine.get_avg_inference_time()
+        }
+
+        self._emit_event(
+            camera_id, buffer, detection, 'loitering', priority, metadata,
+            zone_id=zone_id, track_id=object_key
+        )
+
+        logger.info(f"Loitering event: person in zone '{zone['name']}' for {int(duration)}s (camera {camera_id})")
+
+    def _emit_event(
+        self,
+        camera_id: int,
+        buffer: FrameBuffer,
+        detection: Dict,
+        rule_type: str,
+        priority: str,
+        metadata: Dict,
+        zone_id: int = None,
+        track_id: str = None
+    ):
+        """Queue an event and its snapshot; the snapshot is drawn, written and linked to the event off this thread"""
+        timestamp = datetime.now()
+        with_snapshot = self.snapshot_writer.reserve(camera_id, rule_type)
+
+        event = self.event_store.submit_event(
+            camera_id=camera_id,
+            rule_type=rule_type,
+            timestamp=timestamp,
+            object_type=detection['class_name'],
+            confidence=detection['confidence'],
+            bbox=detection['bbox'],
+            priority=priority,
+            metadata=metadata,
+            zone_id=zone_id,
+            track_id=track_id
+        )
+
+        if with_snapshot:
+            self.snapshot_writer.submit(buffer, detection['bbox'], camera_id, rule_type, timestamp, event)
 
     def _is_duplicate_event(self, event_hash: str) -> bool:
         """Check if event is a duplicate within dedup window"""
@@ -0,0 +1,84 @@
+"""
+Snapshot image encoding - JPEG or WebP, optional downscaling, OpenCV or TurboJPEG backend
+"""
+import logging
+from typing import Optional
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG
+except ImportError:  # optional, pip install PyTurboJPEG (needs libturbojpeg)
+    TurboJPEG = None
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'jpeg': '.jpg',
+    'webp': '.webp'
+}
+
+# One TurboJPEG handle per process (it loads the shared library)
+_turbojpeg = None
+
+
+def _get_turbojpeg():
+    """Get the TurboJPEG handle, or None if PyTurboJPEG/libturbojpeg is not installed"""
+    global _turbojpeg
+    if _turbojpeg is None and TurboJPEG is not None:
+        try:
+            _turbojpeg = TurboJPEG()
+        except Exception as e:
+            logger.warning(f"TurboJPEG unavailable, using OpenCV: {e}")
+    return _turbojpeg
+
+
+class SnapshotEncoder:
+    def __init__(
+        self,
+        format: str = "jpeg",
+        quality: int = 90,
+        max_dimension: int = 0,
+        encoder: str = "opencv"
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported snapshot format: {format}")
+        if encoder not in ('opencv', 'turbojpeg'):
+            raise ValueError(f"Unsupported snapshot encoder: {encoder}")
+
+        self.format = format
+        self.quality = max(1, min(100, quality))
+        self.max_dimension = max(0, max_dimension)
+        self.extension = FORMATS[format]
+
+        # TurboJPEG only encodes JPEG; fall back to OpenCV otherwise
+        self.turbojpeg = _get_turbojpeg() if encoder == 'turbojpeg' and format == 'jpeg' else None
+        if encoder == 'turbojpeg' and self.turbojpeg is None:
+            logger.warning(f"TurboJPEG encoder requested for {format} snapshots, using OpenCV")
+        self.encoder = 'turbojpeg' if self.turbojpeg is not None else 'opencv'
+
+    def resize(self, image: np.ndarray, max_dimension: Optional[int] = None) -> np.ndarray:
+        """Downscale so the longer side is at most max_dimension (0 = keep full resolution)"""
+        limit = self.max_dimension if max_dimension is None else max_dimension
+        height, width = image.shape[:2]
+        if not limit or max(height, width) <= limit:
+            return image
+        scale = limit / max(height, width)
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+    def encode(self, image: np.ndarray, quality: Optional[int] = None) -> bytes:
+        """Encode a BGR image, raising ValueError if encoding fails"""
+        quality = self.quality if quality is None else quality
+
+        if self.turbojpeg is not None:
+            return self.turbojpeg.encode(np.ascontiguousarray(image), quality=quality)
+
+        if self.format == 'webp':
+            params = [cv2.IMWRITE_WEBP_QUALITY, quality]
+        else:
+            params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        ok, data = cv2.imencode(self.extension, image, params)
+        if not ok:
+            raise ValueError(f"Could not encode {self.format} image")
+        return data.tobytes()
@@ -0,0 +1,306 @@
+"""
+Asynchronous snapshot writer - draws, encodes and saves event snapshots on worker threads
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import cv2
+import numpy as np
+from backend.services.event_store import get_event_store
+from backend.services.frame_pool import FrameBuffer
+from backend.services.snapshot_encoder import SnapshotEncoder
+from backend.config.config import get_config
+
+logger = logging.getLogger(__name__)
+
+# Smaller images written next to each snapshot: <name><suffix>.jpg
+VARIANT_SUFFIXES = {
+    'thumbnail': '_thumb',
+    'crop': '_crop'
+}
+
+
+def snapshot_relative_path(camera_id: int, timestamp: datetime, event_id: int, extension: str) -> Path:
+    """Snapshot location under snapshot_dir: YYYY/MM/DD/cam<id>/<event id><ext>"""
+    return Path(timestamp.strftime('%Y'), timestamp.strftime('%m'), timestamp.strftime('%d'),
+                f"cam{camera_id}", f"{event_id}{extension}")
+
+
+def variant_path(snapshot_path: str, variant: str) -> str:
+    """Path of a snapshot variant ('full', 'thumbnail' or 'crop')"""
+    if variant == 'full':
+        return snapshot_path
+    path = Path(snapshot_path)
+    return str(path.with_name(f"{path.stem}{VARIANT_SUFFIXES[variant]}{path.suffix}"))
+
+
+class SnapshotWriter:
+    def __init__(self):
+        self.config = get_config()
+        self.event_store = get_event_store()
+
+        self.snapshot_dir = Path(self.config.system.snapshot_dir)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.worker_count = max(1, self.config.snapshots.workers)
+
+        # Queued snapshots: (buffer, bbox, camera_id, rule_type, timestamp, event future); a slot
+        # is reserved before the event is submitted, so a full queue drops the snapshot up front.
+        # Each queued job holds a reference on its capture buffer, so queue_size also bounds
+        # how many extra frames the capture pools allocate while snapshots are pending.
+        self.jobs: queue.Queue = queue.Queue()
+        self.slots = threading.BoundedSemaphore(max(1, self.config.snapshots.queue_size))
+
+        # Encoding settings per rule type
+        self.encoders: Dict[str, SnapshotEncoder] = {}
+
+        self.stop_flag = threading.Event()
+        self.lock = threading.Lock()
+        self.workers: List[threading.Thread] = []
+        self.written_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+        self.bytes_written = 0
+        self.write_times: List[float] = []
+
+    def start(self):
+        """Start the worker threads"""
+        with self.lock:
+            if any(worker.is_alive() for worker in self.workers):
+                return
+            self.stop_flag.clear()
+            self.workers = [
+                threading.Thread(target=self._worker_loop, daemon=True)
+                for _ in range(self.worker_count)
+            ]
+            for worker in self.workers:
+                worker.start()
+        logger.info(
+            f"Snapshot writer started (workers={self.worker_count}, "
+            f"queue_size={self.config.snapshots.queue_size})"
+        )
+
+    def stop(self):
+        """Stop the workers after writing everything already queued"""
+        self.stop_flag.set()
+        for worker in self.workers:
+            worker.join(timeout=10)
+        self._drain()
+        logger.info("Snapshot writer stopped")
+
+    def reserve(self, camera_id: int, rule_type: str) -> bool:
+        """Claim a queue slot for a snapshot, False if the queue is full (the snapshot is dropped)"""
+        if self.slots.acquire(blocking=False):
+            return True
+        with self.lock:
+            self.dropped_count += 1
+        logger.debug(f"Snapshot queue full, dropping {rule_type} snapshot for camera {camera_id}")
+        return False
+
+    def submit(
+        self,
+        buffer: FrameBuffer,
+        bbox: List[int],
+        camera_id: int,
+        rule_type: str,
+        timestamp: datetime,
+        event: Future
+    ):
+        """
+        Queue a captured frame for the workers (after reserve())
+
+        The capture buffer is retained rather than copied; the worker copies it
+        and releases it. Snapshots are named after the event id, so the worker
+        sets the event's snapshot_path once both the event and the image are stored.
+        """
+        self.jobs.put((buffer.retain(), bbox, camera_id, rule_type, timestamp, event))
+
+    def get_encoder(self, rule_type: str) -> SnapshotEncoder:
+        """Encoder for a rule's snapshots (snapshots settings, overridden by rules.<rule>.snapshot)"""
+        with self.lock:
+            if rule_type in self.encoders:
+                return self.encoders[rule_type]
+
+        settings = {
+            'format': self.config.snapshots.format,
+            'quality': self.config.snapshots.quality,
+            'max_dimension': self.config.snapshots.max_dimension,
+            'encoder': self.config.snapshots.encoder
+        }
+        settings.update(self.config.rules.get(rule_type, {}).get('snapshot') or {})
+        try:
+            encoder = SnapshotEncoder(**settings)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid snapshot settings for {rule_type} ({e}), using defaults")
+            encoder = SnapshotEncoder()
+
+        with self.lock:
+            return self.encoders.setdefault(rule_type, encoder)
+
+    def get_queue_depth(self) -> int:
+        """Get number of snapshots waiting to be written"""
+        return self.jobs.qsize()
+
+    def get_stats(self) -> dict:
+        """Get snapshot writer statistics"""
+        with self.lock:
+            avg_ms = sum(self.write_times) / len(self.write_times) if self.write_times else 0.0
+            return {
+                'queue_depth': self.jobs.qsize(),
+                'written': self.written_count,
+                'dropped': self.dropped_count,
+                'failed': self.failed_count,
+                'bytes_written': self.bytes_written,
+                'avg_write_ms': round(avg_ms, 2)
+            }
+
+    def _worker_loop(self):
+        """Write queued snapshots"""
+        while not self.stop_flag.is_set():
+            try:
+                job = self.jobs.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._write(job)
+
+    def _drain(self):
+        """Write whatever is left in the queue (used on shutdown)"""
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            self._write(job)
+
+    def _write(self, job: tuple):
+        """Encode one snapshot and its variants, save them and set the event's snapshot_path"""
+        buffer, bbox, camera_id, rule_type, timestamp, event = job
+        start = time.perf_counter()
+        path = None
+        written = 0
+        try:
+            try:
+                # Other stages may still read the capture buffer, so annotate a private copy
+                image = buffer.array.copy()
+            finally:
+                buffer.release()
+
+            encoder = self.get_encoder(rule_type)
+            crop = self._encode_crop(image, bbox, encoder) if self.config.snapshots.crop_enabled else None
+
+            # Draw bounding box and timestamp
+            x1, y1, x2, y2 = bbox
+            cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            cv2.putText(
+                image, timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                (10, 30), cv2.FONT_HERSHEY_SIMPLEX,
+                0.7, (0, 255, 0), 2
+            )
+            image = encoder.resize(image)
+            full = encoder.encode(image)
+            thumbnail = self._encode_thumbnail(image, encoder)
+
+            event_id = event.result(timeout=30)['id']
+            path = str(self.snapshot_dir / snapshot_relative_path(camera_id, timestamp, event_id, encoder.extension))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            written += self._save(path, full)
+            for variant, data in (('thumbnail', thumbnail), ('crop', crop)):
+                if data is not None:
+                    written += self._save(variant_path(path, variant), data)
+
+            self.event_store.update_snapshot_path(event_id, path)
+        except Exception as e:
+            logger.error(f"Error saving {rule_type} snapshot for camera {camera_id} ({path}): {e}")
+            path = None
+        finally:
+            self.slots.release()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.bytes_written += written
+            if path:
+                self.written_count += 1
+                self.write_times.append(elapsed_ms)
+                if len(self.write_times) > 100:
+                    self.write_times.pop(0)
+            else:
+                self.failed_count += 1
+
+    def _save(self, path: str, data: bytes) -> int:
+        """Write encoded image bytes, returns the number of bytes written"""
+        with open(path, 'wb') as f:
+            f.write(data)
+        return len(data)
+
+    def _encode_thumbnail(self, image: np.ndarray, encoder: SnapshotEncoder) -> Optional[bytes]:
+        """Encode a downscaled copy of the annotated snapshot for list views"""
+        height, width = image.shape[:2]
+        thumb_width = min(width, self.config.snapshots.thumbnail_width)
+        thumb_height = max(1, round(height * thumb_width / width))
+        thumbnail = cv2.resize(image, (thumb_width, thumb_height), interpolation=cv2.INTER_AREA)
+        try:
+            return encoder.encode(thumbnail, quality=self.config.snapshots.thumbnail_quality)
+        except Exception as e:
+            logger.error(f"Error encoding thumbnail: {e}")
+            return None
+
+    def _encode_crop(self, image: np.ndarray, bbox: List[int], encoder: SnapshotEncoder) -> Optional[bytes]:
+        """Encode the detected object (bbox plus padding) at full resolution, without overlay"""
+        height, width = image.shape[:2]
+        x1, y1, x2, y2 = bbox
+        pad_x = int((x2 - x1) * self.config.snapshots.crop_padding)
+        pad_y = int((y2 - y1) * self.config.snapshots.crop_padding)
+        x1, y1 = max(0, x1 - pad_x), max(0, y1 - pad_y)
+        x2, y2 = min(width, x2 + pad_x), min(height, y2 + pad_y)
+        if x2 <= x1 or y2 <= y1:
+            return None
+        try:
+            return encoder.encode(image[y1:y2, x1:x2])
+        except Exception as e:
+            logger.error(f"Error encoding crop: {e}")
+            return None
+
+    def get_urls(self, snapshot_path: Optional[str]) -> Optional[Dict[str, str]]:
+        """
+        URLs of a snapshot's variants under the /snapshots mount
+
+        Only variants that were written are listed; the thumbnail falls back to
+        the full image (e.g. for snapshots taken before thumbnails existed).
+        """
+        if not snapshot_path:
+            return None
+
+        urls = {'full': self._url(Path(snapshot_path))}
+        for variant in VARIANT_SUFFIXES:
+            path = Path(variant_path(snapshot_path, variant))
+            if path.exists():
+                urls[variant] = self._url(path)
+        urls.setdefault('thumbnail', urls['full'])
+        return urls
+
+    def _url(self, path: Path) -> str:
+        """URL of a file under the /snapshots mount"""
+        try:
+            relative = path.relative_to(self.snapshot_dir).as_posix()
+        except ValueError:
+            relative = path.name
+        return f"/snapshots/{relative}"
+
+
+# Global snapshot writer instance
+_snapshot_writer = None
+
+
+def get_snapshot_writer() -> SnapshotWriter:
+    """Get global snapshot writer instance (started on first use)"""
+    global _snapshot_writer
+    if _snapshot_writer is None:
+        _snapshot_writer = SnapshotWriter()
+        _snapshot_writer.start()
+    return _snapshot_writer
@@ -9,29 +9,74 @@ import logging
 from datetime import datetime
 from typing import Dict, Optional
 from backend.services.camera_manager import get_camera_manager
+from backend.services.frame_pool import FramePool
+from backend.config.config import get_config
 
 logger = logging.getLogger(__name__)
 
 
+class FrameMailbox:
+    """Single-slot frame holder: a new frame replaces any frame not yet consumed"""
+
+    def __init__(self):
+        self.item = None
+        self.condition = threading.Condition()
+
+    def put_nowait(self, item):
+        """Store item, returning the unconsumed item it replaced (or None)"""
+        with self.condition:
+            replaced = self.item
+            self.item = item
+            self.condition.notify()
+            return replaced
+
+    def get(self, timeout: float = None):
+        """Take the latest item, raising queue.Empty if none arrives within timeout"""
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.item is not None, timeout):
+                raise queue.Empty
+            item, self.item = self.item, None
+            return item
+
+    def get_nowait(self):
+        return self.get(timeout=0)
+
+    def qsize(self) -> int:
+        return 0 if self.item is None else 1
+
+
 class StreamIngestion:
-    def __init__(self, max_queue_size: int = 100):
+    def __init__(self, max_queue_size: int = 100, ingestion_mode: str = "queue"):
+        if ingestion_mode not in ("queue", "latest"):
+            raise ValueError(f"Unsupported ingestion mode: {ingestion_mode}")
         self.max_queue_size = max_queue_size
+        self.ingestion_mode = ingestion_mode  # 'queue' (FIFO) or 'latest' (single-slot mailbox)
         self.frame_queues: Dict[int, queue.Queue] = {}
+        self.dropped_frames: Dict[int, int] = {}
         self.capture_threads: Dict[int, threading.Thread] = {}
         self.stop_flags: Dict[int, threading.Event] = {}
         self.camera_manager = get_camera_manager()
+        self.config = get_config()
         self.fps_trackers: Dict[int, list] = {}
+        self.fps_targets: Dict[int, float] = {}
+        self.frame_pools: Dict[int, FramePool] = {}
 
-    def start_camera(self, camera_id: int, rtsp_url: str):
+    def start_camera(self, camera_id: int, rtsp_url: str, fps_target: Optional[float] = None):
         """Start capturing frames from a camera"""
         if camera_id in self.capture_threads and self.capture_threads[camera_id].is_alive():
             logger.warning(f"Camera {camera_id} already running")
             return
 
         # Create frame queue and stop flag
-        self.frame_queues[camera_id] = queue.Queue(maxsize=self.max_queue_size)
+        if self.ingestion_mode == "latest":
+            self.frame_queues[camera_id] = FrameMailbox()
+        else:
+            self.frame_queues[camera_id] = queue.Queue(maxsize=self.max_queue_size)
+        self.dropped_frames[camera_id] = 0
+        self.frame_pools[camera_id] = FramePool(size=self.config.system.frame_pool_size)
         self.stop_flags[camera_id] = threading.Event()
         self.fps_trackers[camera_id] = []
+        self.set_fps_target(camera_id, fps_target)
 
         # Start capture thread
         thread = threading.Thread(
@@ -49,8 +94,19 @@ class StreamIngestion:
             self.stop_flags[camera_id].set()
             logger.info(f"Stopping camera {camera_id}")
 
+    def set_fps_target(self, camera_id: int, fps_target: Optional[float] = None):
+        """Set analysis rate for a camera (None = system.fps_target, 0 = every frame)"""
+        if fps_target is None:
+            fps_target = self.config.system.fps_target
+        self.fps_targets[camera_id] = fps_target
+
     def get_frame(self, camera_id: int, timeout: float = 1.0) -> Optional[tuple]:
-        """Get next frame from camera queue"""
+        """
+        Get next frame from camera queue
+
+        Returns (FrameBuffer, timestamp); the caller owns one reference and
+        must release() the buffer when done with it.
+        """
         if camera_id not in self.frame_queues:
             return None
 
@@ -65,6 +121,10 @@ class StreamIngestion:
         retry_count = 0
         max_retries = 10
         cap = None
+        frame_pool = self.frame_pools[camera_id]
+        source_fps = 0.0
+        frame_index = 0
+        last_sample_time = 0.0
 
         while not self.stop_flags[camera_id].is_set():
             try:
@@ -79,13 +139,33 @@ class StreamIngestion:
                     # Update camera status to online
                     self.camera_manager.update_status(camera_id, 'online')
                     retry_count = 0
-                    logger.info(f"Camera {camera_id}: Connected successfully")
+                    source_fps = cap.get(cv2.CAP_PROP_FPS)
+                    frame_index = 0
+                    logger.info(f"Camera {camera_id}: Connected successfully ({source_fps:.1f} fps source)")
 
-                # Read frame
-                ret, frame = cap.read()
+                if self.config.system.frame_skipping:
+                    # Advance the stream without decoding, only decode sampled frames
+                    if not cap.grab():
+                        raise Exception("Failed to grab frame")
+                    
+                    frame_index += 1
+                    if not self._should_sample(camera_id, source_fps, frame_index, last_sample_time):
+                        continue
+                    
+                    buffer = frame_pool.acquire()
+                    ret, frame = cap.retrieve(buffer.array)
+                    last_sample_time = time.time()
+                else:
+                    # Read frame
+                    buffer = frame_pool.acquire()
+                    ret, frame = cap.read(buffer.array)
                 
                 if not ret or frame is None:
+                    buffer.release()
                     raise Exception("Failed to read frame")
+                
+                # Decoder writes into the pooled array unless the frame shape changed
+                frame_pool.adopt(buffer, frame)
 
                 # Track FPS
                 current_time = time.time()
@@ -102,16 +182,26 @@ class StreamIngestion:
                     self.camera_manager.update_status(camera_id, 'online', fps=fps)
 
                 # Put frame in queue (drop oldest if full)
-                try:
-                    self.frame_queues[camera_id].put_nowait((frame, datetime.now()))
-                except queue.Full:
-                    # Drop oldest frame
+                frame_queue = self.frame_queues[camera_id]
+                if isinstance(frame_queue, FrameMailbox):
+                    # Latest frame wins, an unconsumed frame is dropped
+                    replaced = frame_queue.put_nowait((buffer, datetime.now()))
+                    if replaced is not None:
+                        replaced[0].release()
+                        self.dropped_frames[camera_id] += 1
+                else:
                     try:
-                        self.frame_queues[camera_id].get_nowait()
-                        self.frame_queues[camera_id].put_nowait((frame, datetime.now()))
-                        logger.debug(f"Camera {camera_id}: Dropped frame (queue full)")
-                    except:
-                        pass
+                        frame_queue.put_nowait((buffer, datetime.now()))
+                    except queue.Full:
+                        # Drop oldest frame
+                        try:
+                            dropped_buffer, _ = frame_queue.get_nowait()
+                            dropped_buffer.release()
+                            frame_queue.put_nowait((buffer, datetime.now()))
+                            self.dropped_frames[camera_id] += 1
+                            logger.debug(f"Camera {camera_id}: Dropped frame (queue full)")
+                        except:
+                            buffer.release()
 
             except Exception as e:
                 logger.error(f"Camera {camera_id}: Error - {e}")
@@ -141,12 +231,36 @@ class StreamIngestion:
         self.camera_manager.update_status(camera_id, 'offline')
         logger.info(f"Camera {camera_id}: Capture loop stopped")
 
+    def _should_sample(self, camera_id: int, source_fps: float, frame_index: int, last_sample_time: float) -> bool:
+        """Decide whether the grabbed frame should be decoded for analysis"""
+        fps_target = self.fps_targets.get(camera_id, 0)
+        if not fps_target or fps_target <= 0:
+            return True
+        
+        # Known source rate: keep every Nth frame (also correct for files read faster than real time)
+        if 0 < source_fps <= 240:
+            stride = max(1, round(source_fps / fps_target))
+            return frame_index % stride == 0
+        
+        # Unknown source rate (common with RTSP): fall back to wall-clock spacing
+        return time.time() - last_sample_time >= 1.0 / fps_target
+
     def get_queue_depth(self, camera_id: int) -> int:
         """Get current queue depth for a camera"""
         if camera_id in self.frame_queues:
             return self.frame_queues[camera_id].qsize()
         return 0
 
+    def get_dropped_frames(self, camera_id: int) -> int:
+        """Get number of frames dropped before processing for a camera"""
+        return self.dropped_frames.get(camera_id, 0)
+
+    def get_frame_pool_stats(self, camera_id: int) -> dict:
+        """Get decode buffer pool usage for a camera"""
+        if camera_id in self.frame_pools:
+            return self.frame_pools[camera_id].get_stats()
+        return {'allocated': 0, 'free': 0}
+
     def stop_all(self):
         """Stop all cameras"""
         for camera_id in list(self.stop_flags.keys()):
@@ -161,5 +275,9 @@ def get_stream_ingestion() -> StreamIngestion:
     """Get global stream ingestion instance"""
     global _stream_ingestion
     if _stream_ingestion is None:
-        _stream_ingestion = StreamIngestion()
+        config = get_config()
+        _stream_ingestion = StreamIngestion(
+            max_queue_size=config.system.frame_queue_size,
+            ingestion_mode=config.system.ingestion_mode
+        )
     return _stream_ingestion
@@ -3,10 +3,15 @@ Zone management service
 """
 import logging
 import json
+import threading
 from typing import List, Optional, Dict
 from datetime import datetime
+import numpy as np
+from shapely import contains_xy, prepare
 from shapely.geometry import Point, Polygon
+from backend.services.zone_mask import ZoneMask, MAX_MASK_ZONES
 from backend.database.db import get_db
+from backend.config.config import get_config
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +19,14 @@ logger = logging.getLogger(__name__)
 class ZoneManager:
     def __init__(self):
         self.db = get_db()
+        self.config = get_config()
+        
+        # Per-camera zone cache so the per-frame rule path does no DB I/O
+        self.zone_cache: Dict[int, List[Dict]] = {}  # {camera_id: [zone]}
+        self.geometry_cache: Dict[int, Dict] = {}  # {zone_id: {'bounds': tuple, 'polygon': prepared Polygon}}
+        self.mask_cache: Dict[int, ZoneMask] = {}  # {camera_id: rasterized zones}
+        self.cache_version = 0
+        self.lock = threading.Lock()
 
     def create_zone(self, camera_id: int, name: str, zone_type: str, coordinates: List[List[int]]) -> Dict:
         """Create a new zone"""
@@ -25,14 +38,14 @@ class ZoneManager:
                 raise ValueError("Rectangle must have exactly 2 points (top-left, bottom-right)")
             
             coords_json = json.dumps(coordinates)
-            cursor = self.db.execute(
+            zone_id = self.db.insert(
                 """
                 INSERT INTO zones (camera_id, name, type, coordinates, created_at)
                 VALUES (?, ?, ?, ?, ?)
                 """,
                 (camera_id, name, zone_type, coords_json, datetime.now())
             )
-            zone_id = cursor.lastrowid
+            self.invalidate_cache(camera_id)
             logger.info(f"Created zone: {name} for camera {camera_id} (ID: {zone_id})")
             return self.get_zone(zone_id)
         except Exception as e:
@@ -49,14 +62,66 @@ class ZoneManager:
         return None
 
     def get_zones_by_camera(self, camera_id: int) -> List[Dict]:
-        """Get all zones for a camera"""
+        """Get all zones for a camera (served from the zone cache)"""
+        with self.lock:
+            zones = self.zone_cache.get(camera_id)
+            version = self.cache_version
+        
+        if zones is None:
+            zones, geometries = self._load_zones(camera_id)
+            with self.lock:
+                # Don't cache a result that raced with an invalidation
+                if version == self.cache_version:
+                    self.zone_cache[camera_id] = zones
+                    self.geometry_cache.update(geometries)
+        
+        return list(zones)
+
+    def invalidate_cache(self, camera_id: Optional[int] = None):
+        """Drop cached zones for a camera (or for all cameras)"""
+        with self.lock:
+            self.cache_version += 1
+            if camera_id is None:
+                self.zone_cache.clear()
+                self.geometry_cache.clear()
+                self.mask_cache.clear()
+                return
+            self.mask_cache.pop(camera_id, None)
+            for zone in self.zone_cache.pop(camera_id, []):
+                self.geometry_cache.pop(zone['id'], None)
+
+    def _load_zones(self, camera_id: int) -> tuple:
+        """Load a camera's zones from the database; returns (zones, {zone_id: geometry})"""
         rows = self.db.fetchall("SELECT * FROM zones WHERE camera_id = ?", (camera_id,))
         zones = []
+        geometries = {}
         for row in rows:
             zone = dict(row)
             zone['coordinates'] = json.loads(zone['coordinates'])
+            geometries[zone['id']] = self._prepare_geometry(zone)
             zones.append(zone)
-        return zones
+        return zones, geometries
+
+    def _prepare_geometry(self, zone: Dict) -> Dict:
+        """Precompute bounding box and prepared polygon for a zone"""
+        coordinates = zone['coordinates']
+        xs = [point[0] for point in coordinates]
+        ys = [point[1] for point in coordinates]
+        geometry = {'bounds': (min(xs), min(ys), max(xs), max(ys)), 'polygon': None}
+        
+        if zone['type'] == 'polygon':
+            polygon = Polygon(coordinates)
+            prepare(polygon)
+            geometry['polygon'] = polygon
+        
+        return geometry
+
+    def _get_geometry(self, zone: Dict) -> Dict:
+        """Get cached geometry for a zone, preparing it if not cached"""
+        geometry = self.geometry_cache.get(zone.get('id'))
+        if geometry is None:
+            geometry = self._prepare_geometry(zone)
+        return geometry
 
     def get_all_zones(self) -> List[Dict]:
         """Get all zones"""
@@ -90,6 +155,7 @@ class ZoneManager:
             f"UPDATE zones SET {set_clause} WHERE id = ?",
             tuple(values)
         )
+        self.invalidate_cache()
         
         logger.info(f"Updated zone {zone_id}")
         return self.get_zone(zone_id)
@@ -97,24 +163,115 @@ class ZoneManager:
     def delete_zone(self, zone_id: int) -> bool:
         """Delete zone"""
         self.db.execute("DELETE FROM zones WHERE id = ?", (zone_id,))
+        self.invalidate_cache()
         logger.info(f"Deleted zone {zone_id}")
         return True
 
+    def get_zone_bounds(self, zone: Dict) -> tuple:
+        """Get axis-aligned bounding box (x1, y1, x2, y2) of a zone"""
+        return self._get_geometry(zone)['bounds']
+
+    def get_camera_roi(self, camera_id: int, frame_shape: tuple, padding: int = 0, top_padding: int = 0) -> Optional[tuple]:
+        """
+        Get the padded union bounding box (x1, y1, x2, y2) of a camera's zones,
+        clamped to the frame. Returns None if the camera has no zones.
+        """
+        zones = self.get_zones_by_camera(camera_id)
+        if not zones:
+            return None
+        
+        bounds = [self.get_zone_bounds(zone) for zone in zones]
+        height, width = frame_shape[:2]
+        x1 = max(0, min(b[0] for b in bounds) - padding)
+        y1 = max(0, min(b[1] for b in bounds) - padding - top_padding)
+        x2 = min(width, max(b[2] for b in bounds) + padding)
+        y2 = min(height, max(b[3] for b in bounds) + padding)
+        
+        if x2 <= x1 or y2 <= y1:
+            return None
+        return (int(x1), int(y1), int(x2), int(y2))
+
+    def zone_membership(self, camera_id: int, points, zones: List[Dict], frame_shape: tuple) -> np.ndarray:
+        """
+        Membership matrix for points against a camera's zones using the
+        configured engine ('polygon' or 'mask')
+        """
+        if self.config.zones.engine == 'mask' and 0 < len(zones) <= MAX_MASK_ZONES:
+            return self.get_zone_mask(camera_id, zones, frame_shape).lookup(points)
+        return self.points_in_zones(points, zones)
+
+    def get_zone_mask(self, camera_id: int, zones: List[Dict], frame_shape: tuple) -> ZoneMask:
+        """Get the rasterized mask for a camera, rebuilding it when zones or resolution change"""
+        with self.lock:
+            mask = self.mask_cache.get(camera_id)
+            version = self.cache_version
+        
+        if mask is None or not mask.matches(zones, frame_shape):
+            mask = ZoneMask(zones, frame_shape, downscale=self.config.zones.mask_downscale)
+            with self.lock:
+                if version == self.cache_version:
+                    self.mask_cache[camera_id] = mask
+            logger.info(f"Rebuilt zone mask for camera {camera_id} ({len(zones)} zones, {mask.mask.shape})")
+        
+        return mask
+
+    def points_in_zones(self, points, zones: List[Dict]) -> np.ndarray:
+        """
+        Test many points against many zones at once
+        
+        Args:
+            points: (N, 2) array-like of [x, y] points
+            zones: zones as returned by get_zones_by_camera
+        
+        Returns:
+            (N, len(zones)) boolean membership matrix
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        membership = np.zeros((len(points), len(zones)), dtype=bool)
+        if len(points) == 0:
+            return membership
+        
+        xs = points[:, 0]
+        ys = points[:, 1]
+        
+        for j, zone in enumerate(zones):
+            try:
+                geometry = self._get_geometry(zone)
+                
+                # Bounding box prefilter for all points
+                x1, y1, x2, y2 = geometry['bounds']
+                candidates = (xs >= x1) & (xs <= x2) & (ys >= y1) & (ys <= y2)
+                
+                if zone['type'] == 'polygon':
+                    indices = np.flatnonzero(candidates)
+                    if indices.size:
+                        membership[indices, j] = contains_xy(
+                            geometry['polygon'], xs[indices], ys[indices]
+                        )
+                elif zone['type'] == 'rectangle':
+                    membership[:, j] = candidates
+            except Exception as e:
+                logger.error(f"Error checking points in zone: {e}")
+        
+        return membership
+
     def is_point_in_zone(self, point: tuple, zone: Dict) -> bool:
         """Check if a point is inside a zone"""
         try:
-            coordinates = zone['coordinates']
+            geometry = self._get_geometry(zone)
+            
+            # Cheap bounding box rejection before any polygon test
+            x, y = point
+            x1, y1, x2, y2 = geometry['bounds']
+            if not (x1 <= x <= x2 and y1 <= y <= y2):
+                return False
             
             if zone['type'] == 'polygon':
-                polygon = Polygon(coordinates)
-                return polygon.contains(Point(point))
+                return geometry['polygon'].contains(Point(point))
             
             elif zone['type'] == 'rectangle':
-                # Rectangle: [[x1, y1], [x2, y2]]
-                x, y = point
-                x1, y1 = coordinates[0]
-                x2, y2 = coordinates[1]
-                return min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2)
+                # Rectangle: [[x1, y1], [x2, y2]] - the bounding box is the zone
+                return True
             
             return False
         except Exception as e:
@@ -0,0 +1,68 @@
+"""
+Rasterized zone masks for constant-time zone membership lookups
+"""
+import logging
+import math
+from typing import List, Dict
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Smallest unsigned type able to hold one bit per zone
+_MASK_DTYPES = [(8, np.uint8), (16, np.uint16), (32, np.uint32), (64, np.uint64)]
+MAX_MASK_ZONES = 64
+
+
+class ZoneMask:
+    """Zones rasterized into one label image where bit j is set inside zone j"""
+
+    def __init__(self, zones: List[Dict], frame_shape: tuple, downscale: int = 1):
+        if len(zones) > MAX_MASK_ZONES:
+            raise ValueError(f"Zone masks support at most {MAX_MASK_ZONES} zones per camera")
+
+        height, width = frame_shape[:2]
+        self.frame_shape = (height, width)
+        self.zone_ids = tuple(zone['id'] for zone in zones)
+        self.downscale = max(1, int(downscale))
+
+        dtype = next(t for bits, t in _MASK_DTYPES if len(zones) <= bits)
+        self.bits = np.array([1 << j for j in range(len(zones))], dtype=dtype)
+
+        mask_height = math.ceil(height / self.downscale)
+        mask_width = math.ceil(width / self.downscale)
+        self.mask = np.zeros((mask_height, mask_width), dtype=dtype)
+
+        layer = np.zeros((mask_height, mask_width), dtype=np.uint8)
+        for j, zone in enumerate(zones):
+            layer[:] = 0
+            points = np.round(np.asarray(zone['coordinates'], dtype=np.float64) / self.downscale).astype(np.int32)
+
+            if zone['type'] == 'polygon':
+                cv2.fillPoly(layer, [points], 1)
+            elif zone['type'] == 'rectangle':
+                cv2.rectangle(layer, tuple(points[0]), tuple(points[1]), 1, thickness=-1)
+
+            self.mask[layer.astype(bool)] |= self.bits[j]
+
+    def matches(self, zones: List[Dict], frame_shape: tuple) -> bool:
+        """Check whether this mask was built for these zones at this resolution"""
+        return (
+            self.frame_shape == tuple(frame_shape[:2])
+            and self.zone_ids == tuple(zone['id'] for zone in zones)
+        )
+
+    def lookup(self, points) -> np.ndarray:
+        """(N, 2) points -> (N, zones) boolean membership matrix"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        rows = (points[:, 1] // self.downscale).astype(np.int64)
+        cols = (points[:, 0] // self.downscale).astype(np.int64)
+
+        valid = (
+            (rows >= 0) & (rows < self.mask.shape[0])
+            & (cols >= 0) & (cols < self.mask.shape[1])
+        )
+        labels = np.zeros(len(points), dtype=self.mask.dtype)
+        labels[valid] = self.mask[rows[valid], cols[valid]]
+
+        return (labels[:, None] & self.bits[None, :]) != 0
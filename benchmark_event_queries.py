@@ -0,0 +1,173 @@
+"""
+Benchmark event queries against a large synthetic event history and check their plans
+
+Every filter combination accepted by /api/v1/events is run through EXPLAIN QUERY
+PLAN (on one day partition); a plan that sorts (USE TEMP B-TREE FOR ORDER BY) or scans the whole table
+without an index is reported as a regression. tests/test_event_query_plans.py runs the
+same check on a small table as part of the test suite; this script repeats it at scale
+and times the queries.
+
+Usage:
+    python benchmark_event_queries.py --rows 10000000
+    python benchmark_event_queries.py --rows 200000 --check    # plans only, exit 1 on regression
+"""
+import sys
+import time
+import argparse
+import itertools
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, '.')
+from backend.database import db as db_module
+from backend.database.db import Database
+from backend.services.event_store import EventStore
+
+RULE_TYPES = ['intrusion', 'loitering']
+PRIORITIES = ['low', 'medium', 'high']
+STATUSES = ['acknowledged', 'resolved']
+ZONES_PER_CAMERA = 3
+
+
+def populate(event_store: EventStore, rows: int, cameras: int, days: int):
+    """Insert synthetic events spread over the last `days` days (about 5% still 'new')"""
+    partitions = event_store.partitions
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    rules = ",".join(f"'{r}'" for r in RULE_TYPES)
+    priorities = ",".join(f"'{p}'" for p in PRIORITIES)
+    statuses = ",".join(f"'{s}'" for s in STATUSES)
+
+    inserted = 0
+    for day in range(days):
+        day_start = today - timedelta(days=days - 1 - day)
+        count = rows // days + (1 if day < rows % days else 0)
+        if count == 0:
+            continue
+
+        with event_store.db.transaction() as cursor:
+            partition = partitions.ensure(cursor, day_start)
+            first_id = partitions.allocate_ids(cursor, count)
+            cursor.execute(f"""
+                WITH RECURSIVE seq(n) AS (
+                    SELECT 0 UNION ALL SELECT n + 1 FROM seq WHERE n < ?
+                )
+                INSERT INTO {partition} (id, camera_id, timestamp, rule_type, object_type, confidence,
+                                         bbox_x1, bbox_y1, bbox_x2, bbox_y2, zone_id, priority, status)
+                SELECT
+                    ? + n,
+                    1 + abs(random()) % ?,
+                    datetime(?, '+' || CAST(n * ? AS INTEGER) || ' seconds'),
+                    json_extract(json_array({rules}), '$[' || (abs(random()) % {len(RULE_TYPES)}) || ']'),
+                    'person',
+                    0.5 + (abs(random()) % 50) / 100.0,
+                    10, 20, 110, 220,
+                    1 + abs(random()) % ?,
+                    json_extract(json_array({priorities}), '$[' || (abs(random()) % {len(PRIORITIES)}) || ']'),
+                    CASE WHEN abs(random()) % 20 = 0 THEN 'new'
+                         ELSE json_extract(json_array({statuses}), '$[' || (abs(random()) % {len(STATUSES)}) || ']')
+                    END
+                FROM seq
+            """, (count - 1, first_id, cameras, day_start.strftime('%Y-%m-%d %H:%M:%S'), 86400.0 / count,
+                  cameras * ZONES_PER_CAMERA))
+            partitions.record_rows(cursor, partition, first_id, first_id + count - 1, count)
+
+        inserted += count
+        print(f"  inserted {inserted:,} / {rows:,}")
+
+    with event_store.db.lock:
+        event_store.db.conn.execute("ANALYZE")
+
+
+def filter_combinations(cameras: int, days: int):
+    """Every combination of the /api/v1/events filters, with and without a cursor"""
+    now = datetime.now()
+    values = {
+        'camera_id': cameras // 2 + 1,
+        'zone_id': cameras,
+        'from_time': now - timedelta(days=days // 3),
+        'to_time': now - timedelta(days=days // 6),
+        'rule_type': 'loitering',
+        'priority': 'high',
+        'status': None,
+    }
+    names = list(values)
+    for size in range(len(names) + 1):
+        for combo in itertools.combinations(names, size):
+            for status in (['new', 'acknowledged'] if 'status' in combo else [None]):
+                filters = {name: values[name] for name in combo}
+                if 'status' in combo:
+                    filters['status'] = status
+                for cursor in (False, True):
+                    yield filters, cursor
+
+
+def plan_regressions(plan: list) -> list:
+    """Plan lines that indicate a sort or a full table scan"""
+    return [
+        line for line in plan
+        if 'TEMP B-TREE' in line or (line.startswith('SCAN events') and 'USING' not in line)
+    ]
+
+
+def time_it(fn, iterations: int) -> float:
+    """Average milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event query plan check and benchmark")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--cameras", type=int, default=16)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Only check plans, exit 1 on regression")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_module.db = Database(str(Path(tmp) / "bench.db"))
+        event_store = EventStore()
+
+        print(f"Generating {args.rows:,} events ({args.cameras} cameras, {args.days} days)")
+        populate(event_store, args.rows, args.cameras, args.days)
+
+        regressions = 0
+        results = []
+        for filters, cursor in filter_combinations(args.cameras, args.days):
+            plans = event_store.explain_query_events(cursor=cursor, **filters)
+            bad = plan_regressions(plans['page'])
+            label = ", ".join(f"status={v}" if k == 'status' else k for k, v in filters.items()) or "(no filters)"
+            label += " +cursor" if cursor else ""
+            if bad:
+                regressions += 1
+                print(f"REGRESSION {label}: {' | '.join(plans['page'])}")
+
+            if args.check or cursor:
+                continue
+
+            page_ms = time_it(lambda: event_store.query_events(limit=50, include_total=False, **filters), args.iterations)
+            _, _, next_cursor = event_store.query_events(limit=50, include_total=False, **filters)
+            cursor_ms = time_it(
+                lambda: event_store.query_events(limit=50, cursor=next_cursor, include_total=False, **filters),
+                args.iterations
+            ) if next_cursor else 0.0
+            count_ms = time_it(lambda: event_store.query_events(limit=1, **filters), 1)
+            results.append((label, page_ms, cursor_ms, count_ms, plans['page'][0]))
+
+        if results:
+            print(f"\n{'filters':52s} {'page':>9s} {'cursor':>9s} {'count':>10s}  plan")
+            for label, page_ms, cursor_ms, count_ms, plan in sorted(results, key=lambda r: -r[3]):
+                print(f"{label:52s} {page_ms:7.2f}ms {cursor_ms:7.2f}ms {count_ms:8.1f}ms  {plan}")
+
+        print(f"\n{regressions} plan regression(s)")
+        event_store.stop_writer()
+        db_module.close_db()
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
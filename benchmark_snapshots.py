@@ -0,0 +1,140 @@
+"""
+Benchmark snapshot encoding settings - encode time and bytes per snapshot
+
+Frames come from --images (image files), --video (first frames of a video) or,
+by default, synthetic 1080p frames. Each setting is a snapshots/rules.<rule>.snapshot
+combination (format, quality, max_dimension, encoder).
+
+Usage:
+    python benchmark_snapshots.py
+    python benchmark_snapshots.py --images data/snapshots/*.jpg --iterations 20
+    python benchmark_snapshots.py --video sample.mp4 --frames 30
+"""
+import sys
+import time
+import argparse
+from typing import List
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, '.')
+from backend.services.snapshot_encoder import SnapshotEncoder, _get_turbojpeg
+
+SETTINGS = [
+    {'format': 'jpeg', 'quality': 95},
+    {'format': 'jpeg', 'quality': 90},
+    {'format': 'jpeg', 'quality': 80},
+    {'format': 'jpeg', 'quality': 70},
+    {'format': 'jpeg', 'quality': 80, 'max_dimension': 1280},
+    {'format': 'jpeg', 'quality': 80, 'max_dimension': 960},
+    {'format': 'webp', 'quality': 80},
+    {'format': 'webp', 'quality': 80, 'max_dimension': 1280},
+]
+
+TURBOJPEG_SETTINGS = [
+    {'format': 'jpeg', 'quality': 90, 'encoder': 'turbojpeg'},
+    {'format': 'jpeg', 'quality': 80, 'encoder': 'turbojpeg'},
+    {'format': 'jpeg', 'quality': 80, 'max_dimension': 1280, 'encoder': 'turbojpeg'},
+]
+
+
+def synthetic_frames(count: int, width: int = 1920, height: int = 1080) -> List[np.ndarray]:
+    """Camera-like frames: smooth background, a few objects and sensor noise"""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width]
+    frames = []
+    for i in range(count):
+        frame = np.empty((height, width, 3), dtype=np.uint8)
+        frame[..., 0] = (x * 255 // width + i * 7) % 256
+        frame[..., 1] = (y * 255 // height) % 256
+        frame[..., 2] = ((x + y) * 128 // (width + height) + 64) % 256
+        for _ in range(12):
+            x1, y1 = int(rng.integers(0, width - 200)), int(rng.integers(0, height - 200))
+            color = tuple(int(c) for c in rng.integers(0, 255, 3))
+            cv2.rectangle(frame, (x1, y1), (x1 + int(rng.integers(40, 200)), y1 + int(rng.integers(40, 200))), color, -1)
+        noise = rng.normal(0, 6, frame.shape)
+        frames.append(np.clip(frame + noise, 0, 255).astype(np.uint8))
+    return frames
+
+
+def load_frames(args) -> List[np.ndarray]:
+    """Sample frames from the command line sources"""
+    if args.images:
+        frames = [cv2.imread(path) for path in args.images]
+        return [frame for frame in frames if frame is not None][:args.frames]
+
+    if args.video:
+        capture = cv2.VideoCapture(args.video)
+        frames = []
+        while len(frames) < args.frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            frames.append(frame)
+        capture.release()
+        return frames
+
+    return synthetic_frames(args.frames)
+
+
+def label(settings: dict) -> str:
+    """Short description of one setting"""
+    text = f"{settings.get('encoder', 'opencv')} {settings['format']} q{settings['quality']}"
+    if settings.get('max_dimension'):
+        text += f" max {settings['max_dimension']}"
+    return text
+
+
+def benchmark(encoder: SnapshotEncoder, frames: List[np.ndarray], iterations: int) -> tuple:
+    """Average (resize + encode) milliseconds and bytes per snapshot"""
+    encoder.encode(encoder.resize(frames[0]))  # warm up
+    total_bytes = 0
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for frame in frames:
+            total_bytes += len(encoder.encode(encoder.resize(frame)))
+    count = iterations * len(frames)
+    return (time.perf_counter() - start) * 1000 / count, total_bytes / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot encoding benchmark")
+    parser.add_argument("--images", nargs="*", help="Sample image files")
+    parser.add_argument("--video", help="Sample video (first --frames frames are used)")
+    parser.add_argument("--frames", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--thumbnail-width", type=int, default=320)
+    args = parser.parse_args()
+
+    frames = load_frames(args)
+    if not frames:
+        print("No frames to encode")
+        sys.exit(1)
+    height, width = frames[0].shape[:2]
+    print(f"{len(frames)} frame(s) of {width}x{height}, {args.iterations} iteration(s)\n")
+
+    settings = list(SETTINGS)
+    if _get_turbojpeg() is not None:
+        settings += TURBOJPEG_SETTINGS
+    else:
+        print("TurboJPEG not installed (pip install PyTurboJPEG), skipping its settings\n")
+
+    print(f"{'setting':36s} {'encode':>10s} {'size':>10s}")
+    for setting in settings:
+        encoder = SnapshotEncoder(**setting)
+        encode_ms, size = benchmark(encoder, frames, args.iterations)
+        print(f"{label(setting):36s} {encode_ms:8.2f}ms {size / 1024:8.1f}KB")
+
+    # Thumbnails written next to every snapshot
+    thumbnail_frames = [
+        cv2.resize(frame, (args.thumbnail_width, round(height * args.thumbnail_width / width)),
+                   interpolation=cv2.INTER_AREA)
+        for frame in frames
+    ]
+    encode_ms, size = benchmark(SnapshotEncoder(quality=70), thumbnail_frames, args.iterations)
+    print(f"{f'thumbnail {args.thumbnail_width}px jpeg q70':36s} {encode_ms:8.2f}ms {size / 1024:8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark zone membership engines: shapely polygon tests vs rasterized masks
+
+Usage:
+    python benchmark_zones.py --zones 6 --points 60 --width 1920 --height 1080
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, '.')
+from backend.database import db as db_module
+from backend.database.db import Database
+from backend.services.zone_manager import ZoneManager
+from backend.services.zone_mask import ZoneMask
+
+
+def random_zones(zone_manager: ZoneManager, count: int, width: int, height: int, rng) -> list:
+    """Create random convex-ish polygons and rectangles for camera 1"""
+    for i in range(count):
+        cx, cy = rng.integers(0, width), rng.integers(0, height)
+        radius = rng.integers(min(width, height) // 10, min(width, height) // 3)
+        if i % 3 == 2:
+            coordinates = [[int(cx - radius), int(cy - radius)], [int(cx + radius), int(cy + radius)]]
+            zone_type = 'rectangle'
+        else:
+            angles = np.sort(rng.uniform(0, 2 * np.pi, rng.integers(4, 12)))
+            coordinates = [
+                [int(cx + radius * np.cos(a)), int(cy + radius * np.sin(a))]
+                for a in angles
+            ]
+            zone_type = 'polygon'
+        zone_manager.create_zone(1, f"zone_{i}", zone_type, coordinates)
+    return zone_manager.get_zones_by_camera(1)
+
+
+def time_it(fn, iterations: int) -> float:
+    """Average milliseconds per call"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zone membership benchmark")
+    parser.add_argument("--zones", type=int, default=6)
+    parser.add_argument("--points", type=int, default=60)
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--downscale", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    frame_shape = (args.height, args.width, 3)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_module.db = Database(str(Path(tmp) / "bench.db"))
+        zone_manager = ZoneManager()
+        zones = random_zones(zone_manager, args.zones, args.width, args.height, rng)
+
+        points = np.column_stack([
+            rng.integers(0, args.width, args.points),
+            rng.integers(0, args.height, args.points)
+        ])
+
+        build_ms = time_it(lambda: ZoneMask(zones, frame_shape, args.downscale), 10)
+        mask = ZoneMask(zones, frame_shape, args.downscale)
+
+        results = {
+            "per-point loop (is_point_in_zone)": time_it(
+                lambda: [[zone_manager.is_point_in_zone(tuple(p), z) for z in zones] for p in points],
+                max(1, args.iterations // 10)
+            ),
+            "vectorized polygon (points_in_zones)": time_it(
+                lambda: zone_manager.points_in_zones(points, zones), args.iterations
+            ),
+            "rasterized mask (ZoneMask.lookup)": time_it(
+                lambda: mask.lookup(points), args.iterations
+            ),
+        }
+
+        polygon = zone_manager.points_in_zones(points, zones)
+        agreement = (polygon == mask.lookup(points)).mean() * 100
+
+        print(f"{args.zones} zones, {args.points} points, {args.width}x{args.height}, downscale {args.downscale}")
+        print(f"Mask build: {build_ms:.2f} ms, {mask.mask.nbytes / 1024:.0f} KiB ({mask.mask.dtype})")
+        for name, ms in results.items():
+            print(f"  {name:40s} {ms * 1000:10.1f} us/frame")
+        print(f"Mask vs polygon agreement: {agreement:.2f}% (differences are boundary pixels)")
+
+        db_module.close_db()
+
+
+if __name__ == "__main__":
+    main()
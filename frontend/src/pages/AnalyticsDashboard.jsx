@@ -28,6 +28,7 @@ const COLORS = ['#0088FE', '#00C49F', '#FFBB28', '#FF8042'];
 export default function AnalyticsDashboard() {
     const [stats, setStats] = useState(null);
     const [metrics, setMetrics] = useState(null);
+    const [trend, setTrend] = useState([]);
 
     useEffect(() => {
         loadData();
@@ -37,12 +38,14 @@ export default function AnalyticsDashboard() {
 
     const loadData = async () => {
         try {
-            const [statsRes, metricsRes] = await Promise.all([
+            const [statsRes, metricsRes, trendRes] = await Promise.all([
                 eventAPI.getStats({ hours: 24 }),
                 systemAPI.metrics(),
+                eventAPI.getTimeseries({ hours: 24, bucket: 'hour' }),
             ]);
             setStats(statsRes.data);
             setMetrics(metricsRes.data);
+            setTrend(trendRes.data.series);
         } catch (err) {
             console.error('Error loading analytics:', err);
         }
@@ -63,6 +66,11 @@ export default function AnalyticsDashboard() {
         count: value,
     }));
 
+    const trendData = trend.map((point) => ({
+        time: point.bucket.slice(11, 16),
+        count: point.count,
+    }));
+
     const cameraData = metrics.cameras.map((cam) => ({
         name: cam.name,
         fps: cam.fps,
@@ -181,6 +189,27 @@ export default function AnalyticsDashboard() {
                     </Card>
                 </Grid>
 
+                {/* Events per Hour */}
+                <Grid item xs={12}>
+                    <Card>
+                        <CardContent>
+                            <Typography variant="h6" gutterBottom>
+                                Events per Hour (24h)
+                            </Typography>
+                            <ResponsiveContainer width="100%" height={300}>
+                                <LineChart data={trendData}>
+                                    <CartesianGrid strokeDasharray="3 3" />
+                                    <XAxis dataKey="time" />
+                                    <YAxis allowDecimals={false} />
+                                    <Tooltip />
+                                    <Legend />
+                                    <Line type="monotone" dataKey="count" stroke="#8884d8" name="Events" />
+                                </LineChart>
+                            </ResponsiveContainer>
+                        </CardContent>
+                    </Card>
+                </Grid>
+
                 {/* Camera Performance */}
                 <Grid item xs={12}>
                     <Card>
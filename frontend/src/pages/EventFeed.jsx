@@ -23,6 +23,7 @@ export default function EventFeed() {
         camera_id: '',
         rule: '',
         priority: '',
+        search: '',
         limit: 50,
     });
     const [selectedEvent, setSelectedEvent] = useState(null);
@@ -52,6 +53,16 @@ export default function EventFeed() {
             if (filters.priority) params.priority = filters.priority;
             params.limit = filters.limit;
 
+            // Free-text search is ranked by relevance instead of time
+            if (filters.search.trim()) {
+                params.q = filters.search.trim();
+                const response = await eventAPI.search(params);
+                setEvents(response.data.events);
+                return;
+            }
+
+            params.include_total = false; // Feed only shows the latest page
+
             const response = await eventAPI.getAll(params);
             setEvents(response.data.events);
         } catch (err) {
@@ -98,6 +109,16 @@ export default function EventFeed() {
             <Card sx={{ mb: 3 }}>
                 <CardContent>
                     <Grid container spacing={2}>
+                        <Grid item xs={12}>
+                            <TextField
+                                fullWidth
+                                label="Search"
+                                placeholder='e.g. "car loading dock last night"'
+                                value={filters.search}
+                                onChange={(e) => setFilters({ ...filters, search: e.target.value })}
+                            />
+                        </Grid>
+
                         <Grid item xs={12} sm={3}>
                             <TextField
                                 select
@@ -172,7 +193,17 @@ export default function EventFeed() {
                         >
                             <CardContent>
                                 <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'start' }}>
-                                    <Box>
+                                    {event.snapshot_urls && (
+                                        <Box
+                                            component="img"
+                                            src={event.snapshot_urls.thumbnail}
+                                            alt=""
+                                            loading="lazy"
+                                            onError={(e) => { e.currentTarget.style.display = 'none'; }}
+                                            sx={{ width: 160, mr: 2, borderRadius: 1, flexShrink: 0 }}
+                                        />
+                                    )}
+                                    <Box sx={{ flexGrow: 1 }}>
                                         <Typography variant="h6">
                                             Event #{event.id}
                                         </Typography>
@@ -216,16 +247,28 @@ export default function EventFeed() {
                         <Box>
                             <Grid container spacing={2}>
                                 <Grid item xs={12}>
-                                    {selectedEvent.snapshot_path && (
+                                    {selectedEvent.snapshot_urls && (
                                         <Box
                                             component="img"
-                                            src={`/snapshots/${selectedEvent.snapshot_path.replace(/^.*[\\\/]/, '')}`}
+                                            src={selectedEvent.snapshot_urls.full}
                                             alt="Event snapshot"
                                             sx={{ width: '100%', borderRadius: 1 }}
                                         />
                                     )}
                                 </Grid>
 
+                                {selectedEvent.snapshot_urls?.crop && (
+                                    <Grid item xs={12}>
+                                        <Box
+                                            component="img"
+                                            src={selectedEvent.snapshot_urls.crop}
+                                            alt="Detected object"
+                                            onError={(e) => { e.currentTarget.style.display = 'none'; }}
+                                            sx={{ maxWidth: '100%', maxHeight: 320, borderRadius: 1 }}
+                                        />
+                                    </Grid>
+                                )}
+
                                 <Grid item xs={6}>
                                     <Typography variant="body2">
                                         <strong>Event ID:</strong> {selectedEvent.id}
@@ -30,7 +30,9 @@ export const zoneAPI = {
 export const eventAPI = {
     getAll: (params) => api.get('/events', { params }),
     getById: (id) => api.get(`/events/${id}`),
+    search: (params) => api.get('/events/search', { params }),
     getStats: (params) => api.get('/events/stats', { params }),
+    getTimeseries: (params) => api.get('/events/timeseries', { params }),
 };
 
 // System API
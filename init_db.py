@@ -4,8 +4,7 @@ from backend.database.db import get_db
 
 print("Initializing database...")
 db = get_db()
-print(f"Database initialized at {db.db_path}")
+print(f"Database initialized ({db.dialect})")
 
 # Check tables
-tables = db.fetchall("SELECT name FROM sqlite_master WHERE type='table'")
-print(f"Tables: {[t['name'] for t in tables]}")
+print(f"Tables: {db.list_tables()}")
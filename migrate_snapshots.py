@@ -0,0 +1,107 @@
+"""
+Move snapshots from the flat snapshot_dir into the YYYY/MM/DD/cam<id>/<event id> layout
+
+Old names only had one-second resolution, so events in the same second may share a
+file; each event gets its own hard link (or copy). The old files are removed once
+every event points at its new path. Files no event refers to are left in place.
+
+Usage:
+    python migrate_snapshots.py --dry-run
+    python migrate_snapshots.py
+"""
+import os
+import sys
+import shutil
+import argparse
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, '.')
+from backend.config.config import get_config
+from backend.database.db import get_db, close_db
+from backend.database.partitions import EventPartitions
+from backend.services.snapshot_writer import VARIANT_SUFFIXES, snapshot_relative_path, variant_path
+
+
+def link_or_copy(source: Path, target: Path):
+    """Hard-link source to target, copying when links are not supported"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate snapshots to the sharded layout")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be moved")
+    args = parser.parse_args()
+
+    config = get_config()
+    db = get_db()
+    snapshot_dir = Path(config.system.snapshot_dir)
+    partitions = EventPartitions(db, config.events.partition_days)
+
+    # old file -> [(partition, event id, new path)]
+    moves = defaultdict(list)
+    missing = 0
+    for partition in partitions.in_range():
+        rows = db.fetchall(
+            f"SELECT id, camera_id, timestamp, snapshot_path FROM {partition} WHERE snapshot_path IS NOT NULL"
+        )
+        for row in rows:
+            old = Path(row['snapshot_path'])
+            try:
+                sharded = len(old.relative_to(snapshot_dir).parts) > 1
+            except ValueError:
+                sharded = old.parent.name.startswith('cam')
+            if sharded:
+                continue
+            if not old.exists():
+                old = snapshot_dir / old.name  # stored relative to another working directory
+            if not old.exists():
+                missing += 1
+                continue
+
+            timestamp = datetime.fromisoformat(str(row['timestamp']))
+            new = snapshot_dir / snapshot_relative_path(row['camera_id'], timestamp, row['id'], old.suffix)
+            moves[old].append((partition, row['id'], new))
+
+    events = sum(len(targets) for targets in moves.values())
+    print(f"{len(moves)} snapshot file(s) referenced by {events} event(s), {missing} missing")
+    if args.dry_run or not moves:
+        close_db()
+        return
+
+    # 1. Every event gets its own copy of the snapshot and its variants
+    updates = defaultdict(list)
+    for old, targets in moves.items():
+        for partition, event_id, new in targets:
+            for variant in ['full'] + list(VARIANT_SUFFIXES):
+                source = Path(variant_path(str(old), variant))
+                target = Path(variant_path(str(new), variant))
+                if source.exists() and not target.exists():
+                    link_or_copy(source, target)
+            updates[partition].append((str(new), event_id))
+
+    # 2. Point the events at the new files
+    for partition, rows in updates.items():
+        with db.transaction() as cursor:
+            cursor.executemany(f"UPDATE {partition} SET snapshot_path = ? WHERE id = ?", rows)
+
+    # 3. Remove the flat files
+    removed = 0
+    for old in moves:
+        for variant in ['full'] + list(VARIANT_SUFFIXES):
+            source = Path(variant_path(str(old), variant))
+            if source.exists():
+                source.unlink()
+                removed += 1
+
+    print(f"Moved snapshots of {events} event(s) into {snapshot_dir}/YYYY/MM/DD/cam<id>/, removed {removed} old file(s)")
+    close_db()
+
+
+if __name__ == "__main__":
+    main()
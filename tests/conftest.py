@@ -0,0 +1,59 @@
+"""
+Shared fixtures - a temporary SQLite database and event store per test
+"""
+import pytest
+import backend.config.config as config_module
+import backend.database.db as db_module
+import backend.services.camera_manager as camera_manager_module
+import backend.services.event_store as event_store_module
+from backend.config.config import Config
+from backend.database.db import Database
+from backend.services.camera_manager import CameraManager
+from backend.services.event_store import EventStore
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Default configuration with the database and snapshots under tmp_path"""
+    config = Config()
+    config.database.url = f"sqlite:///{tmp_path / 'sentinelsight.db'}"
+    config.system.snapshot_dir = str(tmp_path / 'snapshots')
+    config.mqtt.enabled = False
+    monkeypatch.setattr(config_module, '_config', config)
+    return config
+
+
+@pytest.fixture
+def db(config, monkeypatch):
+    """SQLite database installed as the global get_db() instance"""
+    database = Database(config.database.url.replace("sqlite:///", ""), read_pool_size=1)
+    monkeypatch.setattr(db_module, 'db', database)
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def event_store(db, monkeypatch):
+    """Event store on the temporary database, installed as get_event_store()"""
+    store = EventStore()
+    monkeypatch.setattr(event_store_module, '_event_store', store)
+    yield store
+    store.stop_writer()
+
+
+@pytest.fixture
+def camera_manager(config, db, monkeypatch):
+    """Camera manager whose background writer only flushes when asked, installed as get_camera_manager()"""
+    config.system.status_flush_interval_seconds = 3600
+    manager = CameraManager()
+    monkeypatch.setattr(camera_manager_module, '_camera_manager', manager)
+    yield manager
+    manager.stop_status_writer()
+
+
+@pytest.fixture
+def client(event_store, camera_manager):
+    """API client on the temporary stores (the app lifespan - cameras, retention - is not started)"""
+    from fastapi.testclient import TestClient
+    from backend.api.main import app
+    return TestClient(app)
@@ -0,0 +1,88 @@
+"""
+Cross-camera batch scheduler with a stub inference engine
+"""
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import threading
+import numpy as np
+import pytest
+import backend.services.batch_scheduler as batch_scheduler_module
+from backend.services.batch_scheduler import BatchScheduler
+
+
+class StubEngine:
+    """Records each batch and returns one detection per frame naming the frame's value"""
+
+    def __init__(self):
+        self.batches = []
+
+    def detect_objects_batch(self, frames, rois):
+        self.batches.append([int(frame[0, 0]) for frame in frames])
+        return [[{'frame': int(frame[0, 0])}] for frame in frames]
+
+
+def _frame(value: int) -> np.ndarray:
+    return np.full((4, 4), value, dtype=np.uint8)
+
+
+@pytest.fixture
+def engine(config, monkeypatch):
+    config.inference.max_batch_size = 4
+    config.inference.max_batch_wait_ms = 500
+    engine = StubEngine()
+    monkeypatch.setattr(batch_scheduler_module, 'get_inference_engine', lambda: engine)
+    return engine
+
+
+@pytest.fixture
+def scheduler(engine):
+    scheduler = BatchScheduler()
+    yield scheduler
+    scheduler.stop()
+
+
+def test_frames_from_two_cameras_share_a_batch(scheduler, engine):
+    scheduler.register_source(1)
+    scheduler.register_source(2)
+    first = scheduler.submit(1, _frame(1))
+    second = scheduler.submit(2, _frame(2))
+    scheduler.start()
+
+    assert first.result(timeout=5) == [{'frame': 1}]
+    assert second.result(timeout=5) == [{'frame': 2}]
+    assert engine.batches == [[1, 2]]
+    assert scheduler.get_avg_batch_size() == 2
+
+
+def test_detect_blocks_until_its_batch_ran(scheduler, engine):
+    scheduler.register_source(1)
+    scheduler.start()
+
+    results = {}
+    thread = threading.Thread(target=lambda: results.update(detections=scheduler.detect(1, _frame(7))))
+    thread.start()
+    thread.join(timeout=5)
+
+    assert results['detections'] == [{'frame': 7}]
+
+
+def test_timed_out_request_is_never_inferred(scheduler, engine):
+    scheduler.register_source(1)
+
+    # The worker is not running yet, so this request times out while queued
+    with pytest.raises(FutureTimeoutError):
+        scheduler.detect(1, _frame(9), timeout=0.05)
+
+    scheduler.start()
+    assert scheduler.detect(1, _frame(3), timeout=5) == [{'frame': 3}]
+    assert all(9 not in batch for batch in engine.batches)
+
+
+def test_stop_fails_pending_requests(engine):
+    scheduler = BatchScheduler()
+    pending = [scheduler.submit(1, _frame(i)) for i in range(3)]
+
+    scheduler.stop()
+
+    for future in pending:
+        assert isinstance(future.exception(timeout=1), RuntimeError)
+    assert engine.batches == []
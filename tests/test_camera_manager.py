@@ -0,0 +1,74 @@
+"""
+Camera live state kept in memory and flushed in the background, per-camera fps_target
+"""
+from types import SimpleNamespace
+import pytest
+import backend.api.main as main_module
+from backend.services.stream_ingestion import StreamIngestion
+
+
+def _stored(db, camera_id: int) -> dict:
+    return dict(db.fetchone("SELECT status, fps FROM cameras WHERE id = ?", (camera_id,)))
+
+
+def test_status_transitions_are_written_through(db, camera_manager):
+    camera = camera_manager.create_camera(name='Gate', rtsp_url='gate.mp4')
+
+    camera_manager.update_status(camera['id'], 'online', fps=12.0)
+
+    assert _stored(db, camera['id']) == {'status': 'online', 'fps': 12.0}
+
+
+def test_live_updates_wait_for_a_flush(db, camera_manager):
+    camera = camera_manager.create_camera(name='Gate', rtsp_url='gate.mp4')
+    camera_manager.update_status(camera['id'], 'online', fps=12.0)
+
+    camera_manager.update_status(camera['id'], 'online', fps=14.5)
+
+    assert _stored(db, camera['id'])['fps'] == 12.0
+    assert camera_manager.get_camera(camera['id'])['fps'] == 14.5
+
+    camera_manager.flush_status()
+    assert _stored(db, camera['id'])['fps'] == 14.5
+
+
+def test_stop_joins_the_writer_and_flushes(db, camera_manager):
+    camera = camera_manager.create_camera(name='Gate', rtsp_url='gate.mp4')
+    camera_manager.update_status(camera['id'], 'online', fps=12.0)
+    camera_manager.update_status(camera['id'], 'online', fps=9.0)
+
+    camera_manager.stop_status_writer()
+
+    assert not camera_manager.writer_thread.is_alive()
+    assert _stored(db, camera['id'])['fps'] == 9.0
+
+
+@pytest.fixture
+def stream_ingestion(client, monkeypatch):
+    """Capture service behind the API, without starting any camera"""
+    ingestion = StreamIngestion()
+    monkeypatch.setattr(main_module, 'get_processing_coordinator', lambda: SimpleNamespace(stream_ingestion=ingestion))
+    return ingestion
+
+
+def test_fps_target_override_and_reset(config, client, camera_manager, stream_ingestion):
+    camera = camera_manager.create_camera(name='Gate', rtsp_url='gate.mp4', fps_target=5)
+
+    response = client.put(f"/api/v1/cameras/{camera['id']}", json={'fps_target': 3})
+    assert response.json()['camera']['fps_target'] == 3
+    assert stream_ingestion.fps_targets[camera['id']] == 3
+
+    # Omitting the field keeps the override, an explicit null clears it
+    client.put(f"/api/v1/cameras/{camera['id']}", json={'name': 'Main gate'})
+    assert camera_manager.get_camera(camera['id'])['fps_target'] == 3
+
+    response = client.put(f"/api/v1/cameras/{camera['id']}", json={'fps_target': None})
+    assert response.json()['camera']['fps_target'] is None
+    assert stream_ingestion.fps_targets[camera['id']] == config.system.fps_target
+
+
+def test_negative_fps_target_is_rejected(client, camera_manager):
+    camera = camera_manager.create_camera(name='Gate', rtsp_url='gate.mp4')
+
+    assert client.put(f"/api/v1/cameras/{camera['id']}", json={'fps_target': -1}).status_code == 422
+    assert client.post("/api/v1/cameras", json={'name': 'b', 'rtsp_url': 'b.mp4', 'fps_target': -2}).status_code == 422
@@ -0,0 +1,83 @@
+"""
+Keyset cursor pagination of query_events and /api/v1/events
+"""
+from datetime import datetime, timedelta
+import pytest
+
+MIDNIGHT = datetime(2026, 3, 10)
+
+
+@pytest.fixture
+def events(event_store):
+    """Events straddling midnight, several sharing a timestamp on each side"""
+    timestamps = (
+        [MIDNIGHT - timedelta(seconds=1)] * 4
+        + [MIDNIGHT] * 4
+        + [MIDNIGHT - timedelta(hours=3), MIDNIGHT + timedelta(hours=2), MIDNIGHT + timedelta(seconds=1)]
+    )
+    created = [
+        event_store.create_event(camera_id=1, rule_type='intrusion', timestamp=timestamp)
+        for timestamp in timestamps
+    ]
+    return sorted(created, key=lambda event: (event['timestamp'], event['id']), reverse=True)
+
+
+def _page_through(event_store, limit, **filters):
+    """Follow next_cursor until exhausted, returning the ids of every page"""
+    pages = []
+    cursor = None
+    while True:
+        page, _, cursor = event_store.query_events(limit=limit, cursor=cursor, include_total=False, **filters)
+        pages.append([event['id'] for event in page])
+        if cursor is None:
+            return pages
+
+
+def test_events_span_two_partitions(event_store, events):
+    assert len(event_store.partitions.in_range()) == 2
+
+
+@pytest.mark.parametrize('limit', [1, 3, 4, 5, 10])
+def test_cursor_pages_have_no_duplicates_or_gaps(event_store, events, limit):
+    pages = _page_through(event_store, limit)
+
+    ids = [event_id for page in pages for event_id in page]
+    assert ids == [event['id'] for event in events]
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_cursor_pages_respect_filters(event_store, events):
+    to_time = MIDNIGHT
+    expected = [event['id'] for event in events if event['timestamp'] <= to_time]
+
+    pages = _page_through(event_store, 3, to_time=to_time)
+
+    assert [event_id for page in pages for event_id in page] == expected
+
+
+def test_last_page_has_no_cursor(event_store, events):
+    page, total, cursor = event_store.query_events(limit=len(events) + 1)
+
+    assert len(page) == total == len(events)
+    assert cursor is None
+
+
+def test_api_follows_next_cursor(client, events):
+    ids = []
+    params = {'limit': 4, 'include_total': 'false'}
+    while True:
+        body = client.get("/api/v1/events", params=params).json()
+        ids.extend(event['id'] for event in body['events'])
+        if body['next_cursor'] is None:
+            break
+        params['cursor'] = body['next_cursor']
+
+    assert ids == [event['id'] for event in events]
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'W10=', 'WyJ4Il0='])
+def test_invalid_cursor_is_rejected(client, cursor):
+    response = client.get("/api/v1/events", params={'cursor': cursor})
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Invalid cursor"
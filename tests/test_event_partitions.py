@@ -0,0 +1,232 @@
+"""
+Day-partitioned event tables - id allocation, partition lookup, retention and upgrades
+"""
+import json
+from datetime import date, datetime, timedelta
+import pytest
+from backend.database.partitions import EventPartitions, LEGACY_TABLE
+from backend.services.event_store import EventStore
+from backend.services.retention import RetentionService
+
+DAY = datetime(2026, 3, 10)
+
+
+def _create(event_store, timestamp, **fields):
+    return event_store.create_event(camera_id=1, rule_type='intrusion', timestamp=timestamp, **fields)
+
+
+@pytest.fixture
+def three_days(event_store):
+    """Two events on each of three consecutive days, keyed by day"""
+    return {
+        day: [_create(event_store, DAY + timedelta(days=day, hours=hour)) for hour in (0, 23)]
+        for day in range(3)
+    }
+
+
+def test_ids_are_unique_across_partitions(event_store):
+    events = [_create(event_store, DAY + timedelta(days=i % 3, minutes=i)) for i in range(6)]
+    futures = [
+        event_store.submit_event(camera_id=2, rule_type='loitering', timestamp=DAY + timedelta(days=i % 4, hours=1))
+        for i in range(20)
+    ]
+    events += [future.result(timeout=10) for future in futures]
+
+    ids = [event['id'] for event in events]
+    assert len(set(ids)) == len(ids)
+    assert len(event_store.partitions.in_range()) == 4
+
+
+def test_allocated_id_ranges_do_not_overlap(db, event_store):
+    with db.transaction() as cursor:
+        first = event_store.partitions.allocate_ids(cursor, 10)
+    with db.transaction() as cursor:
+        second = event_store.partitions.allocate_ids(cursor, 5)
+
+    assert second == first + 10
+    assert _create(event_store, DAY)['id'] == second + 5
+
+
+def test_in_range_boundaries(event_store, three_days):
+    partitions = event_store.partitions
+    names = ['events_20260312', 'events_20260311', 'events_20260310']
+
+    assert partitions.in_range() == names
+    assert partitions.in_range(DAY + timedelta(days=1), DAY + timedelta(days=1, hours=23, minutes=59)) == [names[1]]
+    # A range ending exactly at midnight still includes the new day's partition
+    assert partitions.in_range(DAY + timedelta(hours=23), DAY + timedelta(days=1)) == names[1:]
+    assert partitions.in_range(to_time=DAY + timedelta(hours=23, minutes=59, seconds=59)) == [names[2]]
+    assert partitions.in_range(from_time=DAY + timedelta(days=2)) == [names[0]]
+    assert partitions.in_range(DAY + timedelta(days=5), DAY + timedelta(days=6)) == []
+
+
+def test_weekly_partitions_start_on_monday(db):
+    partitions = EventPartitions(db, partition_days=7)
+
+    assert partitions.period_start(date(2026, 3, 9)) == date(2026, 3, 9)  # Monday
+    assert partitions.period_start(datetime(2026, 3, 15, 23, 59)) == date(2026, 3, 9)  # Sunday
+    assert partitions.period_start(date(2026, 3, 16)) == date(2026, 3, 16)
+
+
+def test_for_id_finds_the_partition_of_each_event(event_store, three_days):
+    for day, events in three_days.items():
+        expected = f"events_{(DAY + timedelta(days=day)).strftime('%Y%m%d')}"
+        for event in events:
+            assert event_store.partitions.for_id(event['id']) == [expected]
+            assert event_store.get_event(event['id'])['timestamp'] == str(event['timestamp'])
+
+    last_id = three_days[2][-1]['id']
+    assert event_store.partitions.for_id(last_id + 1) == []
+    assert event_store.get_event(last_id + 1) is None
+
+
+def test_drop_before_removes_partition_search_index_and_catalog_row(db, event_store, three_days):
+    dropped = event_store.partitions.drop_before((DAY + timedelta(days=2)).date())
+
+    assert dropped == 4
+    tables = db.list_tables()
+    for name in ('events_20260310', 'events_20260311'):
+        assert name not in tables
+        assert f"{name}_search" not in tables
+        assert db.fetchone("SELECT 1 FROM event_partitions WHERE name = ?", (name,)) is None
+    assert 'events_20260312' in tables and 'events_20260312_search' in tables
+
+    assert event_store.partitions.in_range() == ['events_20260312']
+    assert event_store.get_event(three_days[0][0]['id']) is None
+    assert event_store.get_event(three_days[2][0]['id']) is not None
+    assert event_store.partitions.drop_before((DAY + timedelta(days=2)).date()) == 0
+
+
+def test_retention_drops_expired_partitions(config, event_store):
+    old = _create(event_store, datetime.now() - timedelta(days=config.system.snapshot_retention_days + 2))
+    recent = _create(event_store, datetime.now())
+    retention = RetentionService()
+
+    assert retention.last_run is None
+    assert retention.run_once() == 1
+
+    assert event_store.get_event(old['id']) is None
+    assert event_store.get_event(recent['id']) is not None
+    stats = retention.get_stats()
+    assert stats['events_deleted'] == 1
+    assert stats['last_run'] is not None
+
+
+def _create_legacy_table(db):
+    """The single events table used before partitioning"""
+    db.execute("""
+        CREATE TABLE events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            camera_id INTEGER NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            rule_type TEXT NOT NULL,
+            object_type TEXT,
+            confidence REAL,
+            bbox TEXT,
+            snapshot_path TEXT,
+            priority TEXT DEFAULT 'medium',
+            status TEXT DEFAULT 'new',
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def test_legacy_events_table_is_migrated(db):
+    _create_legacy_table(db)
+    legacy = [
+        (5, DAY, [1, 2, 3, 4], {'zone_id': 7, 'zone_name': 'Loading Dock', 'direction': 'in'}),
+        (9, DAY + timedelta(hours=23, minutes=59), None, None),
+        (42, DAY + timedelta(days=1, hours=3), [10, 20, 30, 40], {'duration_seconds': 31}),
+    ]
+    for event_id, timestamp, bbox, metadata in legacy:
+        db.execute(
+            "INSERT INTO events (id, camera_id, timestamp, rule_type, bbox, status, metadata) VALUES (?, 1, ?, 'loitering', ?, 'acknowledged', ?)",
+            (event_id, timestamp, json.dumps(bbox) if bbox else None, json.dumps(metadata) if metadata else None)
+        )
+
+    store = EventStore()
+    try:
+        assert LEGACY_TABLE not in db.list_tables()
+        assert store.partitions.in_range() == ['events_20260311', 'events_20260310']
+
+        migrated = store.get_event(5)
+        assert migrated['timestamp'] == str(DAY)
+        assert migrated['bbox'] == [1, 2, 3, 4]
+        assert migrated['zone_id'] == 7
+        assert migrated['metadata'] == {'zone_id': 7, 'zone_name': 'Loading Dock', 'direction': 'in'}
+        assert migrated['status'] == 'acknowledged'
+        assert store.get_event(9)['bbox'] is None
+        assert store.get_event(42)['metadata'] == {'duration_seconds': 31}
+
+        events, total, _ = store.query_events()
+        assert total == 3
+        assert [event['id'] for event in events] == [42, 9, 5]
+        assert [event['id'] for event in store.search_events("loading dock")['events']] == [5]
+
+        # New events continue after the highest legacy id
+        assert store.create_event(camera_id=1, rule_type='intrusion', timestamp=DAY)['id'] == 43
+    finally:
+        store.stop_writer()
+
+
+def test_legacy_table_with_unmigratable_rows_is_kept(db):
+    _create_legacy_table(db)
+    for event_id, timestamp in ((5, DAY), (6, 'not a timestamp')):
+        db.execute(
+            "INSERT INTO events (id, camera_id, timestamp, rule_type) VALUES (?, 1, ?, 'intrusion')",
+            (event_id, timestamp)
+        )
+
+    store = EventStore()
+    try:
+        assert store.get_event(5) is not None
+        assert LEGACY_TABLE not in db.list_tables()
+        kept = [name for name in db.list_tables() if name.startswith(f"{LEGACY_TABLE}_unmigrated_")]
+        assert len(kept) == 1
+        assert [row['id'] for row in db.fetchall(f"SELECT id FROM {kept[0]} ORDER BY id")] == [5, 6]
+    finally:
+        store.stop_writer()
+
+
+def test_json_partitions_are_upgraded_to_typed_columns(db):
+    # Partition layout before bbox/metadata became typed columns
+    db.execute("""
+        CREATE TABLE events_20260310 (
+            id INTEGER PRIMARY KEY,
+            camera_id INTEGER NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            rule_type TEXT NOT NULL,
+            object_type TEXT,
+            confidence REAL,
+            bbox TEXT,
+            snapshot_path TEXT,
+            priority TEXT DEFAULT 'medium',
+            status TEXT DEFAULT 'new',
+            metadata TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    db.execute(
+        "INSERT INTO events_20260310 (id, camera_id, timestamp, rule_type, bbox, metadata) VALUES (1, 1, ?, 'intrusion', ?, ?)",
+        (DAY, json.dumps([5, 6, 7, 8]), json.dumps({'zone_id': 3, 'inference_time_ms': 12.5, 'track': 'a'}))
+    )
+    db.execute(
+        "INSERT INTO event_partitions (name, start_day, end_day, min_id, max_id, row_count) VALUES (?, ?, ?, 1, 1, 1)",
+        ('events_20260310', '2026-03-10', '2026-03-11')
+    )
+    db.execute("UPDATE event_id_sequence SET next_id = 2 WHERE id = 1")
+
+    store = EventStore()
+    try:
+        columns = db.table_columns('events_20260310')
+        assert 'bbox' not in columns and 'metadata' not in columns
+        assert {'bbox_x1', 'zone_id', 'track_id', 'extra'} <= set(columns)
+
+        event = store.get_event(1)
+        assert event['bbox'] == [5, 6, 7, 8]
+        assert event['zone_id'] == 3
+        assert event['metadata'] == {'zone_id': 3, 'inference_time_ms': 12.5, 'track': 'a'}
+        assert store.query_events(zone_id=3)[1] == 1
+    finally:
+        store.stop_writer()
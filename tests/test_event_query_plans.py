@@ -0,0 +1,152 @@
+"""
+EXPLAIN QUERY PLAN checks for every filter combination accepted by /api/v1/events
+
+Each page query must read one of the partition indexes matching its filters
+(every index ends in timestamp, so none of them needs a sort) - never a full
+table scan or a temp B-tree for ORDER BY.
+"""
+import itertools
+import random
+import re
+from datetime import datetime, timedelta
+import pytest
+import backend.config.config as config_module
+import backend.database.db as db_module
+from backend.config.config import Config
+from backend.database.db import Database
+from backend.services.event_store import EventStore
+
+DAY = datetime(2026, 3, 10)
+ROWS = 2000
+CAMERAS = 8
+ZONES = 24
+
+FILTER_VALUES = {
+    'camera_id': 3,
+    'zone_id': 5,
+    'from_time': DAY + timedelta(hours=2),
+    'to_time': DAY + timedelta(hours=20),
+    'rule_type': 'loitering',
+    'priority': 'high',
+    'status': None,
+}
+
+# Partition index suffix -> columns it matches by equality (before timestamp)
+INDEX_COLUMNS = {
+    'time': set(),
+    'camera_time': {'camera_id'},
+    'camera_rule_time': {'camera_id', 'rule_type'},
+    'rule_time': {'rule_type'},
+    'priority_time': {'priority'},
+    'zone_time': {'zone_id'},
+    'new_time': {'status'},
+}
+
+
+def filter_combinations():
+    """Every combination of the /api/v1/events filters ('new' and another status separately)"""
+    names = list(FILTER_VALUES)
+    for size in range(len(names) + 1):
+        for combo in itertools.combinations(names, size):
+            for status in (['new', 'acknowledged'] if 'status' in combo else [None]):
+                filters = {name: FILTER_VALUES[name] for name in combo}
+                if status:
+                    filters['status'] = status
+                yield filters
+
+
+def _label(filters: dict) -> str:
+    return ",".join(f"status={value}" if name == 'status' else name for name, value in filters.items()) or "none"
+
+
+@pytest.fixture(scope='module')
+def plan_store(tmp_path_factory):
+    """Event store with one analyzed day partition of mixed events"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(config_module, '_config', Config())
+        database = Database(str(tmp_path_factory.mktemp('plans') / 'events.db'), read_pool_size=1)
+        monkeypatch.setattr(db_module, 'db', database)
+        store = EventStore()
+
+        rng = random.Random(0)
+        futures = [
+            store.submit_event(
+                camera_id=rng.randint(1, CAMERAS),
+                rule_type=rng.choice(['intrusion', 'loitering']),
+                timestamp=DAY + timedelta(seconds=i * 86400 // ROWS),
+                object_type='person',
+                confidence=0.9,
+                bbox=[10, 20, 110, 220],
+                priority=rng.choice(['low', 'medium', 'high']),
+                zone_id=rng.randint(1, ZONES)
+            )
+            for i in range(ROWS)
+        ]
+        for future in futures:
+            future.result(timeout=30)
+
+        # About 5% of events are still unhandled
+        partition = store.partitions.in_range()[0]
+        database.execute(f"""
+            UPDATE {partition} SET status = CASE
+                WHEN id % 20 = 0 THEN 'new' WHEN id % 2 = 0 THEN 'acknowledged' ELSE 'resolved' END
+        """)
+        database.execute("ANALYZE")
+
+        yield store
+        store.stop_writer()
+        database.close()
+
+
+def _index_used(plan: list) -> str:
+    """Suffix of the partition index the plan reads, e.g. 'camera_time'"""
+    for line in plan:
+        match = re.search(r"USING (?:COVERING )?INDEX events_\d+_(\w+)", line)
+        if match:
+            return match.group(1)
+    return None
+
+
+@pytest.mark.parametrize('cursor', [False, True], ids=['first-page', 'cursor'])
+@pytest.mark.parametrize('filters', list(filter_combinations()), ids=_label)
+def test_page_plan_uses_a_matching_index(plan_store, filters, cursor):
+    plan = plan_store.explain_query_events(cursor=cursor, **filters)['page']
+
+    assert not any('TEMP B-TREE' in line for line in plan), plan
+    assert not any(re.match(r"SCAN events_\d+$", line) for line in plan), plan
+
+    index = _index_used(plan)
+    assert index in INDEX_COLUMNS, plan
+    equality_filters = {
+        name for name in filters if name not in ('from_time', 'to_time', 'status')
+    } | ({'status'} if filters.get('status') == 'new' else set())
+    assert INDEX_COLUMNS[index] <= equality_filters, plan
+    if equality_filters:
+        # Some filter column leads the index instead of a timestamp-only walk
+        assert INDEX_COLUMNS[index], plan
+
+
+@pytest.mark.parametrize('filters, index', [
+    ({}, 'time'),
+    ({'from_time': FILTER_VALUES['from_time'], 'to_time': FILTER_VALUES['to_time']}, 'time'),
+    ({'camera_id': 3}, 'camera_time'),
+    ({'camera_id': 3, 'rule_type': 'loitering'}, 'camera_rule_time'),
+    ({'rule_type': 'loitering'}, 'rule_time'),
+    ({'priority': 'high'}, 'priority_time'),
+    ({'zone_id': 5}, 'zone_time'),
+    ({'camera_id': 3, 'zone_id': 5}, 'zone_time'),
+    ({'status': 'new'}, 'new_time'),
+    ({'status': 'new', 'from_time': FILTER_VALUES['from_time']}, 'new_time'),
+    ({'status': 'acknowledged'}, 'time'),
+], ids=lambda value: _label(value) if isinstance(value, dict) else value)
+@pytest.mark.parametrize('cursor', [False, True], ids=['first-page', 'cursor'])
+def test_intended_index(plan_store, filters, index, cursor):
+    plan = plan_store.explain_query_events(cursor=cursor, **filters)['page']
+
+    assert _index_used(plan) == index, plan
+
+
+def test_cursor_seeks_into_the_index(plan_store):
+    plan = plan_store.explain_query_events(cursor=True, camera_id=3)['page']
+
+    assert any(line.startswith('SEARCH') and 'timestamp<?' in line for line in plan), plan
@@ -0,0 +1,39 @@
+"""
+Search query parsing and /api/v1/events/search
+"""
+from datetime import datetime, timedelta
+import pytest
+from backend.services.event_search import MAX_LOOKBACK, parse_search_query
+
+NOW = datetime(2026, 3, 10, 14, 30)
+
+
+def test_terms_and_named_period():
+    terms, from_time, to_time = parse_search_query("Car near the loading dock last night", now=NOW)
+
+    assert terms == ['car', 'loading', 'dock']
+    assert from_time == datetime(2026, 3, 9, 18)
+    assert to_time == datetime(2026, 3, 10, 6)
+
+
+def test_relative_period():
+    terms, from_time, to_time = parse_search_query("person past 3 hours", now=NOW)
+
+    assert terms == ['person']
+    assert (from_time, to_time) == (NOW - timedelta(hours=3), NOW)
+
+
+@pytest.mark.parametrize('query', ["car last 99999999 weeks", "car past 10000000000000 days"])
+def test_huge_relative_periods_are_capped(query):
+    terms, from_time, to_time = parse_search_query(query, now=NOW)
+
+    assert terms == ['car']
+    assert to_time == NOW
+    assert MAX_LOOKBACK - timedelta(weeks=1) < NOW - from_time <= MAX_LOOKBACK
+
+
+def test_search_endpoint_handles_huge_periods(client):
+    response = client.get("/api/v1/events/search", params={'q': "car last 99999999 weeks"})
+
+    assert response.status_code == 200
+    assert response.json()['terms'] == ['car']
@@ -0,0 +1,28 @@
+"""
+Rollup-backed /api/v1/events/timeseries
+"""
+from datetime import datetime, timedelta
+import pytest
+
+
+def test_minute_buckets_cover_the_window(event_store):
+    event_store.create_event(camera_id=1, rule_type='intrusion', timestamp=datetime.now() - timedelta(minutes=5))
+
+    series = event_store.get_event_timeseries(hours=1, granularity='minute')
+
+    assert 60 <= len(series) <= 62
+    assert sum(entry['count'] for entry in series) == 1
+
+
+@pytest.mark.parametrize('hours, bucket', [(48, 'minute'), (24 * 90, 'hour')])
+def test_longest_windows_are_served(client, hours, bucket):
+    response = client.get("/api/v1/events/timeseries", params={'hours': hours, 'bucket': bucket})
+
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('hours, bucket', [(49, 'minute'), (24 * 90, 'minute'), (24, 'second')])
+def test_oversized_or_unknown_buckets_are_rejected(client, hours, bucket):
+    response = client.get("/api/v1/events/timeseries", params={'hours': hours, 'bucket': bucket})
+
+    assert response.status_code == 400
@@ -0,0 +1,26 @@
+"""
+Event writer batching and per-event fallback
+"""
+from datetime import datetime
+import pytest
+
+
+def test_bad_row_does_not_lose_the_rest_of_its_batch(event_store):
+    # Stop the background thread so the three submissions are written as one batch by stop()
+    event_store.stop_writer()
+    timestamp = datetime(2026, 3, 10, 12, 0)
+
+    first = event_store.submit_event(camera_id=1, rule_type='intrusion', timestamp=timestamp)
+    bad = event_store.submit_event(camera_id=1, rule_type='intrusion', timestamp='not a timestamp')
+    last = event_store.submit_event(camera_id=2, rule_type='loitering', timestamp=timestamp)
+    event_store.stop_writer()
+
+    stored = [first.result(timeout=1), last.result(timeout=1)]
+    assert [event['rule_type'] for event in stored] == ['intrusion', 'loitering']
+    for event in stored:
+        assert event_store.get_event(event['id'])['camera_id'] == event['camera_id']
+
+    with pytest.raises(Exception):
+        bad.result(timeout=1)
+    _, total, _ = event_store.query_events()
+    assert total == 2
@@ -0,0 +1,37 @@
+"""
+Reference-counted frame buffer pool
+"""
+from backend.services.frame_pool import FramePool
+
+
+def test_buffer_is_recycled_after_the_last_release():
+    pool = FramePool(size=2)
+    buffer = pool.acquire((4, 4, 3))
+    buffer.retain()  # handed to a second stage
+
+    buffer.release()
+    assert pool.get_stats() == {'allocated': 1, 'free': 0}
+
+    buffer.release()
+    assert pool.get_stats() == {'allocated': 1, 'free': 1}
+    assert pool.acquire((4, 4, 3)) is buffer
+    assert pool.get_stats() == {'allocated': 1, 'free': 0}
+
+
+def test_idle_buffers_are_capped_at_pool_size():
+    pool = FramePool(size=1)
+    buffers = [pool.acquire((2, 2)) for _ in range(3)]
+    for buffer in buffers:
+        buffer.release()
+
+    assert pool.get_stats() == {'allocated': 3, 'free': 1}
+
+
+def test_shape_change_discards_idle_buffers():
+    pool = FramePool(size=2)
+    pool.acquire((2, 2)).release()
+
+    buffer = pool.acquire((3, 3))
+
+    assert buffer.array.shape == (3, 3)
+    assert pool.get_stats()['free'] == 0
@@ -0,0 +1,98 @@
+"""
+migrate_snapshots.py - flat snapshot files into the YYYY/MM/DD/cam<id>/ layout
+"""
+from datetime import datetime
+from pathlib import Path
+import sys
+import pytest
+import migrate_snapshots
+
+DAY = datetime(2026, 3, 10, 12, 0)
+
+
+@pytest.fixture
+def snapshot_dir(config):
+    path = Path(config.system.snapshot_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@pytest.fixture
+def migrate(event_store, monkeypatch, capsys):
+    """Run the script's main() against the test database, returning its output"""
+    # The db fixture closes the database
+    monkeypatch.setattr(migrate_snapshots, 'close_db', lambda: None)
+
+    def run(*args):
+        monkeypatch.setattr(sys, 'argv', ['migrate_snapshots.py', *args])
+        migrate_snapshots.main()
+        return capsys.readouterr().out
+
+    return run
+
+
+@pytest.fixture
+def events(event_store, snapshot_dir):
+    """Two events sharing a flat snapshot (with thumbnail), one sharded, one with a missing file"""
+    flat = snapshot_dir / 'cam1_intrusion_20260310_120000.jpg'
+    flat.write_bytes(b'full')
+    (snapshot_dir / 'cam1_intrusion_20260310_120000_thumb.jpg').write_bytes(b'thumb')
+    sharded = snapshot_dir / '2026' / '03' / '10' / 'cam1' / '99.jpg'
+    sharded.parent.mkdir(parents=True)
+    sharded.write_bytes(b'sharded')
+
+    def create(snapshot_path):
+        return event_store.create_event(
+            camera_id=1, rule_type='intrusion', timestamp=DAY, snapshot_path=str(snapshot_path)
+        )['id']
+
+    return {
+        'flat': [create(flat), create(flat)],
+        'sharded': create(sharded),
+        'missing': create(snapshot_dir / 'cam2_loitering_20260310_120000.jpg')
+    }
+
+
+def _path(event_store, event_id) -> Path:
+    return Path(event_store.get_event(event_id)['snapshot_path'])
+
+
+def test_flat_snapshots_are_moved_per_event(migrate, events, event_store, snapshot_dir):
+    sharded = _path(event_store, events['sharded'])
+    missing = _path(event_store, events['missing'])
+
+    output = migrate()
+
+    assert "1 snapshot file(s) referenced by 2 event(s), 1 missing" in output
+    for event_id in events['flat']:
+        path = _path(event_store, event_id)
+        assert path == snapshot_dir / '2026' / '03' / '10' / 'cam1' / f"{event_id}.jpg"
+        assert path.read_bytes() == b'full'
+        assert path.with_name(f"{event_id}_thumb.jpg").read_bytes() == b'thumb'
+    assert not (snapshot_dir / 'cam1_intrusion_20260310_120000.jpg').exists()
+    assert not (snapshot_dir / 'cam1_intrusion_20260310_120000_thumb.jpg').exists()
+
+    assert _path(event_store, events['sharded']) == sharded
+    assert sharded.read_bytes() == b'sharded'
+    assert _path(event_store, events['missing']) == missing
+
+
+def test_rerun_changes_nothing(migrate, events, event_store):
+    migrate()
+    paths = {event_id: _path(event_store, event_id) for event_id in events['flat']}
+
+    output = migrate()
+
+    assert "0 snapshot file(s) referenced by 0 event(s), 1 missing" in output
+    assert {event_id: _path(event_store, event_id) for event_id in events['flat']} == paths
+    assert all(path.exists() for path in paths.values())
+
+
+def test_dry_run_only_reports(migrate, events, event_store, snapshot_dir):
+    flat = snapshot_dir / 'cam1_intrusion_20260310_120000.jpg'
+
+    output = migrate('--dry-run')
+
+    assert "1 snapshot file(s) referenced by 2 event(s), 1 missing" in output
+    assert flat.exists()
+    assert all(_path(event_store, event_id) == flat for event_id in events['flat'])
@@ -0,0 +1,138 @@
+"""
+Snapshot retention - expired days, orphaned files and the disk high-water mark
+"""
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+import os
+import shutil
+import time
+from pathlib import Path
+import pytest
+from backend.services.retention import ORPHAN_MIN_AGE_SECONDS, RetentionService
+
+DiskUsage = namedtuple('DiskUsage', 'total used free')
+
+
+@pytest.fixture
+def snapshot_dir(config):
+    path = Path(config.system.snapshot_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@pytest.fixture
+def retention(event_store, snapshot_dir):
+    return RetentionService()
+
+
+def _day_dir(snapshot_dir: Path, day: date) -> Path:
+    return snapshot_dir / day.strftime('%Y') / day.strftime('%m') / day.strftime('%d')
+
+
+def _write(path: Path, age_seconds: float = 0, data: bytes = b'jpeg') -> Path:
+    """Write a file and backdate its modification time"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    mtime = time.time() - age_seconds
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _event_with_snapshot(event_store, snapshot_dir, timestamp: datetime, age_seconds: float = 0):
+    """Event whose snapshot (and thumbnail) sits in its sharded day directory"""
+    event = event_store.create_event(camera_id=1, rule_type='intrusion', timestamp=timestamp)
+    path = _day_dir(snapshot_dir, timestamp.date()) / 'cam1' / f"{event['id']}.jpg"
+    _write(path, age_seconds)
+    _write(path.with_name(f"{event['id']}_thumb.jpg"), age_seconds)
+    event_store.update_snapshot_path(event['id'], str(path))
+    return event['id'], path
+
+
+def test_expired_day_directories_are_deleted(config, retention, snapshot_dir):
+    today = date.today()
+    expired = _day_dir(snapshot_dir, today - timedelta(days=config.system.snapshot_retention_days + 1))
+    _write(expired / 'cam1' / '1.jpg', data=b'1234')
+    kept = _write(_day_dir(snapshot_dir, today) / 'cam1' / '2.jpg', age_seconds=60)
+
+    retention.run_once()
+
+    assert not expired.exists()
+    assert not expired.parent.exists()  # the now empty month goes too
+    assert kept.exists()
+    assert retention.get_stats()['bytes_reclaimed'] == 4
+
+
+def test_flat_sweep_only_touches_legacy_snapshots(config, retention, snapshot_dir):
+    old = (config.system.snapshot_retention_days + 2) * 86400
+    legacy = _write(snapshot_dir / 'cam1_intrusion_20200101_120000.jpg', old)
+    legacy_thumb = _write(snapshot_dir / 'cam1_intrusion_20200101_120000_thumb.jpg', old)
+    unrelated = [_write(snapshot_dir / name, old) for name in ('notes.txt', 'backup.tar.gz', 'cam1.jpg')]
+    recent = _write(snapshot_dir / 'cam2_loitering_20260310_120000.jpg')
+
+    retention.run_once()
+
+    assert not legacy.exists()
+    assert not legacy_thumb.exists()
+    assert all(path.exists() for path in unrelated)
+    assert recent.exists()
+
+
+def test_orphans_are_deleted_and_live_snapshots_kept(retention, event_store, snapshot_dir):
+    old_enough = ORPHAN_MIN_AGE_SECONDS + 60
+    live_id, live = _event_with_snapshot(event_store, snapshot_dir, datetime.now(), old_enough)
+    orphan = _write(live.with_name(f"{live_id + 1000}.jpg"), old_enough)
+    orphan_thumb = _write(live.with_name(f"{live_id + 1000}_thumb.jpg"), old_enough)
+
+    retention.run_once()
+
+    assert live.exists()
+    assert live.with_name(f"{live_id}_thumb.jpg").exists()
+    assert not orphan.exists()
+    assert not orphan_thumb.exists()
+    assert retention.get_stats()['orphans_deleted'] == 2
+
+
+def test_recent_orphans_are_left_for_their_event(retention, event_store, snapshot_dir):
+    # A snapshot can be written before its event row is committed
+    recent = _write(_day_dir(snapshot_dir, date.today()) / 'cam1' / '123456.jpg', ORPHAN_MIN_AGE_SECONDS - 60)
+
+    retention.run_once()
+
+    assert recent.exists()
+    assert retention.get_stats()['orphans_deleted'] == 0
+
+
+def test_high_water_mark_deletes_oldest_days_and_clears_their_paths(
+    config, retention, event_store, snapshot_dir, monkeypatch
+):
+    config.system.snapshot_disk_high_water_percent = 80
+    now = datetime.now()
+    oldest_id, oldest = _event_with_snapshot(event_store, snapshot_dir, now - timedelta(days=3))
+    older_id, older = _event_with_snapshot(event_store, snapshot_dir, now - timedelta(days=2))
+    today_id, today = _event_with_snapshot(event_store, snapshot_dir, now)
+
+    # Above the mark until only two day directories are left
+    def disk_usage(path):
+        days = len(list(snapshot_dir.glob('[0-9]*/[0-9]*/[0-9]*')))
+        return DiskUsage(total=100, used=90 if days > 2 else 50, free=10 if days > 2 else 50)
+
+    monkeypatch.setattr(shutil, 'disk_usage', disk_usage)
+
+    retention.run_once()
+
+    assert not oldest.exists()
+    assert older.exists() and today.exists()
+    assert event_store.get_event(oldest_id)['snapshot_path'] is None
+    assert event_store.get_event(older_id)['snapshot_path'] == str(older)
+    assert event_store.get_event(today_id)['snapshot_path'] == str(today)
+
+
+def test_high_water_mark_never_deletes_today(config, retention, event_store, snapshot_dir, monkeypatch):
+    config.system.snapshot_disk_high_water_percent = 80
+    event_id, path = _event_with_snapshot(event_store, snapshot_dir, datetime.now())
+    monkeypatch.setattr(shutil, 'disk_usage', lambda path: DiskUsage(total=100, used=99, free=1))
+
+    retention.run_once()
+
+    assert path.exists()
+    assert event_store.get_event(event_id)['snapshot_path'] == str(path)
@@ -0,0 +1,68 @@
+"""
+Snapshot writer hand-off of capture buffers and the files it writes
+"""
+from datetime import datetime
+import os
+import numpy as np
+import pytest
+from backend.services.frame_pool import FramePool
+from backend.services.snapshot_writer import SnapshotWriter
+
+TIMESTAMP = datetime(2026, 3, 10, 12, 0)
+
+
+@pytest.fixture
+def writer(event_store):
+    """Snapshot writer without worker threads; stop() writes the queued jobs"""
+    return SnapshotWriter()
+
+
+def _snapshot(writer, event_store, buffer, rule_type='intrusion'):
+    """Queue an event and its snapshot the way the rules engine does"""
+    assert writer.reserve(1, rule_type)
+    event = event_store.submit_event(camera_id=1, rule_type=rule_type, timestamp=TIMESTAMP)
+    writer.submit(buffer, [8, 8, 40, 40], 1, rule_type, TIMESTAMP, event)
+    return event
+
+
+def test_capture_buffer_is_retained_until_the_snapshot_is_written(writer, event_store):
+    pool = FramePool(size=2)
+    buffer = pool.acquire((48, 64, 3))
+    buffer.array[:] = 100
+
+    event = _snapshot(writer, event_store, buffer)
+    buffer.release()  # the processing thread is done with the frame
+    assert pool.get_stats() == {'allocated': 1, 'free': 0}
+
+    writer.stop()
+    event_store.stop_writer()
+
+    assert pool.get_stats() == {'allocated': 1, 'free': 1}
+    # The overlay is drawn on the writer's own copy, never on the shared capture frame
+    assert np.all(buffer.array == 100)
+    path = event_store.get_event(event.result(timeout=1)['id'])['snapshot_path']
+    assert os.path.exists(path)
+    assert writer.get_stats()['written'] == 1
+
+
+def test_urls_list_only_written_variants(writer):
+    full = writer.snapshot_dir / '2026' / '03' / '10' / 'cam1' / '7.jpg'
+    full.parent.mkdir(parents=True)
+    for name in ('7.jpg', '7_thumb.jpg'):
+        (full.parent / name).write_bytes(b'jpeg')
+
+    assert writer.get_urls(str(full)) == {
+        'full': '/snapshots/2026/03/10/cam1/7.jpg',
+        'thumbnail': '/snapshots/2026/03/10/cam1/7_thumb.jpg'
+    }
+
+
+def test_thumbnail_url_falls_back_to_the_full_snapshot(writer):
+    legacy = writer.snapshot_dir / 'cam1_intrusion_20260310_120000.jpg'
+    legacy.write_bytes(b'jpeg')
+
+    assert writer.get_urls(str(legacy)) == {
+        'full': '/snapshots/cam1_intrusion_20260310_120000.jpg',
+        'thumbnail': '/snapshots/cam1_intrusion_20260310_120000.jpg'
+    }
+    assert writer.get_urls(None) is None
@@ -0,0 +1,32 @@
+"""
+StorageBackend interface
+"""
+import pytest
+from backend.database.backend import StorageBackend
+from backend.database.db import Database
+
+
+def test_sqlite_backend_implements_the_interface(db):
+    assert isinstance(db, StorageBackend)
+    assert not Database.__abstractmethods__
+
+
+def test_incomplete_backend_cannot_be_created(db):
+    class PartialBackend(StorageBackend):
+        def execute(self, query, params=()):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        PartialBackend()
+
+
+def test_transaction_commits_or_rolls_back(db):
+    with db.transaction() as cursor:
+        cursor.execute("INSERT INTO cameras (name, rtsp_url) VALUES ('a', 'a.mp4')")
+
+    with pytest.raises(RuntimeError):
+        with db.transaction() as cursor:
+            cursor.execute("INSERT INTO cameras (name, rtsp_url) VALUES ('b', 'b.mp4')")
+            raise RuntimeError("abort")
+
+    assert [row['name'] for row in db.fetchall("SELECT name FROM cameras")] == ['a']
@@ -0,0 +1,35 @@
+"""
+Frame ingestion modes
+"""
+import queue
+import pydantic
+import pytest
+from backend.config.config import Config
+from backend.services.stream_ingestion import FrameMailbox, StreamIngestion
+
+
+@pytest.mark.parametrize('mode', ['queue', 'latest'])
+def test_known_ingestion_modes_are_accepted(mode):
+    assert Config(system={'ingestion_mode': mode}).system.ingestion_mode == mode
+
+
+@pytest.mark.parametrize('mode', ['lastest', 'fifo', ''])
+def test_unknown_ingestion_mode_is_rejected(mode):
+    with pytest.raises(pydantic.ValidationError):
+        Config(system={'ingestion_mode': mode})
+
+
+def test_stream_ingestion_rejects_unknown_mode(config):
+    with pytest.raises(ValueError):
+        StreamIngestion(ingestion_mode='lastest')
+
+
+def test_mailbox_keeps_only_the_newest_frame():
+    mailbox = FrameMailbox()
+
+    assert mailbox.put_nowait('first') is None
+    assert mailbox.put_nowait('second') == 'first'
+    assert mailbox.qsize() == 1
+    assert mailbox.get(timeout=0.1) == 'second'
+    with pytest.raises(queue.Empty):
+        mailbox.get_nowait()
@@ -0,0 +1,97 @@
+"""
+Zone cache and point-in-zone tests
+"""
+import pytest
+from backend.services.zone_manager import ZoneManager
+
+SQUARE = [[100, 100], [300, 100], [300, 300], [100, 300]]
+
+
+@pytest.fixture
+def zone_manager(db, camera_manager):
+    camera_manager.create_camera(name='Dock', rtsp_url='dock.mp4')
+    return ZoneManager()
+
+
+@pytest.fixture
+def count_zone_queries(db, monkeypatch):
+    """Number of SELECTs on the zones table so far"""
+    queries = []
+    fetchall = db.fetchall
+
+    def counting_fetchall(query, params=()):
+        if 'FROM zones' in query:
+            queries.append(query)
+        return fetchall(query, params)
+
+    monkeypatch.setattr(db, 'fetchall', counting_fetchall)
+    return lambda: len(queries)
+
+
+def test_zones_are_served_from_the_cache(zone_manager, count_zone_queries):
+    zone_manager.create_zone(1, 'Dock', 'polygon', SQUARE)
+
+    assert len(zone_manager.get_zones_by_camera(1)) == 1
+    assert len(zone_manager.get_zones_by_camera(1)) == 1
+    assert count_zone_queries() == 1
+
+
+def test_create_invalidates_the_camera_cache(zone_manager):
+    zone_manager.create_zone(1, 'Dock', 'polygon', SQUARE)
+    assert [zone['name'] for zone in zone_manager.get_zones_by_camera(1)] == ['Dock']
+
+    zone_manager.create_zone(1, 'Gate', 'rectangle', [[0, 0], [50, 50]])
+
+    assert sorted(zone['name'] for zone in zone_manager.get_zones_by_camera(1)) == ['Dock', 'Gate']
+
+
+def test_update_invalidates_zones_and_geometry(zone_manager):
+    zone = zone_manager.create_zone(1, 'Dock', 'polygon', SQUARE)
+    cached = zone_manager.get_zones_by_camera(1)[0]
+    assert zone_manager.is_point_in_zone((200, 200), cached)
+
+    zone_manager.update_zone(zone['id'], name='Dock 2', coordinates=[[400, 400], [500, 400], [500, 500]])
+
+    updated = zone_manager.get_zones_by_camera(1)[0]
+    assert updated['name'] == 'Dock 2'
+    assert not zone_manager.is_point_in_zone((200, 200), updated)
+    assert zone_manager.is_point_in_zone((480, 420), updated)
+    assert zone_manager.get_zone_bounds(updated) == (400, 400, 500, 500)
+
+
+def test_delete_invalidates_the_cache(zone_manager):
+    zone = zone_manager.create_zone(1, 'Dock', 'polygon', SQUARE)
+    assert len(zone_manager.get_zones_by_camera(1)) == 1
+
+    zone_manager.delete_zone(zone['id'])
+
+    assert zone_manager.get_zones_by_camera(1) == []
+    assert zone['id'] not in zone_manager.geometry_cache
+
+
+@pytest.fixture
+def mixed_zones(zone_manager):
+    """Overlapping polygons (one concave) and a rectangle"""
+    zone_manager.create_zone(1, 'Square', 'polygon', SQUARE)
+    zone_manager.create_zone(1, 'L-shape', 'polygon', [[200, 200], [600, 200], [600, 300], [300, 300], [300, 500], [200, 500]])
+    zone_manager.create_zone(1, 'Lot', 'rectangle', [[250, 50], [700, 250]])
+    return zone_manager.get_zones_by_camera(1)
+
+
+def test_points_in_zones_matches_is_point_in_zone(zone_manager, mixed_zones):
+    points = [(x, y) for x in range(0, 720, 13) for y in range(0, 560, 11)]
+    points += [(100, 100), (300, 300), (250, 50), (700, 250), (200, 500)]  # vertices and corners
+
+    membership = zone_manager.points_in_zones(points, mixed_zones)
+
+    assert membership.shape == (len(points), len(mixed_zones))
+    for i, point in enumerate(points):
+        for j, zone in enumerate(mixed_zones):
+            assert membership[i, j] == zone_manager.is_point_in_zone(point, zone), (point, zone['name'])
+    assert membership.any(axis=0).all()
+    assert (membership.sum(axis=1) > 1).any()
+
+
+def test_points_in_zones_handles_empty_input(zone_manager, mixed_zones):
+    assert zone_manager.points_in_zones([], mixed_zones).shape == (0, len(mixed_zones))
+    assert zone_manager.points_in_zones([(1, 1)], []).shape == (1, 0)
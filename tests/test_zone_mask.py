@@ -0,0 +1,110 @@
+"""
+Rasterized zone masks agree with the polygon engine away from zone edges
+"""
+import numpy as np
+import pytest
+import shapely
+from shapely.geometry import Polygon, box
+from backend.services.zone_manager import ZoneManager
+from backend.services.zone_mask import MAX_MASK_ZONES, ZoneMask
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+def _zone(zone_id: int, coordinates, zone_type: str = 'polygon') -> dict:
+    return {'id': zone_id, 'camera_id': 1, 'name': f"zone {zone_id}", 'type': zone_type, 'coordinates': coordinates}
+
+
+def _shape(zone: dict):
+    if zone['type'] == 'rectangle':
+        (x1, y1), (x2, y2) = zone['coordinates']
+        return box(x1, y1, x2, y2)
+    return Polygon(zone['coordinates'])
+
+
+def _interior_points(zones, margin: float, step: int = 7):
+    """Grid points at least `margin` pixels away from every zone edge"""
+    xs, ys = np.meshgrid(np.arange(0, FRAME_SHAPE[1], step), np.arange(0, FRAME_SHAPE[0], step))
+    grid = np.column_stack([xs.ravel(), ys.ravel()])
+    points = shapely.points(grid)
+    keep = np.ones(len(grid), dtype=bool)
+    for zone in zones:
+        keep &= shapely.distance(_shape(zone).boundary, points) > margin
+    return grid[keep]
+
+
+@pytest.fixture
+def zone_manager(config, db):
+    return ZoneManager()
+
+
+OVERLAPPING = [
+    _zone(1, [[50, 50], [300, 50], [300, 300], [50, 300]]),
+    _zone(2, [[200, 200], [600, 200], [600, 300], [300, 300], [300, 450], [200, 450]]),  # concave
+    _zone(3, [[250, 20], [620, 260]], 'rectangle'),
+    _zone(4, [[400, 300], [560, 470], [240, 470]]),
+]
+
+
+@pytest.mark.parametrize('downscale', [1, 2, 4])
+def test_mask_matches_polygons_for_overlapping_zones(zone_manager, downscale):
+    mask = ZoneMask(OVERLAPPING, FRAME_SHAPE, downscale=downscale)
+    points = _interior_points(OVERLAPPING, margin=2 * downscale)
+
+    expected = zone_manager.points_in_zones(points, OVERLAPPING)
+
+    np.testing.assert_array_equal(mask.lookup(points), expected)
+    assert (expected.sum(axis=1) > 1).any()  # overlaps are covered
+
+
+def test_points_outside_the_frame_are_in_no_zone():
+    mask = ZoneMask(OVERLAPPING, FRAME_SHAPE)
+
+    assert not mask.lookup([(-5, 10), (10, -5), (640, 10), (10, 480), (10_000, 10_000)]).any()
+
+
+def _grid_zones(count: int) -> list:
+    """count overlapping 90x70 squares tiled across the frame"""
+    return [
+        _zone(i + 1, [[x, y], [x + 90, y], [x + 90, y + 70], [x, y + 70]])
+        for i, (x, y) in enumerate((col * 70, row * 55) for row in range(8) for col in range(9))
+    ][:count]
+
+
+def test_mask_supports_the_zone_limit(zone_manager):
+    zones = _grid_zones(MAX_MASK_ZONES)
+    mask = ZoneMask(zones, FRAME_SHAPE, downscale=2)
+    points = _interior_points(zones, margin=4, step=5)
+
+    assert mask.mask.dtype == np.uint64
+    np.testing.assert_array_equal(mask.lookup(points), zone_manager.points_in_zones(points, zones))
+    assert mask.lookup(points)[:, MAX_MASK_ZONES - 1].any()
+
+
+def test_mask_rejects_more_zones_than_bits():
+    with pytest.raises(ValueError):
+        ZoneMask(_grid_zones(MAX_MASK_ZONES + 1), FRAME_SHAPE)
+
+
+def test_membership_falls_back_to_polygons_above_the_limit(config, zone_manager):
+    config.zones.engine = 'mask'
+    zones = _grid_zones(MAX_MASK_ZONES + 1)
+    points = _interior_points(zones, margin=4, step=11)
+
+    membership = zone_manager.zone_membership(1, points, zones, FRAME_SHAPE)
+
+    np.testing.assert_array_equal(membership, zone_manager.points_in_zones(points, zones))
+    assert 1 not in zone_manager.mask_cache
+
+
+def test_mask_engine_is_cached_per_camera(config, zone_manager):
+    config.zones.engine = 'mask'
+    points = [(100, 100)]
+
+    zone_manager.zone_membership(1, points, OVERLAPPING, FRAME_SHAPE)
+    mask = zone_manager.mask_cache[1]
+    zone_manager.zone_membership(1, points, OVERLAPPING, FRAME_SHAPE)
+
+    assert zone_manager.mask_cache[1] is mask
+    zone_manager.zone_membership(1, points, OVERLAPPING, (720, 1280, 3))
+    assert zone_manager.mask_cache[1] is not mask